@@ -6,10 +6,23 @@ from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
-from src.articles.model import Article, ArticleEmbedding, ArticleSummary  # noqa: F401
+from src.articles.model import (  # noqa: F401
+    Article,
+    ArticleConcept,
+    ArticleEmbedding,
+    ArticleNeighbor,
+    ArticleSummary,
+    ConceptGraphLayout,
+    UserConcept,
+)
+from src.jobs.model import Job  # noqa: F401
 from src.lib.config import settings
 from src.lib.database import Base
-from src.subscriptions.model import Subscription, UsageRecord  # noqa: F401
+from src.subscriptions.model import (  # noqa: F401
+    CreditReservation,
+    Subscription,
+    UsageRecord,
+)
 
 # Import all models here for autogenerate
 from src.users.model import User  # noqa: F401
@@ -0,0 +1,220 @@
+"""add per-user concept vocabulary
+
+Revision ID: 1b7d4e2f9c30
+Revises: 0a6c3e9d5b21
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1b7d4e2f9c30"
+down_revision: str | None = "0a6c3e9d5b21"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_concepts",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("norm", sa.String(length=255), nullable=False),
+        sa.Column(
+            "label_counts",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column(
+            "article_count", sa.Integer(), server_default=sa.text("0"), nullable=False
+        ),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_user_concepts_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_user_concepts")),
+        sa.UniqueConstraint("user_id", "norm", name="uq_user_concepts_user_id_norm"),
+    )
+    op.create_index(
+        "ix_user_concepts_user_id_updated_at",
+        "user_concepts",
+        ["user_id", "updated_at"],
+        unique=False,
+    )
+
+    # Add ``delta`` articles (and one ``label``) to a user's concept.
+    # Decrements never insert: the row may belong to a user being deleted.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION user_concepts_apply(
+            p_user_id uuid, p_norm text, p_label text, p_delta integer
+        ) RETURNS void
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            v_label text := coalesce(nullif(p_label, ''), p_norm);
+        BEGIN
+            IF p_user_id IS NULL OR coalesce(p_norm, '') = '' THEN
+                RETURN;
+            END IF;
+
+            IF p_delta > 0 THEN
+                INSERT INTO user_concepts (
+                    id, user_id, norm, label_counts, article_count, updated_at
+                )
+                VALUES (
+                    gen_random_uuid(), p_user_id, p_norm,
+                    jsonb_build_object(v_label, p_delta), p_delta, now()
+                )
+                ON CONFLICT (user_id, norm) DO UPDATE SET
+                    article_count = user_concepts.article_count + p_delta,
+                    label_counts = jsonb_set(
+                        user_concepts.label_counts,
+                        ARRAY[v_label],
+                        to_jsonb(
+                            coalesce((user_concepts.label_counts ->> v_label)::int, 0)
+                            + p_delta
+                        )
+                    ),
+                    updated_at = now();
+            ELSE
+                UPDATE user_concepts SET
+                    article_count = greatest(article_count + p_delta, 0),
+                    label_counts = CASE
+                        WHEN coalesce((label_counts ->> v_label)::int, 0) + p_delta > 0
+                        THEN jsonb_set(
+                            label_counts,
+                            ARRAY[v_label],
+                            to_jsonb((label_counts ->> v_label)::int + p_delta)
+                        )
+                        ELSE label_counts - v_label
+                    END,
+                    updated_at = now()
+                WHERE user_id = p_user_id AND norm = p_norm;
+            END IF;
+        END
+        $$
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION article_summaries_user_concepts_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            v_user_id uuid;
+        BEGIN
+            -- Not found when the article itself is being deleted; the articles
+            -- trigger has already taken its summary out of the vocabulary.
+            SELECT user_id INTO v_user_id FROM articles
+            WHERE id = coalesce(NEW.article_id, OLD.article_id);
+            IF v_user_id IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM user_concepts_apply(
+                    v_user_id, OLD.root_concept_norm, OLD.root_concept_label, -1
+                );
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM user_concepts_apply(
+                    v_user_id, NEW.root_concept_norm, NEW.root_concept_label, 1
+                );
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_article_summaries_user_concepts
+        AFTER INSERT OR DELETE
+            OR UPDATE OF root_concept_norm, root_concept_label
+        ON article_summaries
+        FOR EACH ROW EXECUTE FUNCTION article_summaries_user_concepts_trigger()
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION articles_user_concepts_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            -- The whole vocabulary goes with the user when the user is deleted
+            IF NOT EXISTS (SELECT 1 FROM users WHERE id = OLD.user_id) THEN
+                RETURN OLD;
+            END IF;
+            PERFORM user_concepts_apply(
+                OLD.user_id, s.root_concept_norm, s.root_concept_label, -1
+            )
+            FROM article_summaries AS s WHERE s.article_id = OLD.id;
+            RETURN OLD;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_articles_user_concepts
+        BEFORE DELETE ON articles
+        FOR EACH ROW EXECUTE FUNCTION articles_user_concepts_trigger()
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO user_concepts (
+            id, user_id, norm, label_counts, article_count, updated_at
+        )
+        SELECT
+            gen_random_uuid(),
+            per_label.user_id,
+            per_label.norm,
+            jsonb_object_agg(per_label.label, per_label.n),
+            sum(per_label.n),
+            now()
+        FROM (
+            SELECT
+                a.user_id,
+                s.root_concept_norm AS norm,
+                coalesce(nullif(s.root_concept_label, ''), s.root_concept_norm)
+                    AS label,
+                count(*) AS n
+            FROM article_summaries AS s
+            JOIN articles AS a ON a.id = s.article_id
+            WHERE coalesce(s.root_concept_norm, '') <> ''
+            GROUP BY 1, 2, 3
+        ) AS per_label
+        GROUP BY per_label.user_id, per_label.norm
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_articles_user_concepts ON articles")
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_article_summaries_user_concepts "
+        "ON article_summaries"
+    )
+    op.execute("DROP FUNCTION IF EXISTS articles_user_concepts_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS article_summaries_user_concepts_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS user_concepts_apply(uuid, text, text, integer)")
+    op.drop_index("ix_user_concepts_user_id_updated_at", table_name="user_concepts")
+    op.drop_table("user_concepts")
@@ -0,0 +1,132 @@
+"""add materialized concept graph
+
+Revision ID: 2c8e5a1f7d43
+Revises: 1b7d4e2f9c30
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2c8e5a1f7d43"
+down_revision: str | None = "1b7d4e2f9c30"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "article_concepts",
+        sa.Column("article_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("norm", sa.String(length=255), nullable=False),
+        sa.Column("label", sa.String(length=255), nullable=False),
+        sa.Column("position", sa.SmallInteger(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["articles.id"],
+            name=op.f("fk_article_concepts_article_id_articles"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_article_concepts_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_article_concepts")),
+        sa.UniqueConstraint(
+            "article_id", "norm", name="uq_article_concepts_article_id_norm"
+        ),
+    )
+    op.create_index(
+        "ix_article_concepts_user_id_norm",
+        "article_concepts",
+        ["user_id", "norm"],
+        unique=False,
+    )
+
+    op.create_table(
+        "article_neighbors",
+        sa.Column("article_id", sa.UUID(), nullable=False),
+        sa.Column("neighbor_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("similarity", sa.Float(), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["articles.id"],
+            name=op.f("fk_article_neighbors_article_id_articles"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["neighbor_id"],
+            ["articles.id"],
+            name=op.f("fk_article_neighbors_neighbor_id_articles"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_article_neighbors_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_article_neighbors")),
+        sa.UniqueConstraint(
+            "article_id",
+            "neighbor_id",
+            name="uq_article_neighbors_article_id_neighbor_id",
+        ),
+    )
+    op.create_index(
+        "ix_article_neighbors_neighbor_id",
+        "article_neighbors",
+        ["neighbor_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_article_neighbors_user_id",
+        "article_neighbors",
+        ["user_id"],
+        unique=False,
+    )
+
+    # Existing users are filled in by the rebuild jobs this one fans out to
+    op.execute(
+        """
+        INSERT INTO jobs (id, kind, payload)
+        VALUES (gen_random_uuid(), 'concept-graph-backfill', '{}'::jsonb)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "DELETE FROM jobs WHERE kind IN "
+        "('concept-graph-backfill', 'concept-graph-rebuild')"
+    )
+    op.drop_index("ix_article_neighbors_user_id", table_name="article_neighbors")
+    op.drop_index("ix_article_neighbors_neighbor_id", table_name="article_neighbors")
+    op.drop_table("article_neighbors")
+    op.drop_index("ix_article_concepts_user_id_norm", table_name="article_concepts")
+    op.drop_table("article_concepts")
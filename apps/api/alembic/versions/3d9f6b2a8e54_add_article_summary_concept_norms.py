@@ -0,0 +1,131 @@
+"""add normalized concepts to article summaries
+
+Revision ID: 3d9f6b2a8e54
+Revises: 2c8e5a1f7d43
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+import re
+import unicodedata
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3d9f6b2a8e54"
+down_revision: str | None = "2c8e5a1f7d43"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of src.articles.concept_normalization as of this revision, so
+# the backfill doesn't change when the app's normalizer does
+CANONICAL_MAPPINGS = {
+    "타입스크립트": "typescript",
+    "typescript 배우기": "typescript",
+    "자바스크립트": "javascript",
+    "javascript 기초": "javascript",
+    "파이썬": "python",
+    "리액트": "react",
+    "react.js": "react",
+    "reactjs": "react",
+    "넥스트js": "nextjs",
+    "next.js": "nextjs",
+    "네스트js": "nestjs",
+    "nest.js": "nestjs",
+    "노드js": "nodejs",
+    "node.js": "nodejs",
+    "nodejs": "nodejs",
+    "fastapi": "fastapi",
+    "장고": "django",
+    "스프링부트": "springboot",
+    "spring boot": "springboot",
+    "도커": "docker",
+    "쿠버네티스": "kubernetes",
+    "k8s": "kubernetes",
+    "aws": "aws",
+    "아마존웹서비스": "aws",
+    "llm": "llm",
+    "대규모언어모델": "llm",
+}
+REMOVE_TOKENS = {
+    "배우기",
+    "정리",
+    "입문",
+    "기초",
+    "tutorial",
+    "guide",
+    "basics",
+    "how to",
+    "learn",
+}
+_PARENTHESES = re.compile(r"\([^)]*\)")
+_BRACKETS = re.compile(r"\[[^]]*\]")
+_QUOTES = re.compile(r"[\"']")
+
+
+def _normalize_concept(value: str) -> str:
+    if not value:
+        return ""
+    normalized = unicodedata.normalize("NFKC", value)
+    normalized = _PARENTHESES.sub("", normalized)
+    normalized = _BRACKETS.sub("", normalized)
+    normalized = _QUOTES.sub("", normalized)
+    normalized = normalized.casefold().replace("how to", "")
+    tokens = [t for t in normalized.split() if t not in REMOVE_TOKENS]
+    normalized = " ".join(tokens).strip()
+    return CANONICAL_MAPPINGS.get(normalized, normalized)
+
+
+def _normalize_concepts(concepts: object) -> list[str]:
+    if not isinstance(concepts, list):
+        return []
+    return [
+        _normalize_concept(" ".join(raw.split())) if isinstance(raw, str) else ""
+        for raw in concepts
+    ]
+
+
+def upgrade() -> None:
+    op.add_column(
+        "article_summaries",
+        sa.Column("concept_norms", sa.JSON(), nullable=True),
+    )
+
+    summaries = sa.table(
+        "article_summaries",
+        sa.column("id", sa.UUID()),
+        sa.column("concepts", sa.JSON()),
+        sa.column("concept_norms", sa.JSON()),
+    )
+    bind = op.get_bind()
+    last_id = None
+    while True:
+        stmt = (
+            sa.select(summaries.c.id, summaries.c.concepts)
+            .order_by(summaries.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        )
+        if last_id is not None:
+            stmt = stmt.where(summaries.c.id > last_id)
+        rows = bind.execute(stmt).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.update(summaries)
+            .where(summaries.c.id == sa.bindparam("summary_id"))
+            .values(concept_norms=sa.bindparam("norms")),
+            [
+                {"summary_id": summary_id, "norms": _normalize_concepts(concepts)}
+                for summary_id, concepts in rows
+            ],
+        )
+        last_id = rows[-1][0]
+
+
+def downgrade() -> None:
+    op.drop_column("article_summaries", "concept_norms")
@@ -0,0 +1,53 @@
+"""add stored concept graph layouts
+
+Revision ID: 4e1a7c3b9f65
+Revises: 3d9f6b2a8e54
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4e1a7c3b9f65"
+down_revision: str | None = "3d9f6b2a8e54"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "concept_graph_layouts",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "positions",
+            postgresql.JSONB(astext_type=sa.Text()),
+            server_default=sa.text("'{}'::jsonb"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_concept_graph_layouts_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_concept_graph_layouts")),
+        sa.UniqueConstraint("user_id", name="uq_concept_graph_layouts_user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("concept_graph_layouts")
@@ -0,0 +1,42 @@
+"""replace the ivfflat embedding index with hnsw
+
+Revision ID: 5f2b8d4c1a76
+Revises: 4e1a7c3b9f65
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2b8d4c1a76"
+down_revision: str | None = "4e1a7c3b9f65"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Built concurrently so the worker can keep writing embeddings; the old
+    # index serves queries until the new one is ready
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_article_embeddings_embedding_hnsw ON article_embeddings "
+            "USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_article_embeddings_embedding")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_article_embeddings_embedding ON article_embeddings "
+            "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)"
+        )
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_article_embeddings_embedding_hnsw"
+        )
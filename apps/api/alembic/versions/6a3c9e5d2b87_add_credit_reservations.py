@@ -0,0 +1,75 @@
+"""add credit reservations
+
+Revision ID: 6a3c9e5d2b87
+Revises: 5f2b8d4c1a76
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6a3c9e5d2b87"
+down_revision: str | None = "5f2b8d4c1a76"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "usage_records",
+        sa.Column(
+            "summaries_reserved",
+            sa.Integer(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+    op.create_table(
+        "credit_reservations",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("article_id", sa.UUID(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["article_id"],
+            ["articles.id"],
+            name=op.f("fk_credit_reservations_article_id_articles"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            name=op.f("fk_credit_reservations_user_id_users"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_credit_reservations")),
+        sa.UniqueConstraint(
+            "article_id", name=op.f("uq_credit_reservations_article_id")
+        ),
+    )
+    op.create_index(
+        op.f("ix_credit_reservations_user_id"),
+        "credit_reservations",
+        ["user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_credit_reservations_user_id"), table_name="credit_reservations"
+    )
+    op.drop_table("credit_reservations")
+    op.drop_column("usage_records", "summaries_reserved")
@@ -0,0 +1,70 @@
+"""add article normalized url
+
+Revision ID: 7b4d2e6f3c98
+Revises: 6a3c9e5d2b87
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b4d2e6f3c98"
+down_revision: str | None = "6a3c9e5d2b87"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "articles",
+        sa.Column("normalized_url", sa.String(length=2048), nullable=True),
+    )
+    # Existing rows keep exact-URL matching; get_article_by_url also looks
+    # up the raw URL
+    op.execute("UPDATE articles SET normalized_url = url WHERE url IS NOT NULL")
+    # Keep only the newest of any duplicate analyses already in flight
+    # matchable by URL, so the unique index can be built
+    op.execute(
+        """
+        UPDATE articles SET normalized_url = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY user_id, normalized_url
+                    ORDER BY created_at DESC, id DESC
+                ) AS rank
+                FROM articles
+                WHERE status = 'processing' AND normalized_url IS NOT NULL
+            ) ranked
+            WHERE rank > 1
+        )
+        """
+    )
+    op.create_index(
+        "ix_articles_user_id_normalized_url",
+        "articles",
+        ["user_id", "normalized_url"],
+        unique=False,
+    )
+    op.create_index(
+        "uq_articles_user_id_normalized_url_processing",
+        "articles",
+        ["user_id", "normalized_url"],
+        unique=True,
+        postgresql_where=sa.text(
+            "status = 'processing' AND normalized_url IS NOT NULL"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "uq_articles_user_id_normalized_url_processing", table_name="articles"
+    )
+    op.drop_index("ix_articles_user_id_normalized_url", table_name="articles")
+    op.drop_column("articles", "normalized_url")
@@ -0,0 +1,30 @@
+"""add composite index for articles keyset pagination
+
+Revision ID: e3f1a7c9b2d4
+Revises: d91c52a6f20b
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3f1a7c9b2d4"
+down_revision: str | None = "d91c52a6f20b"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_articles_user_id_created_at_id",
+        "articles",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_user_id_created_at_id", table_name="articles")
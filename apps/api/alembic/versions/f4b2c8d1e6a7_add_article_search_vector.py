@@ -0,0 +1,141 @@
+"""add full-text search vector to articles
+
+Revision ID: f4b2c8d1e6a7
+Revises: e3f1a7c9b2d4
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4b2c8d1e6a7"
+down_revision: str | None = "e3f1a7c9b2d4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "articles",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+    )
+
+    # Weighted document: title (A), concepts + summary (B), body (D).
+    # The body is truncated to stay well under the 1MB tsvector limit.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION article_search_document(
+            p_title text, p_content text, p_summary text, p_concepts json
+        ) RETURNS tsvector
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT
+                setweight(to_tsvector('simple', coalesce(p_title, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(
+                    (SELECT string_agg(value, ' ')
+                     FROM json_array_elements_text(coalesce(p_concepts, '[]'::json))),
+                    ''
+                )), 'B')
+                || setweight(to_tsvector('simple', coalesce(p_summary, '')), 'B')
+                || setweight(
+                    to_tsvector('simple', left(coalesce(p_content, ''), 100000)), 'D'
+                )
+        $$
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION articles_search_vector_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            s_summary text;
+            s_concepts json;
+        BEGIN
+            SELECT summary, concepts INTO s_summary, s_concepts
+            FROM article_summaries WHERE article_id = NEW.id;
+            NEW.search_vector := article_search_document(
+                NEW.title, NEW.content, s_summary, s_concepts
+            );
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_articles_search_vector
+        BEFORE INSERT OR UPDATE OF title, content ON articles
+        FOR EACH ROW EXECUTE FUNCTION articles_search_vector_trigger()
+        """
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION article_summaries_search_vector_trigger()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                UPDATE articles
+                SET search_vector = article_search_document(title, content, NULL, NULL)
+                WHERE id = OLD.article_id;
+            ELSE
+                UPDATE articles
+                SET search_vector = article_search_document(
+                    title, content, NEW.summary, NEW.concepts
+                )
+                WHERE id = NEW.article_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_article_summaries_search_vector
+        AFTER INSERT OR UPDATE OF summary, concepts OR DELETE ON article_summaries
+        FOR EACH ROW EXECUTE FUNCTION article_summaries_search_vector_trigger()
+        """
+    )
+
+    # Backfill existing rows before building the index
+    op.execute(
+        """
+        UPDATE articles AS a
+        SET search_vector = article_search_document(
+            a.title, a.content, s.summary, s.concepts
+        )
+        FROM articles AS a2
+        LEFT JOIN article_summaries AS s ON s.article_id = a2.id
+        WHERE a2.id = a.id
+        """
+    )
+
+    op.create_index(
+        "ix_articles_search_vector",
+        "articles",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_search_vector", table_name="articles")
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_article_summaries_search_vector "
+        "ON article_summaries"
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_articles_search_vector ON articles")
+    op.execute("DROP FUNCTION IF EXISTS article_summaries_search_vector_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS articles_search_vector_trigger()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS article_search_document(text, text, text, json)"
+    )
+    op.drop_column("articles", "search_vector")
@@ -0,0 +1,142 @@
+"""Benchmark ConceptMatchIndex against the difflib full scan it replaces.
+
+Builds a synthetic vocabulary of concept norms, then checks that the index
+resolves every query to exactly what the full scan returns at the given
+threshold and reports how long each takes. A second pass replays global graph
+building, where every new norm is resolved against all the norms seen so far.
+
+    uv run python scripts/bench_concept_index.py --concepts 3000 --queries 1000
+"""
+
+import argparse
+import difflib
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to sys.path to allow importing from src
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.articles.concept_index import ConceptMatchIndex
+
+WORDS = (  # noqa: SIM905
+    "react typescript python rust go kubernetes docker postgres redis kafka "
+    "graph neural network transformer attention embedding vector search index "
+    "cache queue stream batch async runtime compiler type system memory model "
+    "distributed consensus raft paxos database storage engine query planner "
+    "frontend backend design pattern testing observability tracing metrics "
+    "security auth oauth token encryption economics market inflation policy "
+    "climate energy battery solar startup product growth pricing strategy"
+).split()
+
+
+def _full_scan(target: str, norms: list[str], threshold: float) -> str:
+    if target in norms:
+        return target
+    matcher = difflib.SequenceMatcher(None, target, "")
+    best_ratio = 0.0
+    best_match = None
+    for existing in norms:
+        matcher.set_seq2(existing)
+        ratio = matcher.ratio()
+        if ratio > best_ratio:
+            best_ratio = ratio
+            best_match = existing
+    if best_ratio >= threshold and best_match:
+        return best_match
+    return target
+
+
+def _concept(rng: random.Random) -> str:
+    return " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+
+
+def _variant(rng: random.Random, norm: str) -> str:
+    chars = list(norm)
+    for _ in range(rng.randint(0, 2)):
+        position = rng.randrange(len(chars))
+        match rng.randrange(3):
+            case 0:
+                chars.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+            case 1 if len(chars) > 1:
+                del chars[position]
+            case _:
+                chars[position] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--threshold", type=float, default=0.92)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)  # noqa: S311
+    norms = list(dict.fromkeys(_concept(rng) for _ in range(args.concepts)))
+    queries = [
+        _variant(rng, rng.choice(norms)) if rng.random() < 0.7 else _concept(rng)
+        for _ in range(args.queries)
+    ]
+
+    started = time.perf_counter()
+    index = ConceptMatchIndex(norms)
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expected = [_full_scan(q, norms, args.threshold) for q in queries]
+    scan_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [index.resolve(q, args.threshold) for q in queries]
+    index_seconds = time.perf_counter() - started
+
+    mismatches = sum(1 for e, a in zip(expected, actual, strict=True) if e != a)
+    snapped = sum(1 for q, e in zip(queries, expected, strict=True) if q != e)
+    print(f"vocabulary: {len(norms)} norms, {len(queries)} queries")
+    print(f"threshold:  {args.threshold}")
+    print(f"index build: {build_seconds * 1000:.1f} ms")
+    print(
+        f"full scan:   {scan_seconds * 1000:.1f} ms "
+        f"({scan_seconds / len(queries) * 1e6:.0f} us/query)"
+    )
+    print(
+        f"index:       {index_seconds * 1000:.1f} ms "
+        f"({index_seconds / len(queries) * 1e6:.0f} us/query, "
+        f"{scan_seconds / max(index_seconds, 1e-9):.0f}x)"
+    )
+    print(f"snapped to an existing norm: {snapped}")
+    print(f"mismatches vs difflib: {mismatches}")
+
+    # Global graph building: resolve each raw norm against the norms so far
+    raw_norms = queries + norms[: args.queries]
+    started = time.perf_counter()
+    seen: list[str] = []
+    for raw in raw_norms:
+        final = _full_scan(raw, seen, args.threshold)
+        if final not in seen:
+            seen.append(final)
+    graph_scan_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    graph_index = ConceptMatchIndex()
+    for raw in raw_norms:
+        graph_index.add(graph_index.resolve(raw, args.threshold))
+    graph_index_seconds = time.perf_counter() - started
+
+    graph_mismatch = seen != list(graph_index)
+    print(
+        f"graph build ({len(raw_norms)} raw norms): "
+        f"full scan {graph_scan_seconds * 1000:.0f} ms, "
+        f"index {graph_index_seconds * 1000:.0f} ms, "
+        f"same concepts: {not graph_mismatch}"
+    )
+
+    if mismatches or graph_mismatch:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Load-test the Redis rate limiter against the sorted-set sliding window.
+
+Fires ``--requests`` checks spread over ``--keys`` clients from
+``--concurrency`` concurrent tasks at each limiter and reports latency,
+throughput, how many requests each admitted compared to the configured
+budget, and the Redis memory held per client key. The baseline is the
+sliding window limiter the API used before GCRA (a four-command pipeline
+plus a ZREM on denial, one sorted-set member per request). Needs Redis;
+keys are written under a ``bench:`` prefix and deleted afterwards.
+
+    uv run python scripts/bench_rate_limit.py --requests 20000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import cast
+
+import redis.asyncio as redis_module
+
+# Add the app directory to sys.path to allow importing from src
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.lib.config import settings
+from src.lib.rate_limit import RedisRateLimiter
+
+IsAllowed = Callable[[str], Awaitable[tuple[bool, int, int]]]
+
+
+class SlidingWindowRateLimiter:
+    """The previous RedisRateLimiter, kept here as the baseline."""
+
+    def __init__(self, redis: redis_module.Redis, requests: int, window: int):
+        self.requests = requests
+        self.window = window
+        self._redis = redis
+
+    async def is_allowed(self, key: str) -> tuple[bool, int, int]:
+        now = time.time()
+        rate_key = f"rate_limit:{key}"
+        pipe = self._redis.pipeline()
+        pipe.zremrangebyscore(rate_key, 0, now - self.window)
+        pipe.zcard(rate_key)
+        pipe.zadd(rate_key, {str(now): now})
+        pipe.expire(rate_key, self.window)
+        results = await pipe.execute()
+        current_count = results[1]
+        if current_count >= self.requests:
+            await self._redis.zrem(rate_key, str(now))
+            return False, 0, self.window
+        return True, max(0, self.requests - current_count - 1), self.window
+
+
+async def _run(
+    is_allowed: IsAllowed, keys: list[str], total: int, concurrency: int
+) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    admitted = 0
+    cursor = 0
+
+    async def worker() -> None:
+        nonlocal admitted, cursor
+        while cursor < total:
+            key = keys[cursor % len(keys)]
+            cursor += 1
+            started = time.perf_counter()
+            allowed, _remaining, _reset_after = await is_allowed(key)
+            latencies.append((time.perf_counter() - started) * 1000)
+            admitted += allowed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, admitted, time.perf_counter() - started
+
+
+async def _memory_per_key(redis: redis_module.Redis, pattern: str) -> float:
+    keys = [key async for key in redis.scan_iter(match=pattern, count=1000)]
+    if not keys:
+        return 0.0
+    usage = [await redis.memory_usage(key) or 0 for key in keys]
+    return statistics.mean(usage)
+
+
+async def _clear(redis: redis_module.Redis, pattern: str) -> None:
+    keys = [key async for key in redis.scan_iter(match=pattern, count=1000)]
+    if keys:
+        await redis.delete(*keys)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default=settings.REDIS_URL)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--window", type=int, default=60)
+    args = parser.parse_args()
+    if not args.url:
+        parser.error("set REDIS_URL or pass --url")
+
+    redis = cast(
+        "redis_module.Redis",
+        redis_module.from_url(args.url),  # type: ignore[no-untyped-call]
+    )
+    settings.REDIS_URL = args.url
+    gcra = RedisRateLimiter(args.limit, args.window)
+    sliding = SlidingWindowRateLimiter(redis, args.limit, args.window)
+    keys = [f"bench:{i}" for i in range(args.keys)]
+
+    print(
+        f"{args.requests} requests over {args.keys} keys, "
+        f"concurrency {args.concurrency}, limit {args.limit}/{args.window}s\n"
+    )
+    limiters: list[tuple[str, IsAllowed, str, bool]] = [
+        ("sliding window", sliding.is_allowed, "rate_limit:bench:*", False),
+        ("gcra script", gcra.is_allowed, "rate_limit:gcra:bench:*", True),
+    ]
+    for label, is_allowed, pattern, refills in limiters:
+        await _clear(redis, pattern)
+        latencies, admitted, elapsed = await _run(
+            is_allowed, keys, args.requests, args.concurrency
+        )
+        # GCRA also refills during the run; the sliding window doesn't
+        budget = args.keys * args.limit
+        if refills:
+            budget += int(args.keys * args.limit * elapsed / args.window)
+        memory = await _memory_per_key(redis, pattern)
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(
+            f"  {label:<15} {args.requests / elapsed:8.0f} req/s   "
+            f"p50 {statistics.median(latencies):6.2f} ms   p95 {p95:6.2f} ms   "
+            f"admitted {admitted} of {budget}   "
+            f"{memory:.0f} B/key"
+        )
+        await _clear(redis, pattern)
+
+    await gcra.close()
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,257 @@
+"""Benchmark pgvector ANN indexes against exact search.
+
+Loads synthetic clustered 768-d embeddings for a number of users into a
+temporary table, then runs the same queries exactly (sequential scan) and
+through HNSW and IVFFlat indexes at several ``ef_search``/``probes`` values.
+Recall@k is measured against exact results computed in NumPy, both across
+all rows and with the per-user filter the app applies to every query (the
+case IVFFlat and HNSW post-filter badly). Needs a database with the vector
+extension; nothing is left behind.
+
+    uv run python scripts/bench_vector_search.py --rows 20000 --users 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+# Add the app directory to sys.path to allow importing from src
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.lib.config import settings
+
+FloatMatrix = npt.NDArray[np.float32]
+
+INSERT_BATCH_SIZE = 1000
+
+
+def _synthetic_embeddings(
+    rows: int, dim: int, clusters: int, rng: np.random.Generator
+) -> tuple[FloatMatrix, FloatMatrix]:
+    """Unit vectors scattered around ``clusters`` random topic centres."""
+    centres = rng.normal(size=(clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, clusters, size=rows)
+    data = centres[assignment] + rng.normal(scale=0.6, size=(rows, dim)).astype(
+        np.float32
+    )
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data, centres
+
+
+def _vector_literal(vector: Sequence[float]) -> str:
+    return "[" + ",".join(f"{x:.6f}" for x in vector) + "]"
+
+
+def _exact_top_k(
+    data: FloatMatrix, queries: FloatMatrix, k: int, mask: npt.NDArray[np.bool_]
+) -> list[set[int]]:
+    scores = queries @ data.T
+    scores[:, ~mask] = -np.inf
+    return [set(np.argsort(-row)[:k].tolist()) for row in scores]
+
+
+async def _run_queries(
+    conn: AsyncConnection,
+    queries: FloatMatrix,
+    k: int,
+    user_ids: Sequence[int] | None,
+) -> tuple[list[set[int]], list[float]]:
+    where = "WHERE user_id = :user_id" if user_ids is not None else ""
+    stmt = text(
+        f"SELECT id FROM bench_vectors {where} "  # noqa: S608
+        "ORDER BY embedding <=> CAST(:q AS vector) LIMIT :k"
+    )
+    results: list[set[int]] = []
+    latencies: list[float] = []
+    for i, query in enumerate(queries):
+        params: dict[str, object] = {"q": _vector_literal(query), "k": k}
+        if user_ids is not None:
+            params["user_id"] = user_ids[i]
+        started = time.perf_counter()
+        rows = await conn.execute(stmt, params)
+        ids = {row[0] for row in rows}
+        latencies.append((time.perf_counter() - started) * 1000)
+        results.append(ids)
+    return results, latencies
+
+
+def _report(
+    label: str,
+    found: list[set[int]],
+    expected: list[set[int]],
+    latencies: list[float],
+    k: int,
+) -> None:
+    recall = statistics.mean(
+        len(got & want) / min(k, len(want)) if want else 1.0
+        for got, want in zip(found, expected, strict=True)
+    )
+    returned = statistics.mean(len(got) for got in found)
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"  {label:<32} recall@{k} {recall:6.3f}   "
+        f"returned {returned:5.1f}   "
+        f"p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms"
+    )
+
+
+async def _measure(
+    conn: AsyncConnection,
+    label: str,
+    queries: FloatMatrix,
+    query_users: list[int],
+    exact_all: list[set[int]],
+    exact_user: list[set[int]],
+    k: int,
+) -> None:
+    found, latencies = await _run_queries(conn, queries, k, None)
+    _report(f"{label}, all rows", found, exact_all, latencies, k)
+    found, latencies = await _run_queries(conn, queries, k, query_users)
+    _report(f"{label}, one user", found, exact_user, latencies, k)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[40, 100, 200])
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 10, 30])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data, centres = _synthetic_embeddings(args.rows, args.dim, args.clusters, rng)
+    owners = rng.integers(0, args.users, size=args.rows)
+    queries = centres[rng.integers(0, args.clusters, size=args.queries)]
+    queries = queries + rng.normal(scale=0.6, size=queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    query_users = rng.integers(0, args.users, size=args.queries).tolist()
+
+    everything = np.ones(args.rows, dtype=bool)
+    exact_all = _exact_top_k(data, queries, args.k, everything)
+    exact_user = [
+        _exact_top_k(data, queries[i : i + 1], args.k, owners == user)[0]
+        for i, user in enumerate(query_users)
+    ]
+
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.connect() as conn:
+        version = (
+            await conn.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            )
+        ).scalar_one()
+        print(
+            f"pgvector {version}: {args.rows} rows x {args.dim} dims, "
+            f"{args.users} users, {args.queries} queries, k={args.k}"
+        )
+
+        await conn.execute(
+            text(
+                "CREATE TEMP TABLE bench_vectors (id integer PRIMARY KEY, "
+                f"user_id integer, embedding vector({args.dim}))"
+            )
+        )
+        started = time.perf_counter()
+        for start in range(0, args.rows, INSERT_BATCH_SIZE):
+            await conn.execute(
+                text(
+                    "INSERT INTO bench_vectors (id, user_id, embedding) "
+                    "VALUES (:id, :user_id, CAST(:embedding AS vector))"
+                ),
+                [
+                    {
+                        "id": i,
+                        "user_id": int(owners[i]),
+                        "embedding": _vector_literal(data[i]),
+                    }
+                    for i in range(start, min(start + INSERT_BATCH_SIZE, args.rows))
+                ],
+            )
+        await conn.execute(text("ANALYZE bench_vectors"))
+        print(f"loaded in {time.perf_counter() - started:.1f}s\n")
+
+        print("exact (sequential scan)")
+        await _measure(
+            conn, "exact", queries, query_users, exact_all, exact_user, args.k
+        )
+
+        # Make the planner use the ANN index whenever it can
+        await conn.execute(text("SET enable_seqscan = off"))
+        iterative = tuple(int(p) for p in version.split(".")[:2]) >= (0, 8)
+
+        started = time.perf_counter()
+        await conn.execute(
+            text(
+                "CREATE INDEX bench_vectors_hnsw ON bench_vectors "
+                "USING hnsw (embedding vector_cosine_ops) "
+                "WITH (m = 16, ef_construction = 64)"
+            )
+        )
+        print(f"\nhnsw (built in {time.perf_counter() - started:.1f}s)")
+        for ef_search in args.ef_search:
+            await conn.execute(text(f"SET hnsw.ef_search = {int(ef_search)}"))
+            await _measure(
+                conn,
+                f"ef_search={ef_search}",
+                queries,
+                query_users,
+                exact_all,
+                exact_user,
+                args.k,
+            )
+            if iterative:
+                await conn.execute(text("SET hnsw.iterative_scan = relaxed_order"))
+                found, latencies = await _run_queries(
+                    conn, queries, args.k, query_users
+                )
+                _report(
+                    f"ef_search={ef_search}, one user, iter",
+                    found,
+                    exact_user,
+                    latencies,
+                    args.k,
+                )
+                await conn.execute(text("SET hnsw.iterative_scan = off"))
+        await conn.execute(text("DROP INDEX bench_vectors_hnsw"))
+
+        lists = max(1, int(args.rows**0.5))
+        started = time.perf_counter()
+        await conn.execute(
+            text(
+                "CREATE INDEX bench_vectors_ivfflat ON bench_vectors "
+                f"USING ivfflat (embedding vector_cosine_ops) WITH (lists = {lists})"
+            )
+        )
+        print(
+            f"\nivfflat, lists={lists} (built in {time.perf_counter() - started:.1f}s)"
+        )
+        for probes in args.probes:
+            await conn.execute(text(f"SET ivfflat.probes = {int(probes)}"))
+            await _measure(
+                conn,
+                f"probes={probes}",
+                queries,
+                query_users,
+                exact_all,
+                exact_user,
+                args.k,
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+"""Fire parallel analysis requests at one user's credit and count admissions.
+
+Creates a throwaway user with ``--requests`` articles, then dispatches all of
+them at once from ``--concurrency`` connections, first through the old flow
+(read usage, check ``can_summarize``, count the summary afterwards) and then
+through ``reserve_credit``. The old flow admits more analyses than the plan
+allows; reservations must admit exactly the plan's limit. Exits non-zero if
+they don't. Needs a migrated database; the user is deleted afterwards.
+
+    uv run python scripts/check_credit_reservations.py --requests 300
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# Add the app directory to sys.path to allow importing from src
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.articles.model import Article
+from src.lib.config import settings
+from src.subscriptions import credits
+from src.subscriptions.entitlements import current_month, load_entitlement
+from src.subscriptions.model import UsageRecord
+from src.subscriptions.schemas import PLAN_LIMITS
+from src.users.model import User
+
+Dispatch = Callable[[AsyncSession, uuid.UUID, uuid.UUID], Awaitable[bool]]
+
+
+async def _check_then_count(
+    db: AsyncSession, user_id: uuid.UUID, _article_id: uuid.UUID
+) -> bool:
+    """The flow before reservations: check, analyze, then increment."""
+    if not (await load_entitlement(db, user_id)).can_summarize:
+        return False
+    await asyncio.sleep(0)  # the analysis runs here
+    await db.execute(
+        insert(UsageRecord)
+        .values(
+            user_id=user_id, month=current_month(), summaries_used=1, articles_saved=0
+        )
+        .on_conflict_do_update(
+            constraint="uq_user_month",
+            set_={"summaries_used": UsageRecord.summaries_used + 1},
+        )
+    )
+    return True
+
+
+async def _reserve(db: AsyncSession, user_id: uuid.UUID, article_id: uuid.UUID) -> bool:
+    return await credits.reserve_credit(db, user_id, article_id, "basic")
+
+
+async def _run(
+    sessions: async_sessionmaker[AsyncSession],
+    dispatch: Dispatch,
+    user_id: uuid.UUID,
+    article_ids: list[uuid.UUID],
+) -> int:
+    async def one(article_id: uuid.UUID) -> bool:
+        async with sessions() as db:
+            admitted = await dispatch(db, user_id, article_id)
+            await db.commit()
+            return admitted
+
+    results = await asyncio.gather(*(one(article_id) for article_id in article_ids))
+    return sum(results)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    limit = PLAN_LIMITS["basic"]["summaries_per_month"]
+    engine = create_async_engine(
+        settings.DATABASE_URL, pool_size=args.concurrency, max_overflow=0
+    )
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    user_id = uuid.uuid4()
+    async with sessions() as db:
+        db.add(User(id=user_id, email=f"credit-check-{user_id}@example.com"))
+        await db.flush()
+        articles = [
+            Article(user_id=user_id, title=f"check {i}", content="-", source="web")
+            for i in range(args.requests)
+        ]
+        db.add_all(articles)
+        await db.commit()
+    article_ids = [article.id for article in articles]
+
+    print(
+        f"{args.requests} parallel dispatches, concurrency {args.concurrency}, "
+        f"basic plan limit {limit}\n"
+    )
+    try:
+        flows: list[tuple[str, Dispatch]] = [
+            ("check then count", _check_then_count),
+            ("reserve_credit", _reserve),
+        ]
+        admitted = 0
+        for label, dispatch in flows:
+            async with sessions() as db:
+                await db.execute(
+                    update(UsageRecord)
+                    .where(UsageRecord.user_id == user_id)
+                    .values(summaries_used=0, summaries_reserved=0)
+                )
+                await db.commit()
+            admitted = await _run(sessions, dispatch, user_id, article_ids)
+            print(f"  {label:<17} admitted {admitted} of {limit}")
+    finally:
+        async with sessions() as db:
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+    if admitted != limit:
+        sys.exit(f"reserve_credit admitted {admitted}, expected {limit}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
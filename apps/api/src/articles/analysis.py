@@ -0,0 +1,379 @@
+"""Article analysis jobs.
+
+Analysis runs on the durable job queue (``src.jobs``) rather than as
+in-process tasks, so a deploy or crash can't drop it. ``start_analysis`` marks
+an article ``processing`` and enqueues its job in the caller's transaction; the
+job consumer then runs ``handle_analysis_job``. Articles left ``processing``
+without a live job (e.g. by releases that predate the queue) are requeued by
+``requeue_stale_analyses``.
+"""
+
+import uuid
+from datetime import timedelta
+from typing import Literal
+
+import structlog
+from sqlalchemy import String, cast, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles import service as article_service
+from src.articles.concept_graph import index_article_concepts
+from src.articles.concept_index import ConceptMatchIndex
+from src.articles.concept_normalization import normalize_concepts
+from src.articles.concept_vocabulary import get_concept_vocabulary_cache
+from src.articles.model import Article, ArticleSummary
+from src.articles.status_notifier import get_status_notifier
+from src.jobs import queue as job_queue
+from src.jobs.consumer import JobType
+from src.jobs.model import ACTIVE_JOB_STATUSES, Job
+from src.jobs.queue import ClaimedJob
+from src.lib.ai.scheduler import Priority
+from src.lib.config import settings
+from src.subscriptions import credits
+from src.subscriptions.entitlements import get_entitlement_cache
+
+logger = structlog.get_logger(__name__)
+
+ANALYSIS_JOB = "analysis"
+# Consumed by apps/worker
+EMBEDDING_JOB = "embedding"
+
+ANALYSIS_TIMEOUT_SECONDS = 120
+
+# Upper bound on articles requeued per sweep
+STALE_SWEEP_BATCH_SIZE = 100
+
+
+class AnalysisFailedError(RuntimeError):
+    """Raised by the job handler so the queue retries the analysis."""
+
+
+async def start_analysis(
+    db: AsyncSession,
+    article_id: uuid.UUID,
+    *,
+    summary_language: str,
+    provider: Literal["gemini", "openai"] = "gemini",
+    priority: Priority = Priority.INTERACTIVE,
+) -> None:
+    """Mark an article ``processing`` and enqueue its analysis.
+
+    Runs in the caller's transaction, so the status change and the job are
+    committed together. ``priority`` is the LLM scheduler lane to use.
+    """
+    await db.execute(
+        update(Article)
+        .where(Article.id == article_id)
+        .values(status="processing")
+        .execution_options(synchronize_session=False)
+    )
+    await job_queue.enqueue(
+        db,
+        ANALYSIS_JOB,
+        {
+            "article_id": str(article_id),
+            "summary_language": summary_language,
+            "provider": provider,
+            "priority": priority.name.lower(),
+        },
+        dedupe_key=str(article_id),
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
+
+
+def _job_priority(job: ClaimedJob) -> Priority:
+    """Scheduler lane for a job; later attempts drop to the retry lane."""
+    lane = str(job.payload.get("priority", "interactive")).upper()
+    priority = Priority.__members__.get(lane, Priority.INTERACTIVE)
+    if job.attempts > 1 and priority == Priority.INTERACTIVE:
+        return Priority.RETRY
+    return priority
+
+
+async def run_analysis(
+    article_id: uuid.UUID,
+    title: str,
+    content: str,
+    provider: Literal["gemini", "openai"],
+    summary_language: str = "ko",
+    article_url: str | None = None,
+    *,
+    priority: Priority = Priority.INTERACTIVE,
+    mark_failed: bool = True,
+) -> bool:
+    """Summarize an article with AI and save the summary.
+
+    On success the article becomes ``analyzed`` and an embedding job is
+    enqueued in the same transaction. On failure the article is marked
+    ``failed`` only when ``mark_failed`` is set, so an attempt that will be
+    retried leaves it ``processing``.
+    """
+    from src.lib.ai_service import summarize_article
+    from src.lib.database import async_session_factory
+
+    logger.info(
+        "Starting article analysis",
+        article_id=str(article_id),
+        provider=provider,
+        summary_language=summary_language,
+        content_length=len(content),
+    )
+
+    try:
+        logger.info(
+            "Calling summarize_article", article_id=str(article_id), provider=provider
+        )
+        result, content_type = await summarize_article(
+            title,
+            content,
+            url=article_url,
+            provider=provider,
+            summary_language=summary_language,
+            priority=priority,
+            call_timeout_seconds=ANALYSIS_TIMEOUT_SECONDS,
+        )
+        logger.info(
+            "summarize_article completed successfully",
+            article_id=str(article_id),
+            result_summary_length=len(result.summary),
+            concepts_count=len(result.concepts),
+        )
+
+        model_name = settings.GEMINI_MODEL if provider == "gemini" else "gpt-4o-mini"
+        root_concept_label = (result.root_concept or "").strip()
+        if not root_concept_label and result.concepts:
+            root_concept_label = result.concepts[0].strip()
+
+        logger.info("Saving summary to database", article_id=str(article_id))
+        async with async_session_factory() as session:
+            user_res = await session.execute(
+                select(Article.user_id).where(Article.id == article_id)
+            )
+            user_id = user_res.scalar_one_or_none()
+
+            existing_norms = (
+                await get_concept_vocabulary_cache().get(session, user_id)
+                if user_id
+                else ConceptMatchIndex()
+            )
+
+            (
+                resolved_root_label,
+                resolved_root_norm,
+                resolved_concepts,
+            ) = article_service.resolve_concept_candidates(
+                root_concept_label=root_concept_label,
+                concepts=result.concepts,
+                existing_norms=existing_norms,
+                max_candidates=2,
+                threshold=0.92,
+            )
+
+            # Extract type-specific metadata (fields beyond base)
+            from src.lib.agents.base import BaseSummaryResult
+
+            base_fields = set(BaseSummaryResult.model_fields.keys())
+            type_metadata = {
+                k: v for k, v in result.model_dump().items() if k not in base_fields
+            }
+
+            summary = ArticleSummary(
+                article_id=article_id,
+                summary=result.summary,
+                markdown_note=result.markdown_note,
+                concepts=resolved_concepts,
+                concept_norms=normalize_concepts(resolved_concepts),
+                root_concept_label=resolved_root_label,
+                root_concept_norm=resolved_root_norm,
+                key_points=result.key_points,
+                reading_time_minutes=result.reading_time_minutes,
+                language=result.language,
+                content_type=str(content_type),
+                type_metadata=type_metadata,
+                ai_provider=provider,
+                ai_model=model_name,
+            )
+            session.add(summary)
+            if user_id:
+                await index_article_concepts(
+                    session,
+                    article_id=article_id,
+                    user_id=user_id,
+                    concepts=resolved_concepts,
+                    concept_norms=summary.concept_norms,
+                    root_concept_label=resolved_root_label,
+                    root_concept_norm=resolved_root_norm,
+                    vocabulary=existing_norms,
+                )
+
+            await session.execute(
+                update(Article)
+                .where(Article.id == article_id)
+                .values(status="analyzed")
+            )
+            await job_queue.enqueue(
+                session,
+                EMBEDDING_JOB,
+                {"article_id": str(article_id)},
+                dedupe_key=str(article_id),
+            )
+            # Settled with the summary, so a crash can't strand the reservation
+            charged_user = await credits.commit_credit(session, article_id)
+            await session.commit()
+            if charged_user:
+                await get_entitlement_cache().invalidate(charged_user)
+            get_status_notifier().notify(article_id)
+            logger.info(
+                "Summary saved and status updated to analyzed",
+                article_id=str(article_id),
+            )
+
+        logger.info("Article analysis complete", article_id=str(article_id))
+        return True
+    except Exception as e:
+        logger.exception(
+            "Article analysis failed",
+            article_id=str(article_id),
+            error_type=type(e).__name__,
+            error_message=str(e),
+            exc_info=True,
+        )
+        if not mark_failed:
+            return False
+        try:
+            async with async_session_factory() as session:
+                await session.execute(
+                    update(Article)
+                    .where(Article.id == article_id)
+                    .values(status="failed")
+                )
+                await session.commit()
+                get_status_notifier().notify(article_id)
+                logger.info("Status updated to failed", article_id=str(article_id))
+        except Exception as db_error:
+            logger.exception(
+                "Failed to mark article as failed",
+                article_id=str(article_id),
+                db_error_type=type(db_error).__name__,
+                db_error_message=str(db_error),
+            )
+        return False
+
+
+async def handle_analysis_job(job: ClaimedJob) -> None:
+    """Run one analysis attempt; raise so the queue retries on failure."""
+    from src.lib.database import async_session_factory
+
+    article_id = uuid.UUID(str(job.payload["article_id"]))
+    async with async_session_factory() as session:
+        result = await session.execute(select(Article).where(Article.id == article_id))
+        article = result.scalar_one_or_none()
+        # Finished by an attempt whose lease expired; settle its credit if
+        # that attempt saved the summary without doing so
+        if article is not None and article.status in ("analyzed", "completed"):
+            charged_user = await credits.commit_credit(session, article_id)
+            await session.commit()
+            if charged_user:
+                await get_entitlement_cache().invalidate(charged_user)
+
+    # Deleted, or already finished by an attempt whose lease expired
+    if article is None or article.status != "processing":
+        logger.info(
+            "Skipping analysis job",
+            article_id=str(article_id),
+            status=article.status if article else None,
+        )
+        return
+
+    provider: Literal["gemini", "openai"] = (
+        "openai" if job.payload.get("provider") == "openai" else "gemini"
+    )
+    summary_language = str(
+        job.payload.get("summary_language")
+        or article.requested_summary_language
+        or "ko"
+    )
+    ok = await run_analysis(
+        article.id,
+        article.title,
+        article.content,
+        provider,
+        summary_language=summary_language,
+        article_url=article.url,
+        priority=_job_priority(job),
+        mark_failed=job.is_last_attempt,
+    )
+    if not ok:
+        raise AnalysisFailedError(f"Analysis failed for article {article_id}")
+
+
+async def mark_analysis_dead(job: ClaimedJob) -> None:
+    """Fail the article of a dead-lettered analysis job and release its credit."""
+    from src.lib.database import async_session_factory
+
+    article_id = uuid.UUID(str(job.payload["article_id"]))
+    async with async_session_factory() as session:
+        await session.execute(
+            update(Article)
+            .where(Article.id == article_id, Article.status == "processing")
+            .values(status="failed")
+        )
+        released_user = await credits.release_credit(session, article_id)
+        await session.commit()
+    if released_user:
+        await get_entitlement_cache().invalidate(released_user)
+    get_status_notifier().notify(article_id)
+
+
+async def requeue_stale_analyses() -> int:
+    """Enqueue analysis for articles stuck in ``processing`` with no live job.
+
+    Returns:
+        Number of articles requeued.
+    """
+    from src.lib.database import async_session_factory
+
+    stale_before = func.now() - timedelta(seconds=settings.ANALYSIS_STALE_AFTER_SECONDS)
+    live_job = (
+        select(Job.id)
+        .where(
+            Job.kind == ANALYSIS_JOB,
+            Job.dedupe_key == cast(Article.id, String),
+            Job.status.in_(ACTIVE_JOB_STATUSES),
+        )
+        .exists()
+    )
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(Article.id, Article.requested_summary_language)
+            .where(
+                Article.status == "processing",
+                func.coalesce(Article.updated_at, Article.created_at) < stale_before,
+                ~live_job,
+            )
+            .limit(STALE_SWEEP_BATCH_SIZE)
+        )
+        requeued = 0
+        for article_id, summary_language in result.all():
+            inserted = await job_queue.enqueue(
+                session,
+                ANALYSIS_JOB,
+                {
+                    "article_id": str(article_id),
+                    "summary_language": summary_language or "ko",
+                    "provider": "gemini",
+                    "priority": Priority.BACKFILL.name.lower(),
+                },
+                dedupe_key=str(article_id),
+                max_attempts=settings.JOB_MAX_ATTEMPTS,
+            )
+            requeued += int(inserted)
+        await session.commit()
+    return requeued
+
+
+JOB_TYPES: dict[str, JobType] = {
+    ANALYSIS_JOB: JobType(
+        handler=handle_analysis_job, on_dead_letter=mark_analysis_dead
+    ),
+}
@@ -0,0 +1,408 @@
+"""Materialized per-user concept graph.
+
+``get_concept_graph`` reads two tables instead of re-deriving the graph
+from summaries on every request:
+
+* ``article_concepts`` links each article to up to two concept norms, root
+  concept first. ``index_article_concepts`` writes them in the transaction
+  that saves the summary, snapping each norm to a similar norm of the user's
+  concept vocabulary (``user_concepts``, through ``ConceptVocabularyCache``).
+  Concept counts and labels are aggregated from it when the graph is read.
+* ``article_neighbors`` holds each article's nearest articles by embedding.
+  The worker enqueues a neighbours job for the user after writing
+  embeddings, which recomputes the user's lists exactly, one committed batch
+  of articles at a time (``rebuild_article_neighbors``).
+
+Deleting an article cascades to its links. Articles that lose a neighbour
+this way keep the rest of their list until they are re-embedded or rebuilt.
+
+``rebuild_user_concept_graph`` relinks one user's articles from scratch and
+hands the neighbour lists to the same job. The rebuild job runs it, and the
+backfill job fans rebuilds out over every user.
+
+Indexing an article and rebuilding enqueue a layout job, which places the
+global graph's new nodes (see ``graph_layout``) outside of any request.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Any
+
+import structlog
+from sqlalchemy import delete, func, literal, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles import service as article_service
+from src.articles.concept_index import ConceptMatchIndex
+from src.articles.concept_vocabulary import get_concept_vocabulary_cache
+from src.articles.graph_layout import update_graph_layout
+from src.articles.model import (
+    Article,
+    ArticleConcept,
+    ArticleEmbedding,
+    ArticleNeighbor,
+    ArticleSummary,
+)
+from src.jobs import queue as job_queue
+from src.jobs.consumer import JobType
+from src.jobs.queue import ClaimedJob
+from src.users.model import User
+
+logger = structlog.get_logger(__name__)
+
+CONCEPT_GRAPH_REBUILD_JOB = "concept-graph-rebuild"
+CONCEPT_GRAPH_BACKFILL_JOB = "concept-graph-backfill"
+CONCEPT_GRAPH_LAYOUT_JOB = "concept-graph-layout"
+CONCEPT_GRAPH_NEIGHBORS_JOB = "concept-graph-neighbors"
+
+# Nearest neighbours kept per article
+NEIGHBORS_PER_ARTICLE = 10
+# Articles whose neighbour lists each rebuild batch recomputes and commits
+NEIGHBOR_REBUILD_BATCH = 200
+
+# Users each backfill job enqueues rebuilds for before handing off
+BACKFILL_USERS_PER_JOB = 500
+
+# Layout jobs wait this long so a burst of analyses is placed in one pass
+LAYOUT_DELAY_SECONDS = 10.0
+# Passes a layout job makes to place nodes added while it was running
+LAYOUT_MAX_PASSES = 3
+
+
+def resolve_graph_concepts(
+    pairs: list[tuple[str, str]], vocabulary: ConceptMatchIndex
+) -> list[tuple[str, str]]:
+    """Snap each ``(label, norm)`` to a similar vocabulary norm.
+
+    Norms the vocabulary doesn't match are kept apart, so the shared index is
+    never modified; pairs that end up on a norm already used by this article
+    are dropped.
+    """
+    added = ConceptMatchIndex()
+    resolved: list[tuple[str, str]] = []
+    for label, raw_norm in pairs:
+        norm = vocabulary.resolve(raw_norm)
+        if norm == raw_norm and norm not in vocabulary:
+            norm = added.resolve(raw_norm)
+        if norm in added:
+            continue
+        added.add(norm)
+        resolved.append((label, norm))
+    return resolved
+
+
+def _article_concept_rows(
+    article_id: uuid.UUID, user_id: uuid.UUID, resolved: list[tuple[str, str]]
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "article_id": article_id,
+            "user_id": user_id,
+            "norm": norm,
+            "label": label[:255],
+            "position": position,
+        }
+        for position, (label, norm) in enumerate(resolved)
+    ]
+
+
+async def enqueue_layout(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """Schedule placing the user's new graph nodes, in the caller's transaction."""
+    await job_queue.enqueue(
+        db,
+        CONCEPT_GRAPH_LAYOUT_JOB,
+        {"user_id": str(user_id)},
+        dedupe_key=str(user_id),
+        delay_seconds=LAYOUT_DELAY_SECONDS,
+    )
+
+
+async def index_article_concepts(
+    db: AsyncSession,
+    *,
+    article_id: uuid.UUID,
+    user_id: uuid.UUID,
+    concepts: object,
+    root_concept_label: str | None,
+    root_concept_norm: str | None,
+    vocabulary: ConceptMatchIndex,
+    concept_norms: list[str] | None = None,
+) -> list[str]:
+    """Link an article to its concepts, replacing any earlier links.
+
+    Runs in the caller's transaction so the links commit with the summary.
+    ``vocabulary`` is the user's cached concept vocabulary, as read before
+    the summary was written.
+
+    Returns:
+        The article's concept norms, root concept first.
+    """
+    await db.execute(
+        delete(ArticleConcept).where(ArticleConcept.article_id == article_id)
+    )
+    resolved = resolve_graph_concepts(
+        article_service.extract_graph_concepts(
+            concepts,
+            root_concept_label,
+            root_concept_norm,
+            concept_norms=concept_norms,
+        ),
+        vocabulary,
+    )
+    if resolved:
+        await db.execute(
+            insert(ArticleConcept),
+            _article_concept_rows(article_id, user_id, resolved),
+        )
+        await enqueue_layout(db, user_id)
+    return [norm for _label, norm in resolved]
+
+
+async def rebuild_user_concept_graph(db: AsyncSession, user_id: uuid.UUID) -> int:
+    """Relink a user's articles to concepts and schedule a neighbour rebuild.
+
+    Each summary is linked as if it had just been saved.
+
+    Returns:
+        Number of articles linked to at least one concept.
+    """
+    await db.execute(delete(ArticleConcept).where(ArticleConcept.user_id == user_id))
+
+    rows = await db.execute(
+        select(
+            Article.id,
+            ArticleSummary.concepts,
+            ArticleSummary.concept_norms,
+            ArticleSummary.root_concept_label,
+            ArticleSummary.root_concept_norm,
+        )
+        .join(ArticleSummary, ArticleSummary.article_id == Article.id)
+        .where(Article.user_id == user_id)
+        .order_by(Article.created_at, Article.id)
+    )
+    vocabulary = await get_concept_vocabulary_cache().get(db, user_id)
+    values: list[dict[str, Any]] = []
+    linked = 0
+    for article_id, concepts, concept_norms, root_label, root_norm in rows.all():
+        resolved = resolve_graph_concepts(
+            article_service.extract_graph_concepts(
+                concepts, root_label, root_norm, concept_norms=concept_norms
+            ),
+            vocabulary,
+        )
+        if resolved:
+            linked += 1
+            values.extend(_article_concept_rows(article_id, user_id, resolved))
+    if values:
+        await db.execute(insert(ArticleConcept), values)
+
+    await job_queue.enqueue(
+        db,
+        CONCEPT_GRAPH_NEIGHBORS_JOB,
+        {"user_id": str(user_id)},
+        dedupe_key=str(user_id),
+    )
+    await enqueue_layout(db, user_id)
+    return linked
+
+
+async def rebuild_article_neighbors(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    after: uuid.UUID | None = None,
+    limit: int = NEIGHBOR_REBUILD_BATCH,
+) -> uuid.UUID | None:
+    """Recompute the exact neighbour lists of the next ``limit`` articles.
+
+    Articles are taken in id order after ``after``. Each list is replaced by
+    one set-based statement that ranks the user's embeddings against every
+    article of the batch, so a batch costs ``limit`` scans of the user's
+    embeddings and rebuilding every batch makes every list exact.
+
+    Returns:
+        The last article of a full batch, to continue after; None when done.
+    """
+    embedded = (
+        select(ArticleEmbedding.article_id)
+        .join(Article, Article.id == ArticleEmbedding.article_id)
+        .where(Article.user_id == user_id)
+    )
+    if after is None:
+        # Lists of articles that have lost their embedding aren't recomputed
+        await db.execute(
+            delete(ArticleNeighbor).where(
+                ArticleNeighbor.user_id == user_id,
+                ArticleNeighbor.article_id.not_in(embedded.scalar_subquery()),
+            )
+        )
+    else:
+        embedded = embedded.where(ArticleEmbedding.article_id > after)
+    article_ids = list(
+        (await db.execute(embedded.order_by(ArticleEmbedding.article_id).limit(limit)))
+        .scalars()
+        .all()
+    )
+    if not article_ids:
+        return None
+
+    # Materialized so the scan is exact; the vector index would filter by
+    # user after picking its candidates
+    own = (
+        select(ArticleEmbedding.article_id, ArticleEmbedding.embedding)
+        .join(Article, Article.id == ArticleEmbedding.article_id)
+        .where(Article.user_id == user_id)
+        .cte("own")
+        .prefix_with("MATERIALIZED")
+    )
+    source = own.alias("source")
+    other = own.alias("other")
+    distance = other.c.embedding.cosine_distance(source.c.embedding)
+    nearest = (
+        select(other.c.article_id.label("neighbor_id"), distance.label("distance"))
+        .where(other.c.article_id != source.c.article_id)
+        .order_by(distance, other.c.article_id)
+        .limit(NEIGHBORS_PER_ARTICLE)
+        .lateral("nearest")
+    )
+
+    await db.execute(
+        delete(ArticleNeighbor).where(ArticleNeighbor.article_id.in_(article_ids))
+    )
+    stmt = insert(ArticleNeighbor).from_select(
+        ["id", "article_id", "neighbor_id", "user_id", "similarity"],
+        select(
+            func.gen_random_uuid(),
+            source.c.article_id,
+            nearest.c.neighbor_id,
+            literal(user_id),
+            1 - nearest.c.distance,
+        )
+        .select_from(source.join(nearest, true()))
+        .where(source.c.article_id.in_(article_ids)),
+    )
+    # A concurrent pass over the same articles may have inserted them first
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ArticleNeighbor.article_id, ArticleNeighbor.neighbor_id],
+            set_={"similarity": stmt.excluded.similarity, "updated_at": func.now()},
+        )
+    )
+    return article_ids[-1] if len(article_ids) == limit else None
+
+
+async def _embedded_since(
+    db: AsyncSession, user_id: uuid.UUID, since: datetime
+) -> bool:
+    stmt = (
+        select(ArticleEmbedding.id)
+        .join(Article, Article.id == ArticleEmbedding.article_id)
+        .where(
+            Article.user_id == user_id,
+            func.coalesce(ArticleEmbedding.updated_at, ArticleEmbedding.created_at)
+            > since,
+        )
+        .exists()
+    )
+    return bool((await db.execute(select(stmt))).scalar())
+
+
+async def handle_rebuild_job(job: ClaimedJob) -> None:
+    """Rebuild one user's concept graph."""
+    from src.lib.database import async_session_factory
+
+    user_id = uuid.UUID(str(job.payload["user_id"]))
+    async with async_session_factory() as session:
+        linked = await rebuild_user_concept_graph(session, user_id)
+        await session.commit()
+    logger.info("Concept graph rebuilt", user_id=str(user_id), linked_articles=linked)
+
+
+async def handle_neighbors_job(job: ClaimedJob) -> None:
+    """Rebuild one batch of a user's neighbour lists, then hand off the rest."""
+    from src.lib.database import async_session_factory
+
+    user_id = uuid.UUID(str(job.payload["user_id"]))
+    after = job.payload.get("after")
+    async with async_session_factory() as session:
+        started = (
+            datetime.fromisoformat(job.payload["started"])
+            if "started" in job.payload
+            else (await session.execute(select(func.now()))).scalar_one()
+        )
+        last = await rebuild_article_neighbors(
+            session, user_id, uuid.UUID(str(after)) if after else None
+        )
+        if last is not None:
+            await job_queue.enqueue(
+                session,
+                CONCEPT_GRAPH_NEIGHBORS_JOB,
+                {
+                    "user_id": str(user_id),
+                    "after": str(last),
+                    "started": started.isoformat(),
+                },
+            )
+        elif await _embedded_since(session, user_id, started):
+            # Embeddings written during the pass couldn't enqueue another one
+            # (this one was active), so start over
+            await job_queue.enqueue(
+                session, CONCEPT_GRAPH_NEIGHBORS_JOB, {"user_id": str(user_id)}
+            )
+        await session.commit()
+    logger.info("Article neighbours rebuilt", user_id=str(user_id), after=after)
+
+
+async def handle_layout_job(job: ClaimedJob) -> None:
+    """Place the nodes of a user's global graph that have no position yet."""
+    from src.lib.database import async_session_factory
+
+    user_id = uuid.UUID(str(job.payload["user_id"]))
+    async with async_session_factory() as session:
+        # Articles indexed while a pass runs can't enqueue another layout job
+        # (this one is still running), so go again until nothing is new
+        for _ in range(LAYOUT_MAX_PASSES):
+            graph = await article_service.build_global_graph(
+                session, str(user_id), article_service.GLOBAL_GRAPH_MAX_NODES
+            )
+            placed = await update_graph_layout(
+                session, user_id, graph.nodes, graph.edges
+            )
+            await session.commit()
+            if not placed:
+                break
+    logger.info("Concept graph layout updated", user_id=str(user_id))
+
+
+async def handle_backfill_job(job: ClaimedJob) -> None:
+    """Enqueue rebuilds for the next page of users, then for the rest."""
+    from src.lib.database import async_session_factory
+
+    after = job.payload.get("after")
+    stmt = select(User.id).order_by(User.id).limit(BACKFILL_USERS_PER_JOB)
+    if after:
+        stmt = stmt.where(User.id > uuid.UUID(str(after)))
+
+    async with async_session_factory() as session:
+        user_ids = list((await session.execute(stmt)).scalars().all())
+        for user_id in user_ids:
+            await job_queue.enqueue(
+                session,
+                CONCEPT_GRAPH_REBUILD_JOB,
+                {"user_id": str(user_id)},
+                dedupe_key=str(user_id),
+            )
+        if len(user_ids) == BACKFILL_USERS_PER_JOB:
+            await job_queue.enqueue(
+                session, CONCEPT_GRAPH_BACKFILL_JOB, {"after": str(user_ids[-1])}
+            )
+        await session.commit()
+    logger.info("Concept graph rebuilds enqueued", users=len(user_ids))
+
+
+JOB_TYPES: dict[str, JobType] = {
+    CONCEPT_GRAPH_REBUILD_JOB: JobType(handler=handle_rebuild_job),
+    CONCEPT_GRAPH_BACKFILL_JOB: JobType(handler=handle_backfill_job),
+    CONCEPT_GRAPH_LAYOUT_JOB: JobType(handler=handle_layout_job),
+    CONCEPT_GRAPH_NEIGHBORS_JOB: JobType(handler=handle_neighbors_job),
+}
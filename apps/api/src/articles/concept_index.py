@@ -0,0 +1,165 @@
+"""Similarity index for concept norms.
+
+Concept norms are snapped to similar existing norms with
+``difflib.SequenceMatcher.ratio()`` (0.92 by default). Comparing a target with
+every norm is O(N) per lookup, and O(N^2) when a whole graph is resolved.
+``ConceptMatchIndex`` only scores norms that could reach the threshold:
+
+* Length blocking. ``ratio = 2M / (|a| + |b|)`` with ``M <= min(|a|, |b|)``,
+  so norms that are too short or too long are never looked at.
+* Trigram blocking. If ``ratio >= t`` then ``M >= t * S / 2`` (``S`` the
+  total length), the matching blocks number at most ``1 + S - 2M``, and a
+  block of ``n`` characters keeps ``n - 2`` trigrams of ``a`` intact in
+  ``b``. So at least ``S * (2.5t - 2) - 2`` of the target's trigram
+  positions occur in any norm that can match; norms with fewer hits in the
+  trigram postings are skipped. The bound is >= 1 for ``t = 0.92`` once
+  ``S >= 10``; lookups where it isn't (very short targets, low thresholds)
+  fall back to the length buckets alone.
+* ``real_quick_ratio`` / ``quick_ratio`` upper bounds before ``ratio``.
+
+None of these filters drop a norm that could match, so the result is the
+same as scanning every norm in insertion order.
+"""
+
+import difflib
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+NGRAM_SIZE = 3
+
+
+def _ngram_positions(value: str) -> Counter[str]:
+    return Counter(
+        value[i : i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)
+    )
+
+
+def _min_shared_ngrams(total_length: int, threshold: float) -> float:
+    """Lower bound on target trigram positions found in a matching norm."""
+    return total_length * (2.5 * threshold - 2) - 2
+
+
+def _length_bounds(length: int, threshold: float) -> tuple[float, float]:
+    if threshold <= 0:
+        return (0.0, math.inf)
+    # Widened slightly so float rounding never drops a boundary length
+    shortest = length * threshold / (2 - threshold) * (1 - 1e-9)
+    longest = length * (2 - threshold) / threshold * (1 + 1e-9)
+    return (shortest, longest)
+
+
+def _ngram_blocking_is_lossless(length: int, threshold: float) -> bool:
+    """True if every norm reaching ``threshold`` shares a trigram with a
+    target of ``length`` characters (see the module docstring)."""
+    if 2.5 * threshold - 2 <= 0:
+        return False
+    shortest, _longest = _length_bounds(length, threshold)
+    return _min_shared_ngrams(length + math.ceil(shortest), threshold) >= 1
+
+
+class ConceptMatchIndex:
+    """Norms searchable by ``difflib`` similarity without a full scan."""
+
+    def __init__(self, norms: Iterable[str] = ()) -> None:
+        self._seq: dict[str, int] = {}
+        self._by_length: dict[int, list[tuple[int, str]]] = {}
+        self._lengths: list[int] = []
+        self._postings: dict[str, set[str]] = {}
+        self._next_seq = 0
+        for norm in norms:
+            self.add(norm)
+
+    def __contains__(self, norm: object) -> bool:
+        return norm in self._seq
+
+    def __len__(self) -> int:
+        return len(self._seq)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._seq)
+
+    def add(self, norm: str) -> None:
+        if not norm or norm in self._seq:
+            return
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq[norm] = seq
+        bucket = self._by_length.get(len(norm))
+        if bucket is None:
+            bucket = self._by_length[len(norm)] = []
+            insort(self._lengths, len(norm))
+        bucket.append((seq, norm))
+        for gram in _ngram_positions(norm):
+            self._postings.setdefault(gram, set()).add(norm)
+
+    def discard(self, norm: str) -> None:
+        seq = self._seq.pop(norm, None)
+        if seq is None:
+            return
+        bucket = self._by_length[len(norm)]
+        bucket.remove((seq, norm))
+        if not bucket:
+            del self._by_length[len(norm)]
+            self._lengths.pop(bisect_left(self._lengths, len(norm)))
+        for gram in _ngram_positions(norm):
+            postings = self._postings[gram]
+            postings.discard(norm)
+            if not postings:
+                del self._postings[gram]
+
+    def candidates(self, target: str, threshold: float) -> list[str]:
+        """Norms that could reach ``threshold``, in insertion order."""
+        shortest, longest = _length_bounds(len(target), threshold)
+        if _ngram_blocking_is_lossless(len(target), threshold):
+            hits: Counter[str] = Counter()
+            for gram, positions in _ngram_positions(target).items():
+                for norm in self._postings.get(gram, ()):
+                    hits[norm] += positions
+            entries = [
+                (self._seq[norm], norm)
+                for norm, count in hits.items()
+                if shortest <= len(norm) <= longest
+                and count >= _min_shared_ngrams(len(target) + len(norm), threshold)
+            ]
+        else:
+            lo = bisect_left(self._lengths, shortest)
+            hi = bisect_right(self._lengths, longest)
+            entries = [
+                entry
+                for size in self._lengths[lo:hi]
+                for entry in self._by_length[size]
+            ]
+        entries.sort()
+        return [norm for _seq, norm in entries]
+
+    def best_match(self, target: str, threshold: float) -> tuple[str, float] | None:
+        """The first most similar norm with ratio >= ``threshold``, if any."""
+        if target in self._seq:
+            return (target, 1.0)
+
+        matcher = difflib.SequenceMatcher(None, target, "")
+        best_ratio = 0.0
+        best_match: str | None = None
+        for existing in self.candidates(target, threshold):
+            matcher.set_seq2(existing)
+            # Upper bounds first; a later norm must beat the best strictly
+            if matcher.real_quick_ratio() <= best_ratio:
+                continue
+            quick_ratio = matcher.quick_ratio()
+            if quick_ratio < threshold or quick_ratio <= best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio > best_ratio:
+                best_ratio = ratio
+                best_match = existing
+
+        if best_match is not None and best_ratio >= threshold:
+            return (best_match, best_ratio)
+        return None
+
+    def resolve(self, target: str, threshold: float = 0.92) -> str:
+        """``target`` snapped to its best match, or ``target`` itself."""
+        match = self.best_match(target, threshold)
+        return match[0] if match else target
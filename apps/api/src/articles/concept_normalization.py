@@ -0,0 +1,125 @@
+"""Concept label normalization.
+
+``normalize_concept`` maps a concept label to the norm used to group
+concepts (``"React.js"`` and ``"리액트"`` both become ``"react"``). It runs on
+every label of every summary that is saved or rebuilt, mostly on the same
+few thousand strings, so results are memoized in a bounded LRU.
+Summaries also store the norms of their concepts (``concept_norms``) so
+readers don't need to normalize at all.
+"""
+
+import functools
+import re
+import unicodedata
+from dataclasses import dataclass
+
+from src.lib.config import settings
+
+CANONICAL_MAPPINGS = {
+    "타입스크립트": "typescript",
+    "typescript 배우기": "typescript",
+    "자바스크립트": "javascript",
+    "javascript 기초": "javascript",
+    "파이썬": "python",
+    "리액트": "react",
+    "react.js": "react",
+    "reactjs": "react",
+    "넥스트js": "nextjs",
+    "next.js": "nextjs",
+    "네스트js": "nestjs",
+    "nest.js": "nestjs",
+    "노드js": "nodejs",
+    "node.js": "nodejs",
+    "nodejs": "nodejs",
+    "fastapi": "fastapi",
+    "장고": "django",
+    "스프링부트": "springboot",
+    "spring boot": "springboot",
+    "도커": "docker",
+    "쿠버네티스": "kubernetes",
+    "k8s": "kubernetes",
+    "aws": "aws",
+    "아마존웹서비스": "aws",
+    "llm": "llm",
+    "대규모언어모델": "llm",
+}
+
+
+REMOVE_TOKENS = {
+    "배우기",
+    "정리",
+    "입문",
+    "기초",
+    "tutorial",
+    "guide",
+    "basics",
+    "how to",
+    "learn",
+}
+
+
+_PARENTHESES = re.compile(r"\([^)]*\)")
+_BRACKETS = re.compile(r"\[[^]]*\]")
+_QUOTES = re.compile(r"[\"']")
+
+
+@dataclass(frozen=True)
+class ConceptNormalizationStats:
+    """Counters for the ``normalize_concept`` cache."""
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@functools.lru_cache(maxsize=settings.CONCEPT_NORMALIZATION_CACHE_SIZE)
+def normalize_concept(value: str) -> str:
+    if not value:
+        return ""
+
+    # 1. Unicode normalization (NFKC)
+    normalized = unicodedata.normalize("NFKC", value)
+
+    # 2. Remove parentheses/brackets and their content, and quotes
+    normalized = _PARENTHESES.sub("", normalized)
+    normalized = _BRACKETS.sub("", normalized)
+    normalized = _QUOTES.sub("", normalized)
+
+    # 3. Casefold
+    normalized = normalized.casefold()
+
+    # 4. Remove common suffix/prefix tokens
+    # "how to" contains space, so handle it before splitting
+    normalized = normalized.replace("how to", "")
+
+    tokens = normalized.split()
+    tokens = [t for t in tokens if t not in REMOVE_TOKENS]
+    normalized = " ".join(tokens).strip()
+
+    return CANONICAL_MAPPINGS.get(normalized, normalized)
+
+
+def normalize_concepts(concepts: object) -> list[str]:
+    """Norms of a summary's ``concepts``, one per entry ("" if unusable)."""
+    if not isinstance(concepts, list):
+        return []
+    return [
+        normalize_concept(" ".join(raw.split())) if isinstance(raw, str) else ""
+        for raw in concepts
+    ]
+
+
+def concept_normalization_stats() -> ConceptNormalizationStats:
+    info = normalize_concept.cache_info()
+    return ConceptNormalizationStats(
+        hits=info.hits,
+        misses=info.misses,
+        size=info.currsize,
+        max_size=info.maxsize or 0,
+    )
@@ -0,0 +1,93 @@
+"""Per-user concept vocabulary, cached in memory.
+
+New summaries resolve their root concept against the norms the user already
+has (``resolve_concept_candidates``). The vocabulary lives in
+``user_concepts``, which database triggers keep up to date, and each process
+caches one ``ConceptMatchIndex`` per recently active user. A cached entry is
+refreshed by reading only the rows changed since its last sync, so a save
+never re-reads the user's whole vocabulary.
+
+Rows are read back with some overlap because ``updated_at`` is the writing
+transaction's start time and a transaction can commit after a later one.
+Re-applying a row is harmless.
+"""
+
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles.concept_index import ConceptMatchIndex
+from src.articles.model import UserConcept
+from src.lib.config import settings
+
+# Re-read rows updated this long before the last one seen
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+@dataclass
+class _UserVocabulary:
+    index: ConceptMatchIndex = field(default_factory=ConceptMatchIndex)
+    synced_through: datetime | None = None
+
+
+class ConceptVocabularyCache:
+    """LRU of per-user ``ConceptMatchIndex`` kept in sync with the table."""
+
+    def __init__(self, max_users: int) -> None:
+        self._max_users = max_users
+        self._users: OrderedDict[uuid.UUID, _UserVocabulary] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._users)
+
+    async def get(self, db: AsyncSession, user_id: uuid.UUID) -> ConceptMatchIndex:
+        """The user's current vocabulary (loaded or refreshed from ``db``)."""
+        vocabulary = self._users.get(user_id)
+        if vocabulary is None:
+            vocabulary = _UserVocabulary()
+
+        stmt = select(
+            UserConcept.norm, UserConcept.article_count, UserConcept.updated_at
+        ).where(UserConcept.user_id == user_id)
+        if vocabulary.synced_through is not None:
+            stmt = stmt.where(
+                UserConcept.updated_at > vocabulary.synced_through - SYNC_OVERLAP
+            )
+        rows = (await db.execute(stmt)).all()
+
+        for norm, article_count, updated_at in rows:
+            if article_count > 0:
+                vocabulary.index.add(norm)
+            else:
+                vocabulary.index.discard(norm)
+            if updated_at is not None and (
+                vocabulary.synced_through is None
+                or updated_at > vocabulary.synced_through
+            ):
+                vocabulary.synced_through = updated_at
+
+        self._users[user_id] = vocabulary
+        self._users.move_to_end(user_id)
+        while len(self._users) > self._max_users:
+            self._users.popitem(last=False)
+        return vocabulary.index
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._users.pop(user_id, None)
+
+
+_cache_instance: ConceptVocabularyCache | None = None
+
+
+def get_concept_vocabulary_cache() -> ConceptVocabularyCache:
+    """Get the process-wide concept vocabulary cache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = ConceptVocabularyCache(
+            max_users=settings.CONCEPT_VOCABULARY_CACHE_MAX_USERS
+        )
+    return _cache_instance
@@ -0,0 +1,251 @@
+"""Server-side layout for the global concept graph.
+
+Clients used to start the force simulation from random positions every time
+the graph was opened. ``layout_graph`` computes 2D positions instead: a new
+layout starts from a spectral embedding (eigenvectors of the normalized
+adjacency matrix) and is refined with a ForceAtlas2-style simulation
+(degree-weighted repulsion, linear attraction along edges, gravity). Given
+the positions from a previous layout it keeps them fixed and only places and
+refines the new nodes, starting each next to its neighbours, so the picture
+a user knows stays put as the graph grows. Once more than half the nodes are
+new the layout is recomputed from scratch.
+
+``update_graph_layout`` stores each user's positions in
+``concept_graph_layouts`` and only recomputes when a node without a position
+shows up; the concept graph layout job runs it whenever the graph gains
+nodes. ``read_graph_layout`` only reads the stored positions, so serving the
+graph never computes a layout.
+"""
+
+import asyncio
+import hashlib
+import math
+import uuid
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+import numpy.typing as npt
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles.model import ConceptGraphLayout
+from src.articles.schemas import ConceptGraphEdge, ConceptGraphNode
+
+FloatArray = npt.NDArray[np.float64]
+Position = tuple[float, float]
+
+# Positions are scaled to roughly [-LAYOUT_EXTENT, LAYOUT_EXTENT]
+LAYOUT_EXTENT = 1000.0
+FULL_ITERATIONS = 150
+INCREMENTAL_ITERATIONS = 40
+# Recompute from scratch when fewer than this share of nodes have a position
+MIN_KNOWN_FRACTION = 0.5
+
+_GRAVITY = 0.01
+_ATTRACTION = 0.05
+
+
+def _stable_unit(node_id: str) -> FloatArray:
+    """A per-node direction that doesn't depend on process or order."""
+    digest = hashlib.blake2b(node_id.encode(), digest_size=8).digest()
+    angle = int.from_bytes(digest, "big") / 2**64 * 2 * math.pi
+    return np.array([math.cos(angle), math.sin(angle)])
+
+
+def _edge_arrays(
+    index: Mapping[str, int], edges: Sequence[ConceptGraphEdge]
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.intp], FloatArray]:
+    pairs = [
+        (index[e.source], index[e.target], float(e.weight))
+        for e in edges
+        if e.source in index and e.target in index and e.source != e.target
+    ]
+    if not pairs:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, np.zeros(0)
+    src, dst, weight = zip(*pairs, strict=True)
+    w = np.asarray(weight, dtype=np.float64)
+    return (
+        np.asarray(src, dtype=np.intp),
+        np.asarray(dst, dtype=np.intp),
+        w / w.max(),
+    )
+
+
+def _spectral_positions(
+    node_ids: Sequence[str],
+    src: npt.NDArray[np.intp],
+    dst: npt.NDArray[np.intp],
+    weight: FloatArray,
+) -> FloatArray:
+    n = len(node_ids)
+    jitter = np.stack([_stable_unit(node_id) for node_id in node_ids])
+    if n < 3 or not len(src):
+        return jitter * LAYOUT_EXTENT
+
+    adjacency = np.zeros((n, n))
+    np.add.at(adjacency, (src, dst), weight)
+    np.add.at(adjacency, (dst, src), weight)
+    degree = adjacency.sum(axis=1)
+    scale = 1.0 / np.sqrt(np.where(degree > 0, degree, 1.0))
+    _values, vectors = np.linalg.eigh(adjacency * scale[:, None] * scale[None, :])
+    # The top eigenvector is the trivial one; the next two spread the graph
+    coords = vectors[:, -3:-1] * scale[:, None]
+    # Eigenvector signs are arbitrary; fix them so layouts are reproducible
+    coords *= np.where(coords.sum(axis=0) < 0, -1.0, 1.0)
+    spread = np.abs(coords).max()
+    coords = coords / spread if spread > 0 else coords
+    # Nodes the spectrum collapses onto one point are pulled apart by jitter
+    return (coords + 0.05 * jitter) * LAYOUT_EXTENT
+
+
+def _refine(
+    positions: FloatArray,
+    src: npt.NDArray[np.intp],
+    dst: npt.NDArray[np.intp],
+    weight: FloatArray,
+    movable: npt.NDArray[np.bool_],
+    iterations: int,
+) -> FloatArray:
+    """Run the force simulation, moving only the ``movable`` nodes."""
+    positions = positions.copy()
+    n = len(positions)
+    rows = np.flatnonzero(movable)
+    mass = 1.0 + np.bincount(src, minlength=n) + np.bincount(dst, minlength=n)
+    # Repulsion scaled so that, against gravity, the layout settles at about
+    # LAYOUT_EXTENT whatever the graph's size
+    mass_product = np.outer(mass[rows], mass) * (
+        _GRAVITY * LAYOUT_EXTENT**2 / mass.sum()
+    )
+    max_step = LAYOUT_EXTENT * 0.1
+
+    for _ in range(iterations):
+        # Repulsion on the movable rows without materializing (n, n, 2)
+        # differences: sum_j r_ij (p_i - p_j) = p_i * sum_j r_ij - (r @ p)_i
+        moving = positions[rows]
+        sq = np.einsum("ij,ij->i", positions, positions)
+        dist2 = sq[rows, None] + sq[None, :] - 2 * moving @ positions.T
+        repulsion = mass_product / np.maximum(dist2, 1.0)
+        repulsion[np.arange(len(rows)), rows] = 0.0
+        force = np.zeros_like(positions)
+        force[rows] = moving * repulsion.sum(axis=1)[:, None] - repulsion @ positions
+
+        pull = (positions[dst] - positions[src]) * (_ATTRACTION * weight)[:, None]
+        np.add.at(force, src, pull)
+        np.add.at(force, dst, -pull)
+        force -= _GRAVITY * mass[:, None] * positions
+
+        step = force[rows] / mass[rows, None]
+        length = np.linalg.norm(step, axis=1, keepdims=True)
+        step *= np.minimum(1.0, max_step / np.maximum(length, 1e-9))
+        positions[rows] += step
+        max_step *= 0.97
+
+    return positions
+
+
+def layout_graph(
+    node_ids: Sequence[str],
+    edges: Sequence[ConceptGraphEdge],
+    previous: Mapping[str, Position] | None = None,
+) -> dict[str, Position]:
+    """Positions for ``node_ids``, keeping ``previous`` ones where possible."""
+    if not node_ids:
+        return {}
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    src, dst, weight = _edge_arrays(index, edges)
+    previous = previous or {}
+    known = np.array([node_id in previous for node_id in node_ids])
+
+    if known.mean() < MIN_KNOWN_FRACTION:
+        positions = _spectral_positions(node_ids, src, dst, weight)
+        movable = np.ones(len(node_ids), dtype=bool)
+        positions = _refine(positions, src, dst, weight, movable, FULL_ITERATIONS)
+    else:
+        positions = np.zeros((len(node_ids), 2))
+        for node_id, i in index.items():
+            if known[i]:
+                positions[i] = previous[node_id]
+        radius = float(np.abs(positions[known]).max(initial=LAYOUT_EXTENT))
+        # New nodes start at the weighted centre of their known neighbours,
+        # or on the rim if they have none
+        sums = np.zeros((len(node_ids), 2))
+        totals = np.zeros(len(node_ids))
+        for a, b in ((src, dst), (dst, src)):
+            linked = known[b] & ~known[a]
+            np.add.at(sums, a[linked], positions[b[linked]] * weight[linked, None])
+            np.add.at(totals, a[linked], weight[linked])
+        for node_id, i in index.items():
+            if known[i]:
+                continue
+            offset = _stable_unit(node_id)
+            if totals[i] > 0:
+                positions[i] = sums[i] / totals[i] + offset * LAYOUT_EXTENT * 0.02
+            else:
+                positions[i] = offset * radius * 1.1
+        positions = _refine(positions, src, dst, weight, ~known, INCREMENTAL_ITERATIONS)
+
+    return {
+        node_id: (round(float(x), 2), round(float(y), 2))
+        for node_id, (x, y) in zip(node_ids, positions, strict=True)
+    }
+
+
+async def _stored_positions(
+    db: AsyncSession, user_id: uuid.UUID
+) -> dict[str, Position]:
+    stored = (
+        await db.execute(
+            select(ConceptGraphLayout.positions).where(
+                ConceptGraphLayout.user_id == user_id
+            )
+        )
+    ).scalar_one_or_none() or {}
+    return {node_id: (float(xy[0]), float(xy[1])) for node_id, xy in stored.items()}
+
+
+async def read_graph_layout(
+    db: AsyncSession, user_id: uuid.UUID, nodes: Sequence[ConceptGraphNode]
+) -> None:
+    """Set ``x``/``y`` on the ``nodes`` that have a stored position.
+
+    Nodes added since the last layout keep ``None``, and clients place them.
+    """
+    positions = await _stored_positions(db, user_id)
+    for node in nodes:
+        if node.id in positions:
+            node.x, node.y = positions[node.id]
+
+
+async def update_graph_layout(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    nodes: Sequence[ConceptGraphNode],
+    edges: Sequence[ConceptGraphEdge],
+) -> bool:
+    """Place the ``nodes`` that have no stored position and store the layout.
+
+    Nodes that left the graph are dropped from it.
+
+    Returns:
+        True if the layout was recomputed, False if every node had a position.
+    """
+    previous = await _stored_positions(db, user_id)
+    node_ids = [node.id for node in nodes]
+    if all(node_id in previous for node_id in node_ids):
+        return False
+
+    # CPU-bound (a couple of seconds for a fresh 1000-node layout, tens of
+    # milliseconds to place a few new nodes); keep it off the event loop
+    positions = await asyncio.to_thread(layout_graph, node_ids, edges, previous)
+    values = {node_id: list(xy) for node_id, xy in positions.items()}
+    await db.execute(
+        insert(ConceptGraphLayout)
+        .values(id=uuid.uuid4(), user_id=user_id, positions=values)
+        .on_conflict_do_update(
+            index_elements=[ConceptGraphLayout.user_id],
+            set_={"positions": values, "updated_at": func.now()},
+        )
+    )
+    return True
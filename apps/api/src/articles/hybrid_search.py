@@ -0,0 +1,316 @@
+"""Hybrid lexical + vector search with reciprocal rank fusion.
+
+``search_articles_hybrid`` (``mode=hybrid`` search) builds one ranking per
+query:
+
+1. Full-text candidates (``ts_rank_cd`` over ``articles.search_vector``) and
+   vector candidates (the in-memory vector index, or pgvector when filters
+   apply) are generated concurrently. The lexical query runs while the query
+   embedding is still being fetched, each leg on its own session.
+2. The two lists are fused with reciprocal rank fusion, so an article near
+   the top of either list ranks well and one in both ranks best.
+3. Articles whose summary concepts match the query's concepts get a bonus
+   worth about a first place in one list.
+
+The ranking is cached per ``(user, query, filters)`` for a short while, so
+paging through results reads one page of articles instead of repeating
+both searches. If the embedding or vector leg fails the lexical ranking is
+still served, but not cached, so the next request retries the vector leg.
+"""
+
+import asyncio
+import time
+import uuid
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.articles import search as article_search
+from src.articles import service as article_service
+from src.articles.concept_normalization import normalize_concept, normalize_concepts
+from src.articles.model import Article, ArticleEmbedding, ArticleSummary
+from src.articles.schemas import ArticleListResponse
+from src.articles.vector_index import get_vector_index_cache
+from src.common.models.pagination import (
+    CountMode,
+    InvalidCursorError,
+    PaginatedResponse,
+    decode_cursor,
+    encode_cursor,
+)
+from src.lib.ai.base import AIProvider
+from src.lib.ai.embedding_cache import get_embedding_cache, normalize_query_text
+from src.lib.config import settings
+from src.lib.logging import get_logger
+from src.lib.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+HYBRID_CURSOR_KIND = "hybrid"
+
+# A full concept match is worth about as much as ranking first in one list
+CONCEPT_OVERLAP_WEIGHT = 1.0 / (article_service.RRF_K + 1)
+
+Ranking = list[tuple[uuid.UUID, float]]
+_CacheKey = tuple[uuid.UUID, str, str | None, str | None]
+
+
+def query_concepts(query: str) -> set[str]:
+    """Concept norms a query refers to: the whole query and each term."""
+    terms = [query, *query.split()]
+    return {norm for norm in map(normalize_concept, terms) if norm}
+
+
+def fuse_rankings(
+    rankings: Iterable[Sequence[uuid.UUID]],
+    article_concepts: dict[uuid.UUID, set[str]],
+    wanted_concepts: set[str],
+) -> Ranking:
+    """Fuse ranked id lists with RRF and rerank by concept overlap.
+
+    Returns:
+        ``(article_id, score)`` pairs, best first (ties by id).
+    """
+    scores: dict[uuid.UUID, float] = {}
+    for ranking in rankings:
+        for rank, article_id in enumerate(ranking, start=1):
+            scores[article_id] = scores.get(article_id, 0.0) + 1.0 / (
+                article_service.RRF_K + rank
+            )
+    if wanted_concepts:
+        for article_id in scores:
+            overlap = len(wanted_concepts & article_concepts.get(article_id, set()))
+            scores[article_id] += (
+                CONCEPT_OVERLAP_WEIGHT * overlap / len(wanted_concepts)
+            )
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class SearchRankingCache:
+    """LRU with TTL of fused rankings, keyed by user, query and filters."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._entries: TTLCache[_CacheKey, Ranking] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _CacheKey) -> Ranking | None:
+        return self._entries.get(key)
+
+    def set(self, key: _CacheKey, ranking: Ranking) -> None:
+        self._entries.set(key, ranking)
+
+
+async def _lexical_candidates(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    query: str,
+    status_filter: str | None,
+    content_type_filter: str | None,
+) -> list[uuid.UUID]:
+    tsquery = article_search.to_tsquery(query)
+    if tsquery is None:
+        return []
+    rank_expr = article_search.rank(tsquery)
+    stmt = article_service.filter_articles(
+        select(Article.id).where(
+            Article.user_id == user_id, article_search.matches(tsquery)
+        ),
+        status_filter,
+        content_type_filter,
+    )
+    result = await db.execute(
+        stmt.order_by(rank_expr.desc(), Article.id).limit(
+            article_service.HYBRID_CANDIDATES
+        )
+    )
+    return list(result.scalars().all())
+
+
+async def _vector_candidates(
+    ai: AIProvider[Any],
+    user_id: uuid.UUID,
+    query: str,
+    status_filter: str | None,
+    content_type_filter: str | None,
+    similarity_threshold: float,
+) -> list[uuid.UUID]:
+    from src.lib.database import async_session_factory
+
+    embedding = await get_embedding_cache().embed(ai, query)
+    async with async_session_factory() as session:
+        # The in-memory index can't apply filters; pgvector can
+        if settings.VECTOR_INDEX_ENABLED and not (status_filter or content_type_filter):
+            index = await get_vector_index_cache().get(session, user_id)
+            hits = index.search(embedding, article_service.HYBRID_CANDIDATES)[0]
+            return [
+                article_id
+                for article_id, similarity in hits
+                if similarity >= similarity_threshold
+            ]
+
+        distance_expr = ArticleEmbedding.embedding.cosine_distance(embedding)
+        stmt = article_service.filter_articles(
+            select(Article.id)
+            .join(ArticleEmbedding, ArticleEmbedding.article_id == Article.id)
+            .where(
+                Article.user_id == user_id,
+                distance_expr <= 1 - similarity_threshold,
+            ),
+            status_filter,
+            content_type_filter,
+        )
+        await article_service.set_ann_search_params(session, None, None)
+        result = await session.execute(
+            stmt.order_by(distance_expr).limit(article_service.HYBRID_CANDIDATES)
+        )
+        return list(result.scalars().all())
+
+
+async def _article_concepts(
+    db: AsyncSession, article_ids: Iterable[uuid.UUID]
+) -> dict[uuid.UUID, set[str]]:
+    rows = await db.execute(
+        select(
+            ArticleSummary.article_id,
+            ArticleSummary.concepts,
+            ArticleSummary.concept_norms,
+        ).where(ArticleSummary.article_id.in_(list(article_ids)))
+    )
+    return {
+        article_id: {norm for norm in (norms or normalize_concepts(concepts)) if norm}
+        for article_id, concepts, norms in rows.all()
+    }
+
+
+async def rank_articles(
+    db: AsyncSession,
+    ai: AIProvider[Any],
+    user_id: uuid.UUID,
+    query: str,
+    status_filter: str | None = None,
+    content_type_filter: str | None = None,
+    similarity_threshold: float = 0.3,
+) -> tuple[Ranking, bool]:
+    """Fused and reranked ``(article_id, score)`` list for ``query``.
+
+    Returns:
+        The ranking, and whether both legs contributed to it.
+    """
+    lexical, vector = await asyncio.gather(
+        _lexical_candidates(db, user_id, query, status_filter, content_type_filter),
+        _vector_candidates(
+            ai,
+            user_id,
+            query,
+            status_filter,
+            content_type_filter,
+            similarity_threshold,
+        ),
+        return_exceptions=True,
+    )
+    if isinstance(lexical, BaseException):
+        raise lexical
+    rankings = [lexical]
+    complete = not isinstance(vector, BaseException)
+    if isinstance(vector, BaseException):
+        logger.warning(
+            "Vector candidates failed; serving lexical results",
+            error=str(vector),
+        )
+    else:
+        rankings.append(vector)
+
+    candidates = {article_id for ranking in rankings for article_id in ranking}
+    concepts = await _article_concepts(db, candidates) if candidates else {}
+    return fuse_rankings(rankings, concepts, query_concepts(query)), complete
+
+
+async def search_articles_hybrid(
+    db: AsyncSession,
+    ai: AIProvider[Any],
+    user_id: str,
+    query: str,
+    page: int = 1,
+    limit: int = 20,
+    status_filter: str | None = None,
+    content_type_filter: str | None = None,
+    cursor: str | None = None,
+    count_mode: CountMode = "none",
+) -> PaginatedResponse[ArticleListResponse]:
+    """Page through the cached hybrid ranking for ``query``.
+
+    ``cursor`` is the offset into the ranking. Articles deleted since the
+    ranking was cached are skipped, so a page can come back short.
+    """
+    offset = (page - 1) * limit
+    if cursor:
+        values = decode_cursor(cursor, HYBRID_CURSOR_KIND)
+        if len(values) != 1 or not isinstance(values[0], int) or values[0] < 0:
+            raise InvalidCursorError("Malformed pagination cursor")
+        offset = values[0]
+
+    uid = uuid.UUID(user_id)
+    key = (uid, normalize_query_text(query), status_filter, content_type_filter)
+    cache = get_search_ranking_cache()
+    ranking = cache.get(key)
+    if ranking is None:
+        ranking, complete = await rank_articles(
+            db, ai, uid, query, status_filter, content_type_filter
+        )
+        if complete:
+            cache.set(key, ranking)
+
+    window = [article_id for article_id, _score in ranking[offset : offset + limit]]
+    articles: dict[uuid.UUID, Article] = {}
+    if window:
+        result = await db.execute(
+            select(Article)
+            .options(selectinload(Article.summary))
+            .where(Article.user_id == uid, Article.id.in_(window))
+        )
+        articles = {article.id: article for article in result.scalars()}
+
+    has_next = offset + limit < len(ranking)
+    return PaginatedResponse.create(
+        data=[
+            article_service.to_list_item(articles[article_id])
+            for article_id in window
+            if article_id in articles
+        ],
+        total=None if count_mode == "none" else len(ranking),
+        page=page,
+        limit=limit,
+        next_cursor=encode_cursor(HYBRID_CURSOR_KIND, [offset + limit])
+        if has_next
+        else None,
+        has_next=has_next,
+        has_prev=offset > 0,
+        total_estimated=False,
+    )
+
+
+_cache_instance: SearchRankingCache | None = None
+
+
+def get_search_ranking_cache() -> SearchRankingCache:
+    """Get the process-wide hybrid search ranking cache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = SearchRankingCache(
+            max_entries=settings.HYBRID_SEARCH_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.HYBRID_SEARCH_CACHE_TTL_SECONDS,
+        )
+    return _cache_instance
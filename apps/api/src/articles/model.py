@@ -1,8 +1,18 @@
 import uuid as uuid_lib
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import ForeignKey, Index, Integer, String, Text, text
-from sqlalchemy.dialects.postgresql import JSON, UUID
+from sqlalchemy import (
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSON, JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.common.models.base import TimestampMixin, UUIDMixin
@@ -11,6 +21,23 @@ from src.lib.database import Base
 
 class Article(UUIDMixin, TimestampMixin, Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # Serves newest-first listing and (created_at, id) keyset pagination
+        Index("ix_articles_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_articles_search_vector", "search_vector", postgresql_using="gin"),
+        # Serves get_article_by_url
+        Index("ix_articles_user_id_normalized_url", "user_id", "normalized_url"),
+        # At most one analysis in flight per user and URL
+        Index(
+            "uq_articles_user_id_normalized_url_processing",
+            "user_id",
+            "normalized_url",
+            unique=True,
+            postgresql_where=text(
+                "status = 'processing' AND normalized_url IS NOT NULL"
+            ),
+        ),
+    )
 
     user_id: Mapped[uuid_lib.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -19,6 +46,8 @@ class Article(UUIDMixin, TimestampMixin, Base):
         index=True,
     )
     url: Mapped[str | None] = mapped_column(String(2048), nullable=True)
+    # normalize_url() of ``url``; rows saved before it existed hold ``url``
+    normalized_url: Mapped[str | None] = mapped_column(String(2048), nullable=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     original_title: Mapped[str | None] = mapped_column(String(500), nullable=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
@@ -32,6 +61,10 @@ class Article(UUIDMixin, TimestampMixin, Base):
     status: Mapped[str] = mapped_column(
         String(20), nullable=False, server_default=text("'pending'")
     )
+    # Maintained by database triggers from title/content and the summary row
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
 
     # Relationships
     summary: Mapped["ArticleSummary | None"] = relationship(
@@ -54,6 +87,8 @@ class ArticleSummary(UUIDMixin, TimestampMixin, Base):
     summary: Mapped[str] = mapped_column(Text, nullable=False)
     markdown_note: Mapped[str | None] = mapped_column(Text, nullable=True)
     concepts: Mapped[list[str]] = mapped_column(JSON, nullable=False, default=list)
+    # normalize_concept() of each entry of ``concepts``, in the same order
+    concept_norms: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
     root_concept_label: Mapped[str | None] = mapped_column(String(255), nullable=True)
     root_concept_norm: Mapped[str | None] = mapped_column(
         String(255),
@@ -93,11 +128,130 @@ class ArticleEmbedding(UUIDMixin, TimestampMixin, Base):
     article: Mapped["Article"] = relationship(back_populates="embedding")
 
 
-# IVFFlat index for cosine similarity search (PoC; production would use HNSW)
+class UserConcept(UUIDMixin, TimestampMixin, Base):
+    """One root concept in a user's vocabulary.
+
+    Maintained by database triggers on ``article_summaries`` and ``articles``:
+    ``article_count`` is the number of the user's summaries with this
+    ``root_concept_norm`` and ``label_counts`` counts their root labels.
+    Rows whose count drops to zero are kept (with ``updated_at`` bumped) so
+    incremental readers see the removal.
+    """
+
+    __tablename__ = "user_concepts"
+    __table_args__ = (
+        UniqueConstraint("user_id", "norm", name="uq_user_concepts_user_id_norm"),
+        # Serves incremental reads of what changed since a given time
+        Index("ix_user_concepts_user_id_updated_at", "user_id", "updated_at"),
+    )
+
+    user_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    norm: Mapped[str] = mapped_column(String(255), nullable=False)
+    label_counts: Mapped[dict[str, int]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    article_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+
+
+class ArticleConcept(UUIDMixin, TimestampMixin, Base):
+    """Article-concept edge of the concept graph.
+
+    ``position`` 0 is the article's root concept. Written when the summary
+    is saved (see ``src.articles.concept_graph``).
+    """
+
+    __tablename__ = "article_concepts"
+    __table_args__ = (
+        UniqueConstraint(
+            "article_id", "norm", name="uq_article_concepts_article_id_norm"
+        ),
+        Index("ix_article_concepts_user_id_norm", "user_id", "norm"),
+    )
+
+    article_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    norm: Mapped[str] = mapped_column(String(255), nullable=False)
+    label: Mapped[str] = mapped_column(String(255), nullable=False)
+    position: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+
+class ArticleNeighbor(UUIDMixin, TimestampMixin, Base):
+    """Article-article edge: ``neighbor_id`` is among the nearest articles to
+    ``article_id`` by embedding.
+
+    Maintained by the ``concept-graph-neighbors`` job (see ``concept_graph``),
+    which the worker enqueues after writing embeddings.
+    """
+
+    __tablename__ = "article_neighbors"
+    __table_args__ = (
+        UniqueConstraint(
+            "article_id",
+            "neighbor_id",
+            name="uq_article_neighbors_article_id_neighbor_id",
+        ),
+        Index("ix_article_neighbors_neighbor_id", "neighbor_id"),
+        Index("ix_article_neighbors_user_id", "user_id"),
+    )
+
+    article_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    neighbor_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    similarity: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class ConceptGraphLayout(UUIDMixin, TimestampMixin, Base):
+    """Stored 2D positions of a user's global concept graph nodes.
+
+    ``positions`` maps node ids (``concept:<norm>``, ``article:<id>``) to
+    ``[x, y]``; see ``src.articles.graph_layout``.
+    """
+
+    __tablename__ = "concept_graph_layouts"
+
+    user_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    positions: Mapped[dict[str, list[float]]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+
+
+# HNSW index for cosine similarity search. Query-time recall is tuned with
+# hnsw.ef_search (see VECTOR_SEARCH_EF_SEARCH).
 article_embedding_index = Index(
-    "ix_article_embeddings_embedding",
+    "ix_article_embeddings_embedding_hnsw",
     ArticleEmbedding.embedding,
-    postgresql_using="ivfflat",
-    postgresql_with={"lists": 100},
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
     postgresql_ops={"embedding": "vector_cosine_ops"},
 )
@@ -1,40 +1,73 @@
 import asyncio
 import uuid
-from typing import Literal
 
 import structlog
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.articles import service
+from src.articles import analysis, hybrid_search, service
 from src.articles.schemas import (
     ArticleAnalyzeURL,
     ArticleCreate,
     ArticleListResponse,
     ArticleResponse,
     ArticleSaveResponse,
+    ArticleStatusResponse,
     ArticleUpdate,
+    ConceptGraphResponse,
     SimilarArticleResponse,
 )
-from src.common.models.pagination import PaginatedResponse
+from src.articles.status_notifier import get_status_notifier
+from src.common.models.pagination import (
+    CountMode,
+    InvalidCursorError,
+    PaginatedResponse,
+)
+from src.jobs.consumer import wake_job_consumer
+from src.lib.ai.embedding_cache import get_embedding_cache
+from src.lib.ai.scheduler import Priority
 from src.lib.config import settings
 from src.lib.content_classifier import ContentType, classify_url
 from src.lib.dependencies import AIService, CurrentUser, DBSession
 from src.lib.pdf_extractor import extract_text_from_pdf_url
+from src.lib.rate_limit import RateLimitPolicy, limit_by_user
 from src.lib.video_transcript import (
     TranscriptProviderError,
     TranscriptUnavailableError,
     UnsupportedVideoUrlError,
     get_video_transcript_service,
 )
+from src.subscriptions import credits
 from src.subscriptions import service as sub_service
-
-# Keep references to background tasks so they are not garbage-collected.
-_background_tasks: set[asyncio.Task[None]] = set()
+from src.subscriptions.entitlements import get_entitlement_cache
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter()
 
+# Long-poll limits for GET /{article_id}/status. Waiters re-read the status
+# periodically because notifications only cover this process.
+ARTICLE_STATUS_MAX_WAIT_SECONDS = 30.0
+ARTICLE_STATUS_RECHECK_SECONDS = 2.0
+
+# Per-user budgets for the expensive endpoints, separate from cheap reads.
+# Search modes that fuse several rankings spend more of the budget.
+SEARCH_MODE_COSTS: dict[str, int] = {"exact": 1, "ann": 1, "hybrid": 2}
+
+
+def _search_cost(request: Request) -> int:
+    return SEARCH_MODE_COSTS.get(request.query_params.get("mode", "exact"), 1)
+
+
+SEARCH_RATE_LIMIT = limit_by_user(
+    RateLimitPolicy(
+        "search", requests=60, window=60, plan_requests={"pro": 300}, cost=_search_cost
+    )
+)
+ANALYZE_URL_RATE_LIMIT = limit_by_user(
+    RateLimitPolicy("analyze-url", requests=10, window=600, plan_requests={"pro": 60})
+)
+
 VIDEO_TRANSCRIPT_MIN_CONTENT_CHARS = int(
     getattr(settings, "VIDEO_TRANSCRIPT_MIN_CONTENT_CHARS", 100)
 )
@@ -81,6 +114,18 @@ def enforce_content_type_access(plan: str, content_type: ContentType) -> None:
     )
 
 
+async def reserve_analysis_credit(
+    db: AsyncSession, user_id: str, article_id: uuid.UUID, plan: str
+) -> None:
+    """Reserve the analysis credit, or 402 if concurrent requests used it up."""
+    if await credits.reserve_credit(db, uuid.UUID(user_id), article_id, plan):
+        return
+    raise HTTPException(
+        status_code=status.HTTP_402_PAYMENT_REQUIRED,
+        detail="Analysis limit reached. Upgrade to Pro for unlimited.",
+    )
+
+
 async def prepare_analyze_url_content(
     *,
     url: str,
@@ -132,226 +177,27 @@ async def prepare_analyze_url_content(
     )
 
 
-async def _run_analysis(
-    article_id: uuid.UUID,
-    title: str,
-    content: str,
-    provider: Literal["gemini", "openai"],
-    summary_language: str = "ko",
-    article_url: str | None = None,
-) -> bool:
-    """Background task: summarize article with AI and save to DB."""
-    from src.articles.model import Article, ArticleSummary
-    from src.lib.ai_service import summarize_article
-    from src.lib.database import async_session_factory
-
-    logger.info(
-        "Starting article analysis",
-        article_id=str(article_id),
-        provider=provider,
-        summary_language=summary_language,
-        content_length=len(content),
-    )
-
-    try:
-        logger.info(
-            "Calling summarize_article", article_id=str(article_id), provider=provider
-        )
-        analysis_timeout_seconds = 120
-        result, content_type = await asyncio.wait_for(
-            summarize_article(
-                title,
-                content,
-                url=article_url,
-                provider=provider,
-                summary_language=summary_language,
-            ),
-            timeout=analysis_timeout_seconds,
-        )
-        logger.info(
-            "summarize_article completed successfully",
-            article_id=str(article_id),
-            result_summary_length=len(result.summary),
-            concepts_count=len(result.concepts),
-        )
-
-        model_name = settings.GEMINI_MODEL if provider == "gemini" else "gpt-4o-mini"
-        root_concept_label = (result.root_concept or "").strip()
-        if not root_concept_label and result.concepts:
-            root_concept_label = result.concepts[0].strip()
+def _already_saved(article: object) -> ArticleSaveResponse:
+    response = ArticleSaveResponse.model_validate(article)
+    response.already_saved = True
+    return response
 
-        logger.info("Saving summary to database", article_id=str(article_id))
-        async with async_session_factory() as session:
-            from sqlalchemy import select
 
-            user_res = await session.execute(
-                select(Article.user_id).where(Article.id == article_id)
-            )
-            user_id = user_res.scalar_one_or_none()
-
-            existing_norms: list[str] = []
-            if user_id:
-                norms_res = await session.execute(
-                    select(ArticleSummary.root_concept_norm)
-                    .join(Article, ArticleSummary.article_id == Article.id)
-                    .where(
-                        Article.user_id == user_id,
-                        ArticleSummary.root_concept_norm.is_not(None),
-                        ArticleSummary.root_concept_norm != "",
-                    )
-                    .distinct()
-                )
-                existing_norms = [n for n in norms_res.scalars().all() if n]
-
-            (
-                resolved_root_label,
-                resolved_root_norm,
-                resolved_concepts,
-            ) = service.resolve_concept_candidates(
-                root_concept_label=root_concept_label,
-                concepts=result.concepts,
-                existing_norms=existing_norms,
-                max_candidates=2,
-                threshold=0.92,
-            )
-
-            # Extract type-specific metadata (fields beyond base)
-            from src.lib.agents.base import BaseSummaryResult
-
-            base_fields = set(BaseSummaryResult.model_fields.keys())
-            type_metadata = {
-                k: v for k, v in result.model_dump().items() if k not in base_fields
-            }
-
-            summary = ArticleSummary(
-                article_id=article_id,
-                summary=result.summary,
-                markdown_note=result.markdown_note,
-                concepts=resolved_concepts,
-                root_concept_label=resolved_root_label,
-                root_concept_norm=resolved_root_norm,
-                key_points=result.key_points,
-                reading_time_minutes=result.reading_time_minutes,
-                language=result.language,
-                content_type=str(content_type),
-                type_metadata=type_metadata,
-                ai_provider=provider,
-                ai_model=model_name,
-            )
-            session.add(summary)
-
-            from sqlalchemy import update
-
-            await session.execute(
-                update(Article)
-                .where(Article.id == article_id)
-                .values(status="analyzed")
-            )
-            await session.commit()
-            logger.info(
-                "Summary saved and status updated to analyzed",
-                article_id=str(article_id),
-            )
-
-        logger.info("Article analysis complete", article_id=str(article_id))
-
-        # Trigger embedding generation asynchronously.
-        try:
-            from src.lib.worker_client import dispatch_worker_task
-
-            await dispatch_worker_task("embedding", {"article_id": str(article_id)})
-        except Exception:
-            logger.exception(
-                "Failed to dispatch embedding task",
-                article_id=str(article_id),
-            )
-        return True
-    except Exception as e:
-        logger.exception(
-            "Article analysis failed",
-            article_id=str(article_id),
-            error_type=type(e).__name__,
-            error_message=str(e),
-            exc_info=True,
-        )
-        try:
-            from sqlalchemy import update
-
-            async with async_session_factory() as session:
-                await session.execute(
-                    update(Article)
-                    .where(Article.id == article_id)
-                    .values(status="failed")
-                )
-                await session.commit()
-                logger.info("Status updated to failed", article_id=str(article_id))
-        except Exception as db_error:
-            logger.exception(
-                "Failed to mark article as failed",
-                article_id=str(article_id),
-                db_error_type=type(db_error).__name__,
-                db_error_message=str(db_error),
-            )
-        return False
-
-
-async def _run_analysis_async(
-    article_id: uuid.UUID,
-    title: str,
-    content: str,
-    provider: Literal["gemini", "openai"],
-    summary_language: str,
-    user_id: str,
-    article_url: str | None = None,
-) -> None:
-    """Background wrapper to run analysis and update summary usage."""
-    logger.info(
-        "Background analysis task started",
-        article_id=str(article_id),
-        user_id=user_id,
-        provider=provider,
-    )
-    try:
-        ok = await _run_analysis(
-            article_id,
-            title,
-            content,
-            provider,
-            summary_language=summary_language,
-            article_url=article_url,
-        )
-        if ok:
-            logger.info(
-                "Analysis succeeded, incrementing summary usage",
-                article_id=str(article_id),
-                user_id=user_id,
-            )
-            from src.lib.database import async_session_factory
-
-            async with async_session_factory() as session:
-                await sub_service.increment_summary_usage(session, user_id)
-                await session.commit()
-    except Exception as exc:
-        logger.exception(
-            "Analysis wrapper failed for article",
-            article_id=str(article_id),
-            error=str(exc),
-        )
-        try:
-            await service.update_article_status(article_id, "failed")
-        except Exception:
-            logger.exception(
-                "Failed to mark article as failed from wrapper",
-                article_id=str(article_id),
-            )
-
-
-@router.post("", response_model=ArticleResponse, status_code=status.HTTP_201_CREATED)
+@router.post("", response_model=ArticleResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_article(
     data: ArticleCreate,
     db: DBSession,
     user: CurrentUser,
 ) -> ArticleResponse:
+    if data.url:
+        # Attach to an analysis of this URL already in flight
+        await service.lock_article_url(db, user.id, data.url)
+        in_flight = await service.get_article_by_url(
+            db, user.id, data.url, status="processing"
+        )
+        if in_flight:
+            return ArticleResponse.model_validate(in_flight)
+
     # Check analysis credit
     usage_info = await sub_service.get_usage_info(db, user.id)
     if not usage_info.can_summarize:
@@ -366,22 +212,16 @@ async def create_article(
     enforce_content_type_access(usage_info.plan, requested_content_type)
 
     article = await service.create_article(db, user.id, data)
-    await db.commit()
-
-    selected_provider: Literal["gemini", "openai"] = "gemini"
-    ok = await _run_analysis(
-        article.id,
-        article.title,
-        article.content,
-        selected_provider,
-        article_url=article.url,
+    await reserve_analysis_credit(db, user.id, article.id, usage_info.plan)
+    # Analysis runs on the job queue; clients follow it via GET /{id}/status.
+    await analysis.start_analysis(
+        db, article.id, summary_language=data.requested_summary_language or "ko"
     )
-    if ok:
-        await sub_service.increment_summary_usage(db, user.id)
-        await db.commit()
-    updated = await service.get_article(db, article.id, user.id)
-    if updated:
-        article = updated
+    await db.commit()
+    # After the commit, so a concurrent lookup can't cache the old usage
+    await get_entitlement_cache().invalidate(uuid.UUID(user.id))
+    article.status = "processing"
+    wake_job_consumer()
 
     return ArticleResponse.model_validate(article)
 
@@ -395,19 +235,33 @@ async def list_articles(
     search: str | None = Query(default=None),
     status_filter: str | None = Query(default=None, alias="status"),
     content_type_filter: str | None = Query(default=None, alias="content_type"),
+    cursor: str | None = Query(default=None, max_length=512),
+    count_mode: CountMode = Query(default="exact", alias="count"),
 ) -> PaginatedResponse[ArticleListResponse]:
-    return await service.list_articles(
-        db,
-        user.id,
-        page=page,
-        limit=limit,
-        search=search,
-        status_filter=status_filter,
-        content_type_filter=content_type_filter,
-    )
+    try:
+        return await service.list_articles(
+            db,
+            user.id,
+            page=page,
+            limit=limit,
+            search=search,
+            status_filter=status_filter,
+            content_type_filter=content_type_filter,
+            cursor=cursor,
+            count_mode=count_mode,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
 
 
-@router.get("/search", response_model=PaginatedResponse[ArticleListResponse])
+@router.get(
+    "/search",
+    response_model=PaginatedResponse[ArticleListResponse],
+    dependencies=[Depends(SEARCH_RATE_LIMIT)],
+)
 async def search_articles(
     db: DBSession,
     user: CurrentUser,
@@ -417,9 +271,28 @@ async def search_articles(
     limit: int = Query(default=20, ge=1, le=100),
     status_filter: str | None = Query(default=None, alias="status"),
     content_type_filter: str | None = Query(default=None, alias="content_type"),
+    cursor: str | None = Query(default=None, max_length=512),
+    count_mode: CountMode | None = Query(default=None, alias="count"),
+    mode: service.SearchMode = Query(default="exact"),
 ) -> PaginatedResponse[ArticleListResponse]:
+    # Only exact search counts every match unless asked to
+    if count_mode is None:
+        count_mode = "exact" if mode == "exact" else "none"
     try:
-        embedding = await ai.generate_embedding(q)
+        if mode == "hybrid":
+            return await hybrid_search.search_articles_hybrid(
+                db,
+                ai,
+                user.id,
+                q,
+                page=page,
+                limit=limit,
+                status_filter=status_filter,
+                content_type_filter=content_type_filter,
+                cursor=cursor,
+                count_mode=count_mode,
+            )
+        embedding = await get_embedding_cache().embed(ai, q)
         return await service.search_articles_semantic(
             db,
             user.id,
@@ -428,9 +301,19 @@ async def search_articles(
             limit=limit,
             status_filter=status_filter,
             content_type_filter=content_type_filter,
+            cursor=cursor,
+            count_mode=count_mode,
+            mode=mode,
         )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
     except Exception:
         logger.warning("Semantic search failed, falling back to text search", query=q)
+
+    try:
         return await service.list_articles(
             db,
             user.id,
@@ -439,7 +322,27 @@ async def search_articles(
             search=q,
             status_filter=status_filter,
             content_type_filter=content_type_filter,
+            cursor=cursor,
+            count_mode=count_mode,
         )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        ) from exc
+
+
+@router.get("/graph", response_model=ConceptGraphResponse)
+async def get_concept_graph(
+    db: DBSession,
+    user: CurrentUser,
+    root: str | None = Query(default=None, max_length=300),
+    mode: str | None = Query(default=None, pattern="^global$"),
+    max_nodes: int = Query(default=1000, ge=1, le=1000),
+) -> ConceptGraphResponse:
+    return await service.get_concept_graph(
+        db, user.id, root=root, mode=mode, max_nodes=max_nodes
+    )
 
 
 @router.get("/{article_id}", response_model=ArticleResponse)
@@ -457,6 +360,43 @@ async def get_article(
     return ArticleResponse.model_validate(article)
 
 
+@router.get("/{article_id}/status", response_model=ArticleStatusResponse)
+async def get_article_status(
+    article_id: uuid.UUID,
+    user: CurrentUser,
+    wait: float = Query(default=0, ge=0, le=ARTICLE_STATUS_MAX_WAIT_SECONDS),
+) -> ArticleStatusResponse:
+    """Return the analysis status, long-polling up to ``wait`` seconds.
+
+    With ``wait`` > 0 the request is held until the article settles
+    (analyzed, completed or failed) or the wait elapses, so clients can loop
+    on this endpoint instead of polling ``GET /{id}``.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    notifier = get_status_notifier()
+    user_id = uuid.UUID(user.id)
+
+    current = await service.get_article_status(article_id, user_id)
+    while current is not None and current not in service.SETTLED_ARTICLE_STATUSES:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        await notifier.wait(article_id, min(remaining, ARTICLE_STATUS_RECHECK_SECONDS))
+        current = await service.get_article_status(article_id, user_id)
+
+    if current is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article not found",
+        )
+    return ArticleStatusResponse(
+        id=article_id,
+        status=current,
+        settled=current in service.SETTLED_ARTICLE_STATUSES,
+    )
+
+
 @router.patch("/{article_id}", response_model=ArticleResponse)
 async def update_article(
     article_id: uuid.UUID,
@@ -486,6 +426,9 @@ async def delete_article(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Article not found",
         )
+    # Deleting releases the article's reserved credit, if it held one
+    await db.commit()
+    await get_entitlement_cache().invalidate(uuid.UUID(user.id))
 
 
 @router.get("/{article_id}/similar", response_model=list[SimilarArticleResponse])
@@ -511,13 +454,16 @@ async def retry_article_analysis(
     db: DBSession,
     user: CurrentUser,
 ) -> ArticleResponse:
-    article = await service.get_article(db, article_id, user.id)
+    # Row lock: a concurrent retry of this article waits, then attaches below
+    article = await service.get_article(db, article_id, user.id, for_update=True)
     if not article:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Article not found",
         )
 
+    if article.status == "processing":
+        return ArticleResponse.model_validate(article)
     if article.status != "failed":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -534,27 +480,32 @@ async def retry_article_analysis(
     requested_content_type = resolve_content_type_for_retry(article)
     enforce_content_type_access(usage_info.plan, requested_content_type)
 
-    await service.update_article_status(article.id, "processing")
-    article.status = "processing"
+    if article.url:
+        await service.lock_article_url(db, user.id, article.url)
+        in_flight = await service.get_article_by_url(
+            db, user.id, article.url, status="processing"
+        )
+        if in_flight:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Another article for this URL is being analyzed",
+            )
 
-    selected_provider: Literal["gemini", "openai"] = "gemini"
+    # Normally released when the last attempt dead-lettered; re-reserve fresh
+    await credits.release_credit(db, article.id)
+    await reserve_analysis_credit(db, user.id, article.id, usage_info.plan)
 
     summary_language = resolve_summary_language_for_retry(article)
-
-    task = asyncio.create_task(
-        _run_analysis_async(
-            article.id,
-            article.title,
-            article.content,
-            selected_provider,
-            summary_language,
-            user.id,
-            article_url=article.url,
-        ),
-        name=f"article-analysis-retry-{article.id}",
+    await analysis.start_analysis(
+        db,
+        article.id,
+        summary_language=summary_language,
+        priority=Priority.RETRY,
     )
-    _background_tasks.add(task)
-    task.add_done_callback(_background_tasks.discard)
+    await db.commit()
+    await get_entitlement_cache().invalidate(uuid.UUID(user.id))
+    article.status = "processing"
+    wake_job_consumer()
 
     return ArticleResponse.model_validate(article)
 
@@ -563,6 +514,7 @@ async def retry_article_analysis(
     "/analyze-url",
     response_model=ArticleSaveResponse,
     status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(ANALYZE_URL_RATE_LIMIT)],
 )
 async def analyze_url(
     data: ArticleAnalyzeURL,
@@ -571,9 +523,7 @@ async def analyze_url(
 ) -> ArticleSaveResponse:
     existing_article = await service.get_article_by_url(db, user.id, data.url)
     if existing_article:
-        existing_response = ArticleSaveResponse.model_validate(existing_article)
-        existing_response.already_saved = True
-        return existing_response
+        return _already_saved(existing_article)
 
     # Check analysis credit
     usage_info = await sub_service.get_usage_info(db, user.id)
@@ -586,11 +536,21 @@ async def analyze_url(
     requested_content_type = classify_url(data.url)
     enforce_content_type_access(usage_info.plan, requested_content_type)
 
+    # Release the connection while the page is fetched
+    await db.commit()
     title, content = await prepare_analyze_url_content(
         url=data.url,
         title=data.title,
         content=data.content,
     )
+
+    # Single-flight: a concurrent request for this URL that got the lock
+    # first has committed its article by the time we get it
+    await service.lock_article_url(db, user.id, data.url)
+    existing_article = await service.get_article_by_url(db, user.id, data.url)
+    if existing_article:
+        return _already_saved(existing_article)
+
     summary_language = data.summary_language or "ko"
 
     create_data = ArticleCreate(
@@ -602,30 +562,12 @@ async def analyze_url(
     )
 
     article = await service.create_article(db, user.id, create_data)
+    await reserve_analysis_credit(db, user.id, article.id, usage_info.plan)
+    await analysis.start_analysis(db, article.id, summary_language=summary_language)
     await db.commit()
-
-    selected_provider: Literal["gemini", "openai"] = "gemini"
-    await service.update_article_status(article.id, "processing")
+    await get_entitlement_cache().invalidate(uuid.UUID(user.id))
     article.status = "processing"
-
-    analysis_task = asyncio.create_task(
-        _run_analysis_async(
-            article.id,
-            article.title,
-            article.content,
-            selected_provider,
-            summary_language,
-            user.id,
-            article_url=data.url,
-        ),
-        name=f"article-analysis-{article.id}",
-    )
-    _background_tasks.add(analysis_task)
-    analysis_task.add_done_callback(_background_tasks.discard)
-    logger.info(
-        "Dispatched article analysis task",
-        article_id=str(article.id),
-        task_name=analysis_task.get_name(),
-    )
+    wake_job_consumer()
+    logger.info("Enqueued article analysis", article_id=str(article.id))
 
     return ArticleSaveResponse.model_validate(article)
@@ -63,6 +63,12 @@ class ArticleSaveResponse(ArticleResponse):
     already_saved: bool = False
 
 
+class ArticleStatusResponse(BaseModel):
+    id: uuid.UUID
+    status: str
+    settled: bool
+
+
 class ArticleListResponse(BaseModel):
     model_config = {"from_attributes": True}
 
@@ -94,6 +100,9 @@ class ConceptGraphNode(BaseModel):
     value: int
     kind: str | None = None
     article_id: uuid.UUID | None = None
+    # Precomputed layout position (global graph only)
+    x: float | None = None
+    y: float | None = None
 
 
 class ConceptGraphEdge(BaseModel):
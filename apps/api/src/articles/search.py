@@ -0,0 +1,77 @@
+"""Full-text search over articles.
+
+``articles.search_vector`` is a ``tsvector`` maintained by database triggers
+(see migration ``f4b2c8d1e6a7``). It covers the article title (weight A),
+summary concepts and summary text (weight B) and the article body (weight D),
+and is served by a GIN index.
+
+The ``simple`` text search configuration is used because saved content is
+multilingual (Korean, English, Japanese) and language-specific stemming would
+mangle mixed-language documents.
+"""
+
+import re
+from typing import Any
+
+from sqlalchemy import ColumnElement, SmallInteger, cast, column, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG, TSQUERY
+
+from src.articles.model import Article
+
+SEARCH_CONFIG = "simple"
+
+# Cap on query terms so pathological inputs can't build huge tsquery trees
+MAX_QUERY_TERMS = 8
+
+_WORD_RE = re.compile(r"[^\W_]")
+
+
+def has_search_terms(text: str) -> bool:
+    """Whether ``text`` has anything the text search parser would index."""
+    return _WORD_RE.search(text) is not None
+
+
+def to_tsquery(text: str) -> ColumnElement[Any] | None:
+    """SQL ``tsquery`` matching every term of ``text`` as a prefix.
+
+    The terms are the lexemes of ``to_tsvector(SEARCH_CONFIG, text)``, so
+    the query is split exactly like the documents are: ``node.js`` and
+    ``asp.net`` stay one term instead of becoming ``node:* & js:*``. Each
+    lexeme becomes ``'lexeme':*`` and they are AND-ed, so partially typed
+    words still match (search-as-you-type). The lexemes are already
+    normalized, so they are cast to ``tsquery`` rather than parsed again,
+    which also keeps user input from injecting tsquery operators. Past
+    ``MAX_QUERY_TERMS``, the terms that come first in ``text`` are kept (a
+    tsvector lists its lexemes alphabetically).
+
+    Returns:
+        The expression, or None if ``text`` has no searchable terms.
+    """
+    if not has_search_terms(text):
+        return None
+    config = cast(literal(SEARCH_CONFIG), REGCONFIG)
+    terms = func.unnest(func.to_tsvector(config, text)).table_valued(
+        "lexeme", column("positions", ARRAY(SmallInteger)), "weights"
+    )
+    lexemes = (
+        select(terms.c.lexeme)
+        .order_by(terms.c.positions[1], terms.c.lexeme)
+        .limit(MAX_QUERY_TERMS)
+        .subquery()
+    )
+    quoted = func.replace(func.replace(lexemes.c.lexeme, "\\", "\\\\"), "'", "''")
+    prefix = literal("'") + quoted + literal("':*")
+    return select(
+        cast(func.string_agg(prefix, literal(" & ")), TSQUERY)
+    ).scalar_subquery()
+
+
+def matches(tsquery: ColumnElement[Any]) -> ColumnElement[bool]:
+    """Predicate selecting articles whose search vector matches ``tsquery``."""
+    return Article.search_vector.bool_op("@@")(tsquery)
+
+
+def rank(tsquery: ColumnElement[Any]) -> ColumnElement[float]:
+    """Relevance score of an article for ``tsquery`` (higher is better)."""
+    result: ColumnElement[float] = func.ts_rank_cd(Article.search_vector, tsquery)
+    return result
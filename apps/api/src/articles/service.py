@@ -1,14 +1,33 @@
-import difflib
-import re
-import unicodedata
 import uuid
-from collections import Counter
-
-from sqlalchemy import String, cast, delete, func, or_, select, true, update
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import (
+    Select,
+    delete,
+    func,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.orm import selectinload
 
-from src.articles.model import Article, ArticleEmbedding, ArticleSummary
+from src.articles import search as article_search
+from src.articles.concept_index import ConceptMatchIndex
+from src.articles.concept_normalization import (
+    normalize_concept as _normalize_concept,
+)
+from src.articles.concept_normalization import normalize_concepts
+from src.articles.graph_layout import read_graph_layout
+from src.articles.model import (
+    Article,
+    ArticleConcept,
+    ArticleEmbedding,
+    ArticleNeighbor,
+    ArticleSummary,
+)
 from src.articles.schemas import (
     ArticleCreate,
     ArticleListResponse,
@@ -19,7 +38,18 @@ from src.articles.schemas import (
     ConceptGraphResponse,
     SimilarArticleResponse,
 )
-from src.common.models.pagination import PaginatedResponse
+from src.articles.status_notifier import get_status_notifier
+from src.articles.url_normalization import normalize_url
+from src.articles.vector_index import get_vector_index_cache
+from src.common.models.pagination import (
+    CountMode,
+    InvalidCursorError,
+    PaginatedResponse,
+    decode_cursor,
+    encode_cursor,
+)
+from src.lib.config import settings
+from src.subscriptions import credits
 
 VALID_ARTICLE_STATUSES = {
     "pending",
@@ -29,6 +59,35 @@ VALID_ARTICLE_STATUSES = {
     "completed",
 }
 
+# Statuses after which analysis will not change the article any more
+SETTLED_ARTICLE_STATUSES = frozenset({"analyzed", "completed", "failed"})
+
+# Upper bound on rows scanned when count_mode="estimate"
+COUNT_ESTIMATE_CAP = 1000
+
+CREATED_CURSOR_KIND = "created"
+RANK_CURSOR_KIND = "rank"
+DISTANCE_CURSOR_KIND = "distance"
+
+# How /articles/search ranks results: "exact" orders every match by
+# (distance, id), "ann" is a single vector index scan and "hybrid" fuses
+# full-text and vector ranks and reranks them by concept overlap (see
+# hybrid_search)
+SearchMode = Literal["exact", "ann", "hybrid"]
+SemanticSearchMode = Literal["exact", "ann"]
+
+# Articles taken from each ranking before hybrid search fuses them
+HYBRID_CANDIDATES = 100
+# Reciprocal rank fusion constant; damps the weight of the top few ranks
+RRF_K = 60
+
+# Articles that appear in the concept graph
+GRAPH_ARTICLE_STATUSES = ("analyzed", "completed")
+# Concepts linked to each article in the concept graph, root concept first
+GRAPH_CONCEPTS_PER_ARTICLE = 2
+# Largest global graph served; its layout covers every smaller one
+GLOBAL_GRAPH_MAX_NODES = 1000
+
 
 async def create_article(
     db: AsyncSession,
@@ -38,6 +97,7 @@ async def create_article(
     article = Article(
         user_id=uuid.UUID(user_id),
         url=data.url,
+        normalized_url=normalize_url(data.url) if data.url else None,
         title=data.title,
         original_title=data.title,
         content=data.content,
@@ -69,18 +129,44 @@ async def update_article_status(article_id: uuid.UUID, status: str) -> None:
             update(Article).where(Article.id == article_id).values(status=status)
         )
         await session.commit()
+    get_status_notifier().notify(article_id)
+
+
+async def get_article_status(article_id: uuid.UUID, user_id: uuid.UUID) -> str | None:
+    """Return the status of a user's article, or None if it doesn't exist.
+
+    Uses its own short-lived session so long-poll callers don't hold a pooled
+    connection while they wait.
+    """
+    from src.lib.database import async_session_factory
+
+    async with async_session_factory() as session:
+        result = await session.execute(
+            select(Article.status).where(
+                Article.id == article_id, Article.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
 
 
 async def get_article(
     db: AsyncSession,
     article_id: uuid.UUID,
     user_id: str,
+    *,
+    for_update: bool = False,
 ) -> Article | None:
-    result = await db.execute(
+    """The user's article; ``for_update`` locks its row until commit."""
+    query = (
         select(Article)
         .options(selectinload(Article.summary))
         .where(Article.id == article_id, Article.user_id == uuid.UUID(user_id))
     )
+    if for_update:
+        query = query.with_for_update(of=Article).execution_options(
+            populate_existing=True
+        )
+    result = await db.execute(query)
     return result.scalar_one_or_none()
 
 
@@ -88,16 +174,113 @@ async def get_article_by_url(
     db: AsyncSession,
     user_id: str,
     url: str,
+    *,
+    status: str | None = None,
 ) -> Article | None:
-    result = await db.execute(
+    """The user's newest article for ``url`` or an equivalent URL."""
+    # Rows saved before normalization existed hold the raw URL
+    query = (
         select(Article)
         .options(selectinload(Article.summary))
-        .where(Article.user_id == uuid.UUID(user_id), Article.url == url)
+        .where(
+            Article.user_id == uuid.UUID(user_id),
+            Article.normalized_url.in_((normalize_url(url), url)),
+        )
         .order_by(Article.created_at.desc())
     )
+    if status is not None:
+        query = query.where(Article.status == status)
+    result = await db.execute(query)
     return result.scalars().first()
 
 
+async def lock_article_url(db: AsyncSession, user_id: str, url: str) -> None:
+    """Hold the user's lock on ``url`` until the transaction ends.
+
+    Dispatching an analysis takes it before looking for an article to reuse,
+    so concurrent requests for one page run one at a time and the later ones
+    find the article the first created.
+    """
+    key = f"article-url:{user_id}:{normalize_url(url)}"
+    await db.execute(select(func.pg_advisory_xact_lock(func.hashtextextended(key, 0))))
+
+
+def to_list_item(article: Article) -> ArticleListResponse:
+    return ArticleListResponse(
+        id=article.id,
+        url=article.url,
+        title=article.title,
+        source=article.source,
+        status=article.status,
+        created_at=article.created_at,
+        summary_preview=article.summary.summary[:200] if article.summary else None,
+        content_type=article.summary.content_type if article.summary else None,
+    )
+
+
+async def _count_rows(
+    db: AsyncSession,
+    base_query: Select[Any],
+    count_mode: CountMode,
+) -> tuple[int | None, bool]:
+    """Count rows of ``base_query`` according to ``count_mode``.
+
+    Returns:
+        tuple: (total, total_estimated)
+    """
+    if count_mode == "none":
+        return None, False
+
+    if count_mode == "estimate":
+        capped = base_query.limit(COUNT_ESTIMATE_CAP + 1).subquery()
+        result = await db.execute(select(func.count()).select_from(capped))
+        counted = int(result.scalar_one())
+        return min(counted, COUNT_ESTIMATE_CAP), counted > COUNT_ESTIMATE_CAP
+
+    result = await db.execute(select(func.count()).select_from(base_query.subquery()))
+    return int(result.scalar_one()), False
+
+
+async def set_ann_search_params(
+    db: AsyncSession, ef_search: int | None, probes: int | None
+) -> None:
+    """Tune pgvector index scans for the rest of the current transaction."""
+    params = {
+        "hnsw.ef_search": str(ef_search or settings.VECTOR_SEARCH_EF_SEARCH),
+        "ivfflat.probes": str(probes or settings.VECTOR_SEARCH_PROBES),
+    }
+    if settings.VECTOR_SEARCH_ITERATIVE_SCAN != "off":
+        params["hnsw.iterative_scan"] = settings.VECTOR_SEARCH_ITERATIVE_SCAN
+        params["ivfflat.iterative_scan"] = "relaxed_order"
+    await db.execute(
+        select(*(func.set_config(name, value, True) for name, value in params.items()))
+    )
+
+
+def _decode_keyset(
+    cursor: str, kind: str, *parsers: Callable[[Any], Any]
+) -> tuple[Any, ...]:
+    values = decode_cursor(cursor, kind)
+    if len(values) != len(parsers):
+        raise InvalidCursorError("Malformed pagination cursor")
+    try:
+        return tuple(parse(value) for parse, value in zip(parsers, values, strict=True))
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
+
+
+def filter_articles(
+    query: Select[Any], status_filter: str | None, content_type_filter: str | None
+) -> Select[Any]:
+    if status_filter:
+        query = query.where(Article.status == status_filter)
+    if content_type_filter:
+        query = query.outerjoin(
+            ArticleSummary, ArticleSummary.article_id == Article.id
+        ).where(ArticleSummary.content_type == content_type_filter)
+    return query
+
+
 async def list_articles(
     db: AsyncSession,
     user_id: str,
@@ -106,70 +289,78 @@ async def list_articles(
     search: str | None = None,
     status_filter: str | None = None,
     content_type_filter: str | None = None,
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
 ) -> PaginatedResponse[ArticleListResponse]:
+    """List a user's articles, newest first, or by relevance when searching.
+
+    Supports offset paging via ``page`` and keyset paging via ``cursor``
+    (ordered by ``(created_at, id)``, or ``(rank, created_at, id)`` for
+    full-text searches). When ``cursor`` is given, ``page`` is only echoed
+    back in the response metadata.
+    """
+    tsquery = article_search.to_tsquery(search) if search else None
+    rank_expr = article_search.rank(tsquery) if tsquery is not None else None
+
+    after: tuple[Any, ...] | None = None
+    if cursor and rank_expr is not None:
+        after = _decode_keyset(
+            cursor, RANK_CURSOR_KIND, float, datetime.fromisoformat, uuid.UUID
+        )
+    elif cursor:
+        after = _decode_keyset(
+            cursor, CREATED_CURSOR_KIND, datetime.fromisoformat, uuid.UUID
+        )
+
     base_query = select(Article).where(Article.user_id == uuid.UUID(user_id))
+    if tsquery is not None:
+        base_query = base_query.where(article_search.matches(tsquery))
+    base_query = filter_articles(base_query, status_filter, content_type_filter)
 
-    has_summary_join = False
-    if search:
-        search_term = search.strip()
-        if search_term:
-            term = f"%{search_term}%"
-            base_query = base_query.outerjoin(
-                ArticleSummary, ArticleSummary.article_id == Article.id
-            ).where(
-                or_(
-                    Article.title.ilike(term),
-                    Article.content.ilike(term),
-                    ArticleSummary.summary.ilike(term),
-                    cast(ArticleSummary.concepts, String).ilike(term),
-                )
-            )
-            has_summary_join = True
-    if status_filter:
-        base_query = base_query.where(Article.status == status_filter)
-    if content_type_filter:
-        if not has_summary_join:
-            base_query = base_query.outerjoin(
-                ArticleSummary, ArticleSummary.article_id == Article.id
-            )
-        base_query = base_query.where(
-            ArticleSummary.content_type == content_type_filter
+    total, total_estimated = await _count_rows(db, base_query, count_mode)
+
+    if rank_expr is not None:
+        keyset = tuple_(rank_expr, Article.created_at, Article.id)
+        query = base_query.add_columns(rank_expr.label("rank")).order_by(
+            rank_expr.desc(), Article.created_at.desc(), Article.id.desc()
         )
+    else:
+        keyset = tuple_(Article.created_at, Article.id)
+        query = base_query.order_by(Article.created_at.desc(), Article.id.desc())
 
-    # Count
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
+    if after is not None:
+        query = query.where(keyset < after)
+    else:
+        query = query.offset((page - 1) * limit)
 
-    # Fetch with summary eager load
-    query = (
-        base_query.options(selectinload(Article.summary))
-        .order_by(Article.created_at.desc())
-        .offset((page - 1) * limit)
-        .limit(limit)
+    # Fetch one extra row to detect whether a next page exists.
+    # Rows are (Article,) or (Article, rank) when ranking by relevance.
+    result = await db.execute(
+        query.options(selectinload(Article.summary)).limit(limit + 1)
     )
-    result = await db.execute(query)
-    articles = result.scalars().all()
-
-    items = [
-        ArticleListResponse(
-            id=a.id,
-            url=a.url,
-            title=a.title,
-            source=a.source,
-            status=a.status,
-            created_at=a.created_at,
-            summary_preview=a.summary.summary[:200] if a.summary else None,
-            content_type=a.summary.content_type if a.summary else None,
+    rows = list(result.all())
+
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_next:
+        last_article = rows[-1][0]
+        last_key = [last_article.created_at.isoformat(), str(last_article.id)]
+        next_cursor = (
+            encode_cursor(RANK_CURSOR_KIND, [float(rows[-1][1]), *last_key])
+            if rank_expr is not None
+            else encode_cursor(CREATED_CURSOR_KIND, last_key)
         )
-        for a in articles
-    ]
 
     return PaginatedResponse.create(
-        data=items,
+        data=[to_list_item(row[0]) for row in rows],
         total=total,
         page=page,
         limit=limit,
+        next_cursor=next_cursor,
+        has_next=has_next,
+        has_prev=cursor is not None or page > 1,
+        total_estimated=total_estimated,
     )
 
 
@@ -206,9 +397,12 @@ async def delete_article(
     if existing.scalar_one_or_none() is None:
         return False
 
+    # The reservation row would cascade, but the reserved count would not
+    await credits.release_credit(db, article_id)
     await db.execute(
         delete(Article).where(Article.id == article_id, Article.user_id == uid)
     )
+    get_vector_index_cache().invalidate(uid)
     return True
 
 
@@ -221,59 +415,78 @@ async def search_articles_semantic(
     status_filter: str | None = None,
     content_type_filter: str | None = None,
     similarity_threshold: float = 0.3,
+    cursor: str | None = None,
+    count_mode: CountMode = "exact",
+    ef_search: int | None = None,
+    probes: int | None = None,
+    mode: SemanticSearchMode = "exact",
 ) -> PaginatedResponse[ArticleListResponse]:
-    similarity_expr = 1 - ArticleEmbedding.embedding.cosine_distance(query_embedding)
+    """Rank a user's articles by cosine similarity to ``query_embedding``.
 
-    base_query = (
-        select(Article, similarity_expr.label("similarity"))
+    Supports offset paging via ``page`` and keyset paging via ``cursor``
+    (ordered by ``(distance, id)``). ``ef_search``/``probes`` override the
+    ANN index settings when the planner scans the vector index.
+
+    ``mode="ann"`` orders by distance alone so the page is one vector index
+    scan; the id tiebreak only applies within a page, so articles with
+    identical embeddings may swap across a page boundary. The total is then
+    only counted when ``count_mode`` asks for it, and always as an estimate.
+    """
+    after = (
+        _decode_keyset(cursor, DISTANCE_CURSOR_KIND, float, uuid.UUID)
+        if cursor
+        else None
+    )
+    distance_expr = ArticleEmbedding.embedding.cosine_distance(query_embedding)
+
+    base_query = filter_articles(
+        select(Article, distance_expr.label("distance"))
         .join(ArticleEmbedding, ArticleEmbedding.article_id == Article.id)
         .where(
             Article.user_id == uuid.UUID(user_id),
-            similarity_expr >= similarity_threshold,
-        )
+            distance_expr <= 1 - similarity_threshold,
+        ),
+        status_filter,
+        content_type_filter,
     )
 
-    if status_filter:
-        base_query = base_query.where(Article.status == status_filter)
-    if content_type_filter:
-        base_query = base_query.outerjoin(
-            ArticleSummary, ArticleSummary.article_id == Article.id
-        ).where(ArticleSummary.content_type == content_type_filter)
-
-    # Count
-    count_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar_one()
+    await set_ann_search_params(db, ef_search, probes)
+    if mode == "ann" and count_mode == "exact":
+        count_mode = "estimate"
+    total, total_estimated = await _count_rows(db, base_query, count_mode)
 
-    # Fetch ordered by similarity desc with summary eager load
-    query = (
-        base_query.options(selectinload(Article.summary))
-        .order_by(ArticleEmbedding.embedding.cosine_distance(query_embedding))
-        .offset((page - 1) * limit)
-        .limit(limit)
+    # Fetch ordered by similarity desc with summary eager load. An ORDER BY
+    # with anything after the distance can't be served by the vector index.
+    query = base_query.options(selectinload(Article.summary)).order_by(
+        *((distance_expr,) if mode == "ann" else (distance_expr, Article.id))
     )
-    result = await db.execute(query)
-    rows = result.all()
-
-    items = [
-        ArticleListResponse(
-            id=article.id,
-            url=article.url,
-            title=article.title,
-            source=article.source,
-            status=article.status,
-            created_at=article.created_at,
-            summary_preview=article.summary.summary[:200] if article.summary else None,
-            content_type=article.summary.content_type if article.summary else None,
+    if after is not None:
+        query = query.where(tuple_(distance_expr, Article.id) > after)
+    else:
+        query = query.offset((page - 1) * limit)
+    result = await db.execute(query.limit(limit + 1))
+    rows = list(result.all())
+    if mode == "ann":
+        rows.sort(key=lambda row: (row[1], row[0].id))
+
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_next:
+        last_article, last_distance = rows[-1]
+        next_cursor = encode_cursor(
+            DISTANCE_CURSOR_KIND, [float(last_distance), str(last_article.id)]
         )
-        for article, _similarity in rows
-    ]
 
     return PaginatedResponse.create(
-        data=items,
+        data=[to_list_item(article) for article, _distance in rows],
         total=total,
         page=page,
         limit=limit,
+        next_cursor=next_cursor,
+        has_next=has_next,
+        has_prev=cursor is not None or page > 1,
+        total_estimated=total_estimated,
     )
 
 
@@ -282,40 +495,25 @@ async def get_similar_articles(
     article_id: uuid.UUID,
     user_id: str,
     limit: int = 5,
+    ef_search: int | None = None,
+    probes: int | None = None,
 ) -> list[SimilarArticleResponse]:
-    # Get the target article's embedding
-    embedding_result = await db.execute(
-        select(ArticleEmbedding).where(ArticleEmbedding.article_id == article_id)
-    )
-    target_embedding = embedding_result.scalar_one_or_none()
+    """The articles closest to ``article_id`` by embedding.
 
-    if not target_embedding:
-        return []
-
-    # Find similar articles using cosine distance
-    similarity_expr = 1 - ArticleEmbedding.embedding.cosine_distance(
-        target_embedding.embedding
-    )
-
-    query = (
-        select(
-            Article,
-            similarity_expr.label("similarity"),
-        )
-        .join(ArticleEmbedding, ArticleEmbedding.article_id == Article.id)
-        .options(selectinload(Article.summary))
-        .where(
-            Article.user_id == uuid.UUID(user_id),
-            Article.id != article_id,
-        )
-        .order_by(
-            ArticleEmbedding.embedding.cosine_distance(target_embedding.embedding)
+    Served from the in-memory vector index when enabled; otherwise (or when
+    the index doesn't have the article yet) by pgvector, with
+    ``ef_search``/``probes`` overriding the ANN index settings.
+    """
+    uid = uuid.UUID(user_id)
+    rows: list[tuple[Article, float]] | None = None
+    if settings.VECTOR_INDEX_ENABLED:
+        rows = await _similar_articles_in_memory(db, article_id, uid, limit)
+    if rows is None:
+        rows = await _similar_articles_pgvector(
+            db, article_id, uid, limit, ef_search=ef_search, probes=probes
         )
-        .limit(limit)
-    )
-
-    result = await db.execute(query)
-    rows = result.all()
+    if not rows:
+        return []
 
     # Get target concepts for overlap calculation
     target_summary_result = await db.execute(
@@ -345,113 +543,99 @@ async def get_similar_articles(
     return similar
 
 
-CANONICAL_MAPPINGS = {
-    "타입스크립트": "typescript",
-    "typescript 배우기": "typescript",
-    "자바스크립트": "javascript",
-    "javascript 기초": "javascript",
-    "파이썬": "python",
-    "리액트": "react",
-    "react.js": "react",
-    "reactjs": "react",
-    "넥스트js": "nextjs",
-    "next.js": "nextjs",
-    "네스트js": "nestjs",
-    "nest.js": "nestjs",
-    "노드js": "nodejs",
-    "node.js": "nodejs",
-    "nodejs": "nodejs",
-    "fastapi": "fastapi",
-    "장고": "django",
-    "스프링부트": "springboot",
-    "spring boot": "springboot",
-    "도커": "docker",
-    "쿠버네티스": "kubernetes",
-    "k8s": "kubernetes",
-    "aws": "aws",
-    "아마존웹서비스": "aws",
-    "llm": "llm",
-    "대규모언어모델": "llm",
-}
-
-
-REMOVE_TOKENS = {
-    "배우기",
-    "정리",
-    "입문",
-    "기초",
-    "tutorial",
-    "guide",
-    "basics",
-    "how to",
-    "learn",
-}
-
-
-def _normalize_concept(value: str) -> str:
-    if not value:
-        return ""
-
-    # 1. Unicode normalization (NFKC)
-    normalized = unicodedata.normalize("NFKC", value)
-
-    # 2. Remove parentheses/brackets and their content, and quotes
-    normalized = re.sub(r"\([^)]*\)", "", normalized)
-    normalized = re.sub(r"\[[^]]*\]", "", normalized)
-    normalized = re.sub(r"[\"']", "", normalized)
-
-    # 3. Casefold
-    normalized = normalized.casefold()
-
-    # 4. Remove common suffix/prefix tokens
-    # "how to" contains space, so handle it before splitting
-    normalized = normalized.replace("how to", "")
-
-    tokens = normalized.split()
-    tokens = [t for t in tokens if t not in REMOVE_TOKENS]
-    normalized = " ".join(tokens).strip()
+async def _similar_articles_in_memory(
+    db: AsyncSession,
+    article_id: uuid.UUID,
+    user_id: uuid.UUID,
+    limit: int,
+) -> list[tuple[Article, float]] | None:
+    """Nearest articles from the user's cached vector index.
 
-    return CANONICAL_MAPPINGS.get(normalized, normalized)
+    Returns None when the index doesn't have the article yet (its embedding
+    was written after the index was loaded, or it has none).
+    """
+    index = await get_vector_index_cache().get(db, user_id)
+    neighbors = index.neighbors(article_id, limit)
+    if neighbors is None:
+        return None
+    if not neighbors:
+        return []
 
+    result = await db.execute(
+        select(Article)
+        .options(selectinload(Article.summary))
+        .where(
+            Article.user_id == user_id,
+            Article.id.in_([neighbor_id for neighbor_id, _score in neighbors]),
+        )
+    )
+    # Articles deleted by another process since the index was loaded drop out
+    articles = {article.id: article for article in result.scalars()}
+    return [
+        (articles[neighbor_id], similarity)
+        for neighbor_id, similarity in neighbors
+        if neighbor_id in articles
+    ]
 
-def _resolve_similar_concept(
-    target: str, existing_concepts: list[str], threshold: float = 0.92
-) -> str:
-    """
-    Resolve a concept to an existing similar concept if similarity > threshold.
-    Uses difflib.SequenceMatcher for similarity.
-    """
-    if not existing_concepts:
-        return target
 
-    # Fast path: exact match
-    if target in existing_concepts:
-        return target
+async def _similar_articles_pgvector(
+    db: AsyncSession,
+    article_id: uuid.UUID,
+    user_id: uuid.UUID,
+    limit: int,
+    *,
+    ef_search: int | None = None,
+    probes: int | None = None,
+) -> list[tuple[Article, float]]:
+    # Get the target article's embedding
+    embedding_result = await db.execute(
+        select(ArticleEmbedding).where(ArticleEmbedding.article_id == article_id)
+    )
+    target_embedding = embedding_result.scalar_one_or_none()
 
-    matcher = difflib.SequenceMatcher(None, target, "")
-    best_ratio = 0.0
-    best_match = None
+    if not target_embedding:
+        return []
 
-    for existing in existing_concepts:
-        matcher.set_seq2(existing)
-        ratio = matcher.ratio()
-        if ratio > best_ratio:
-            best_ratio = ratio
-            best_match = existing
+    # Find similar articles using cosine distance
+    similarity_expr = 1 - ArticleEmbedding.embedding.cosine_distance(
+        target_embedding.embedding
+    )
 
-    if best_ratio >= threshold and best_match:
-        return best_match
+    query = (
+        select(
+            Article,
+            similarity_expr.label("similarity"),
+        )
+        .join(ArticleEmbedding, ArticleEmbedding.article_id == Article.id)
+        .options(selectinload(Article.summary))
+        .where(
+            Article.user_id == user_id,
+            Article.id != article_id,
+        )
+        .order_by(
+            ArticleEmbedding.embedding.cosine_distance(target_embedding.embedding)
+        )
+        .limit(limit)
+    )
 
-    return target
+    await set_ann_search_params(db, ef_search, probes)
+    result = await db.execute(query)
+    return [(article, float(similarity)) for article, similarity in result.all()]
 
 
 def resolve_concept_candidates(
     root_concept_label: str | None,
     concepts: list[str] | None,
-    existing_norms: list[str],
+    existing_norms: Iterable[str] | ConceptMatchIndex,
     max_candidates: int = 2,
     threshold: float = 0.92,
 ) -> tuple[str | None, str | None, list[str]]:
+    """Pick up to ``max_candidates`` concept norms for a new summary.
+
+    Each label is normalized and snapped to a similar existing norm
+    (``existing_norms``, typically the user's cached vocabulary) or to a norm
+    picked earlier for the same summary; existing norms win ties.
+    """
     labels: list[str] = []
 
     root_label = " ".join((root_concept_label or "").split()).strip()
@@ -466,7 +650,14 @@ def resolve_concept_candidates(
             if label:
                 labels.append(label)
 
-    known_norms = [norm for norm in existing_norms if norm]
+    known = (
+        existing_norms
+        if isinstance(existing_norms, ConceptMatchIndex)
+        else ConceptMatchIndex(existing_norms)
+    )
+    # Norms introduced by this summary; kept apart so the shared index is
+    # never modified here
+    added = ConceptMatchIndex()
     resolved: list[tuple[str, str]] = []
     seen_norms: set[str] = set()
 
@@ -475,15 +666,20 @@ def resolve_concept_candidates(
         if not raw_norm:
             continue
 
-        final_norm = _resolve_similar_concept(
-            raw_norm, known_norms, threshold=threshold
-        )
+        known_match = known.best_match(raw_norm, threshold)
+        added_match = added.best_match(raw_norm, threshold)
+        final_norm = raw_norm
+        if known_match and not (added_match and added_match[1] > known_match[1]):
+            final_norm = known_match[0]
+        elif added_match:
+            final_norm = added_match[0]
+
         if final_norm in seen_norms:
             continue
 
         seen_norms.add(final_norm)
-        if final_norm not in known_norms:
-            known_norms.append(final_norm)
+        if final_norm not in known:
+            added.add(final_norm)
 
         canonical_label = final_norm
         resolved.append((canonical_label, final_norm))
@@ -499,6 +695,65 @@ def resolve_concept_candidates(
     return (root_label_resolved, root_norm, concept_labels)
 
 
+def _clean_label(value: str) -> str:
+    return " ".join(value.split()).strip()
+
+
+def extract_graph_concepts(
+    concepts: object,
+    root_concept_label: str | None,
+    root_concept_norm: str | None,
+    limit: int = GRAPH_CONCEPTS_PER_ARTICLE,
+    concept_norms: list[str] | None = None,
+) -> list[tuple[str, str]]:
+    """The ``(label, norm)`` pairs a summary contributes to the concept graph.
+
+    The root concept comes first; when the summary has none, the first usable
+    label stands in for it. ``concept_norms`` (the summary's stored norms of
+    ``concepts``) saves normalizing the labels again.
+    """
+    extracted: list[tuple[str, str]] = []
+    seen: set[str] = set()
+
+    def add(label: str, norm: str) -> None:
+        if norm and norm not in seen and len(extracted) < limit:
+            extracted.append((label, norm))
+            seen.add(norm)
+
+    root_norm = _normalize_concept(root_concept_norm or "")
+    root_label = _clean_label(root_concept_label or "")
+    if root_norm:
+        add(root_label or root_norm, root_norm)
+    elif root_label:
+        add(root_label, _normalize_concept(root_label))
+
+    if isinstance(concepts, list):
+        if concept_norms is None or len(concept_norms) != len(concepts):
+            concept_norms = normalize_concepts(concepts)
+        for raw, norm in zip(concepts, concept_norms, strict=True):
+            if not isinstance(raw, str):
+                continue
+            label = _clean_label(raw)
+            if label:
+                add(label, norm)
+
+    return extracted
+
+
+def _empty_graph(max_nodes: int, total_articles: int = 0) -> ConceptGraphResponse:
+    return ConceptGraphResponse(
+        nodes=[],
+        edges=[],
+        meta=ConceptGraphMeta(
+            total_articles=total_articles,
+            total_unique_concepts=0,
+            returned_nodes=0,
+            returned_edges=0,
+            max_nodes=max_nodes,
+        ),
+    )
+
+
 async def get_concept_graph(
     db: AsyncSession,
     user_id: str,
@@ -506,120 +761,51 @@ async def get_concept_graph(
     mode: str | None = None,
     max_nodes: int = 1000,
 ) -> ConceptGraphResponse:
-    if mode == "global" and not root:
-        return await _get_global_graph(db, user_id=user_id, max_nodes=max_nodes)
-
-    rows = await db.execute(
-        select(
-            Article.id,
-            Article.title,
-            ArticleSummary.concepts,
-            ArticleSummary.root_concept_label,
-            ArticleSummary.root_concept_norm,
-        )
-        .join(Article, ArticleSummary.article_id == Article.id)
-        .where(
-            Article.user_id == uuid.UUID(user_id),
-            Article.status.in_(["analyzed", "completed"]),
-        )
-    )
-    article_rows = rows.all()
-
-    def extract_root(
-        concepts: object,
-        root_concept_label: str | None,
-        root_concept_norm: str | None,
-    ) -> tuple[str, str] | None:
-        normalized = _normalize_concept(root_concept_norm or "")
-        label = " ".join((root_concept_label or "").split()).strip()
-
-        if normalized:
-            return (label or normalized, normalized)
-
-        if label:
-            label_norm = _normalize_concept(label)
-            if label_norm:
-                return (label, label_norm)
-
-        if isinstance(concepts, list):
-            for raw in concepts:
-                if not isinstance(raw, str):
-                    continue
-                fallback_label = " ".join(raw.split()).strip()
-                if not fallback_label:
-                    continue
-                fallback_norm = _normalize_concept(fallback_label)
-                if fallback_norm:
-                    return (fallback_label, fallback_norm)
-
-        return None
+    """Read the user's concept graph from its materialized tables.
 
-    concept_counts: Counter[str] = Counter()
-    concept_labels: dict[str, Counter[str]] = {}
-    resolved_roots: list[tuple[uuid.UUID, str, str, str]] = []
-
-    for (
-        article_id,
-        title,
-        concepts,
-        root_concept_label,
-        root_concept_norm,
-    ) in article_rows:
-        extracted = extract_root(concepts, root_concept_label, root_concept_norm)
-        if not extracted:
-            continue
+    ``mode="global"`` returns concepts, recent articles and their links;
+    ``root`` returns one concept and the articles rooted in it; otherwise
+    root concepts are returned by article count.
+    """
+    if mode == "global" and not root:
+        graph = await build_global_graph(db, user_id=user_id, max_nodes=max_nodes)
+        await read_graph_layout(db, uuid.UUID(user_id), graph.nodes)
+        return graph
 
-        label, normalized = extracted
-        concept_counts[normalized] += 1
-        label_counter = concept_labels.setdefault(normalized, Counter())
-        label_counter[label] += 1
-        resolved_roots.append((article_id, title, label, normalized))
+    uid = uuid.UUID(user_id)
 
     if root:
         requested = root.strip()
         if requested.startswith("concept:"):
             requested = requested.split(":", 1)[1]
         requested_norm = _normalize_concept(requested)
-
         if not requested_norm:
-            return ConceptGraphResponse(
-                nodes=[],
-                edges=[],
-                meta=ConceptGraphMeta(
-                    total_articles=0,
-                    total_unique_concepts=0,
-                    returned_nodes=0,
-                    returned_edges=0,
-                    max_nodes=max_nodes,
-                ),
-            )
-
-        matching_articles = [
-            (article_id, title)
-            for article_id, title, _label, normalized in resolved_roots
-            if normalized == requested_norm
-        ]
-        matching_articles = matching_articles[: max(0, max_nodes - 1)]
+            return _empty_graph(max_nodes)
 
-        if not matching_articles:
-            return ConceptGraphResponse(
-                nodes=[],
-                edges=[],
-                meta=ConceptGraphMeta(
-                    total_articles=0,
-                    total_unique_concepts=0,
-                    returned_nodes=0,
-                    returned_edges=0,
-                    max_nodes=max_nodes,
-                ),
+        rows = await db.execute(
+            select(Article.id, Article.title)
+            .join(ArticleConcept, ArticleConcept.article_id == Article.id)
+            .where(
+                Article.user_id == uid,
+                Article.status.in_(GRAPH_ARTICLE_STATUSES),
+                ArticleConcept.norm == requested_norm,
+                ArticleConcept.position == 0,
             )
+            .order_by(Article.created_at.desc(), Article.id.desc())
+            .limit(max(0, max_nodes - 1))
+        )
+        matching_articles = rows.all()
+        if not matching_articles:
+            return _empty_graph(max_nodes)
 
-        root_label_counts = concept_labels.get(requested_norm, Counter())
         root_label = (
-            root_label_counts.most_common(1)[0][0]
-            if root_label_counts
-            else requested_norm
-        )
+            await db.execute(
+                select(func.mode().within_group(ArticleConcept.label)).where(
+                    ArticleConcept.user_id == uid,
+                    ArticleConcept.norm == requested_norm,
+                )
+            )
+        ).scalar_one_or_none()
         root_node_id = f"concept:{requested_norm}"
 
         article_nodes = [
@@ -645,7 +831,7 @@ async def get_concept_graph(
             nodes=[
                 ConceptGraphNode(
                     id=root_node_id,
-                    label=root_label,
+                    label=root_label or requested_norm,
                     value=len(matching_articles),
                     kind="concept",
                 ),
@@ -661,31 +847,40 @@ async def get_concept_graph(
             ),
         )
 
-    selected_norms = [
-        concept for concept, _count in concept_counts.most_common(max_nodes)
-    ]
-
-    nodes: list[ConceptGraphNode] = []
-    for norm in selected_norms:
-        label_counts = concept_labels.get(norm)
-        if not label_counts:
-            continue
-        label = label_counts.most_common(1)[0][0]
-        nodes.append(
-            ConceptGraphNode(
-                id=f"concept:{norm}",
-                label=label,
-                value=concept_counts[norm],
-                kind="concept",
-            )
+    article_count = func.count()
+    rows = await db.execute(
+        select(
+            ArticleConcept.norm,
+            article_count,
+            func.mode().within_group(ArticleConcept.label),
         )
+        .join(Article, ArticleConcept.article_id == Article.id)
+        .where(
+            Article.user_id == uid,
+            Article.status.in_(GRAPH_ARTICLE_STATUSES),
+            ArticleConcept.position == 0,
+        )
+        .group_by(ArticleConcept.norm)
+        .order_by(article_count.desc(), ArticleConcept.norm)
+    )
+    root_counts = rows.all()
+
+    nodes = [
+        ConceptGraphNode(
+            id=f"concept:{norm}",
+            label=label or norm,
+            value=count,
+            kind="concept",
+        )
+        for norm, count, label in root_counts[:max_nodes]
+    ]
 
     return ConceptGraphResponse(
         nodes=nodes,
         edges=[],
         meta=ConceptGraphMeta(
-            total_articles=len(resolved_roots),
-            total_unique_concepts=len(concept_counts),
+            total_articles=sum(count for _norm, count, _label in root_counts),
+            total_unique_concepts=len(root_counts),
             returned_nodes=len(nodes),
             returned_edges=0,
             max_nodes=max_nodes,
@@ -693,192 +888,95 @@ async def get_concept_graph(
     )
 
 
-async def _get_global_graph(
+async def build_global_graph(
     db: AsyncSession,
     user_id: str,
     max_nodes: int,
 ) -> ConceptGraphResponse:
-    from sqlalchemy import func
-
-    max_nodes = max(100, min(1000, max_nodes))
-
-    per_article_concepts = 2
-    k_neighbors = 10
+    """Concepts, recent articles and their links, without node positions."""
+    max_nodes = max(100, min(GLOBAL_GRAPH_MAX_NODES, max_nodes))
 
     article_budget = min(max_nodes, int(max_nodes * 0.65))
     concept_budget = max_nodes - article_budget
 
+    uid = uuid.UUID(user_id)
+    graph_articles = (
+        Article.user_id == uid,
+        Article.status.in_(GRAPH_ARTICLE_STATUSES),
+    )
+
     total_articles_result = await db.execute(
-        select(func.count())
-        .select_from(Article)
-        .where(
-            Article.user_id == uuid.UUID(user_id),
-            Article.status.in_(["analyzed", "completed"]),
-        )
+        select(func.count()).select_from(Article).where(*graph_articles)
     )
     total_articles = int(total_articles_result.scalar_one() or 0)
 
-    rows = await db.execute(
-        select(
-            Article.id,
-            Article.title,
-            Article.created_at,
-            ArticleSummary.concepts,
-            ArticleSummary.root_concept_label,
-            ArticleSummary.root_concept_norm,
-        )
-        .join(Article, ArticleSummary.article_id == Article.id)
-        .where(
-            Article.user_id == uuid.UUID(user_id),
-            Article.status.in_(["analyzed", "completed"]),
+    article_rows = (
+        await db.execute(
+            select(Article.id, Article.title)
+            .where(
+                *graph_articles,
+                select(ArticleConcept.id)
+                .where(ArticleConcept.article_id == Article.id)
+                .exists(),
+            )
+            .order_by(Article.created_at.desc())
+            .limit(article_budget)
         )
-        .order_by(Article.created_at.desc())
-        .limit(article_budget)
-    )
-    article_rows = rows.all()
-
-    def _clean_label(value: str) -> str:
-        return " ".join(value.split()).strip()
-
-    def extract_root(
-        concepts: object,
-        root_concept_label: str | None,
-        root_concept_norm: str | None,
-    ) -> tuple[str, str] | None:
-        normalized = _normalize_concept(root_concept_norm or "")
-        label = _clean_label(root_concept_label or "")
-        if normalized:
-            return (label or normalized, normalized)
-        if label:
-            label_norm = _normalize_concept(label)
-            if label_norm:
-                return (label, label_norm)
-        if isinstance(concepts, list):
-            for raw in concepts:
-                if not isinstance(raw, str):
-                    continue
-                fallback_label = _clean_label(raw)
-                if not fallback_label:
-                    continue
-                fallback_norm = _normalize_concept(fallback_label)
-                if fallback_norm:
-                    return (fallback_label, fallback_norm)
-        return None
-
-    def extract_concepts(
-        concepts: object,
-        root_concept_label: str | None,
-        root_concept_norm: str | None,
-    ) -> list[tuple[str, str]]:
-        extracted: list[tuple[str, str]] = []
-        seen: set[str] = set()
-
-        root_pair = extract_root(concepts, root_concept_label, root_concept_norm)
-        if root_pair:
-            label, norm = root_pair
-            if norm and norm not in seen:
-                extracted.append((label, norm))
-                seen.add(norm)
-
-        if isinstance(concepts, list):
-            for raw in concepts:
-                if not isinstance(raw, str):
-                    continue
-                label = _clean_label(raw)
-                if not label:
-                    continue
-                norm = _normalize_concept(label)
-                if not norm or norm in seen:
-                    continue
-                extracted.append((label, norm))
-                seen.add(norm)
-                if len(extracted) >= per_article_concepts:
-                    break
-
-        return extracted
-
-    concept_counts: Counter[str] = Counter()
-    concept_labels: dict[str, Counter[str]] = {}
-    norm_redirects: dict[str, str] = {}
-
-    article_to_concepts: dict[uuid.UUID, list[str]] = {}
-    article_titles: dict[uuid.UUID, str] = {}
-
-    for (
-        article_id,
-        title,
-        _created_at,
-        concepts,
-        root_concept_label,
-        root_concept_norm,
-    ) in article_rows:
-        pairs = extract_concepts(concepts, root_concept_label, root_concept_norm)
-        if not pairs:
-            continue
-
-        article_titles[article_id] = title
-        final_norms: list[str] = []
-        seen_norms: set[str] = set()
-
-        for label, raw_norm in pairs:
-            if raw_norm in norm_redirects:
-                final_norm = norm_redirects[raw_norm]
-            else:
-                existing_norms = list(concept_counts.keys())
-                final_norm = _resolve_similar_concept(raw_norm, existing_norms)
-                norm_redirects[raw_norm] = final_norm
-
-            if final_norm not in seen_norms:
-                seen_norms.add(final_norm)
-                final_norms.append(final_norm)
-                concept_counts[final_norm] += 1
-                concept_labels.setdefault(final_norm, Counter())[label] += 1
+    ).all()
+    if not article_rows:
+        return _empty_graph(max_nodes, total_articles)
+
+    article_titles = {article_id: title for article_id, title in article_rows}
+    article_ids = list(article_titles)
+    article_to_concepts: dict[uuid.UUID, list[str]] = {aid: [] for aid in article_ids}
+
+    concept_rows = await db.execute(
+        select(ArticleConcept.article_id, ArticleConcept.norm)
+        .where(ArticleConcept.article_id.in_(article_ids))
+        .order_by(ArticleConcept.article_id, ArticleConcept.position)
+    )
+    for article_id, norm in concept_rows.all():
+        article_to_concepts[article_id].append(norm)
 
-        article_to_concepts[article_id] = final_norms
+    root_norms = {norms[0] for norms in article_to_concepts.values() if norms}
 
-    if not article_to_concepts:
-        return ConceptGraphResponse(
-            nodes=[],
-            edges=[],
-            meta=ConceptGraphMeta(
-                total_articles=total_articles,
-                total_unique_concepts=0,
-                returned_nodes=0,
-                returned_edges=0,
-                max_nodes=max_nodes,
-            ),
+    concept_count = func.count()
+    node_stats = (
+        select(
+            ArticleConcept.norm,
+            func.mode().within_group(ArticleConcept.label),
+            concept_count,
         )
+        .where(ArticleConcept.user_id == uid)
+        .group_by(ArticleConcept.norm)
+    )
+    root_nodes = await db.execute(node_stats.where(ArticleConcept.norm.in_(root_norms)))
+    top_nodes = await db.execute(
+        node_stats.order_by(concept_count.desc(), ArticleConcept.norm).limit(
+            concept_budget
+        )
+    )
+    node_rows = {norm: (label, count) for norm, label, count in root_nodes.all()}
+    top_rows = {norm: (label, count) for norm, label, count in top_nodes.all()}
 
-    root_norms: set[str] = set()
-    for aid in article_to_concepts:
-        first = article_to_concepts[aid][0] if article_to_concepts[aid] else None
-        if first:
-            root_norms.add(first)
-
-    selected_concepts: list[str] = []
-    for norm in sorted(root_norms):
-        if norm not in selected_concepts:
-            selected_concepts.append(norm)
-
-    for norm, _count in concept_counts.most_common(concept_budget):
+    selected_concepts = sorted(root_norms)
+    for norm in top_rows:
         if len(selected_concepts) >= concept_budget:
             break
-        if norm not in selected_concepts:
+        if norm not in root_norms:
             selected_concepts.append(norm)
+    node_rows.update(top_rows)
 
     concept_node_ids = {f"concept:{norm}" for norm in selected_concepts}
-
-    article_ids = list(article_to_concepts.keys())
     nodes: list[ConceptGraphNode] = []
 
     for norm in selected_concepts:
-        label_counts = concept_labels.get(norm)
-        label = label_counts.most_common(1)[0][0] if label_counts else norm
+        label, count = node_rows.get(norm, (None, 0))
         nodes.append(
             ConceptGraphNode(
                 id=f"concept:{norm}",
-                label=label,
-                value=concept_counts[norm],
+                label=label or norm,
+                value=count,
                 kind="concept",
             )
         )
@@ -887,7 +985,7 @@ async def _get_global_graph(
         nodes.append(
             ConceptGraphNode(
                 id=f"article:{aid}",
-                label=article_titles.get(aid, str(aid)),
+                label=article_titles[aid],
                 value=1,
                 kind="article",
                 article_id=aid,
@@ -914,50 +1012,28 @@ async def _get_global_graph(
                 continue
             add_edge(article_node, concept_node, 10)
 
-    from src.articles.model import ArticleEmbedding
+    neighbor_rows = await db.execute(
+        select(
+            ArticleNeighbor.article_id,
+            ArticleNeighbor.neighbor_id,
+            ArticleNeighbor.similarity,
+        ).where(
+            ArticleNeighbor.article_id.in_(article_ids),
+            ArticleNeighbor.neighbor_id.in_(article_ids),
+        )
+    )
+    for source_id, neighbor_id, similarity in neighbor_rows.all():
+        if similarity <= 0:
+            continue
+        weight = max(1, min(100, round(similarity * 100)))
+        add_edge(f"article:{source_id}", f"article:{neighbor_id}", weight)
 
     embedding_rows = await db.execute(
         select(ArticleEmbedding.article_id).where(
             ArticleEmbedding.article_id.in_(article_ids)
         )
     )
-    embedding_article_ids = [row[0] for row in embedding_rows.all()]
-
-    if embedding_article_ids:
-        src = ArticleEmbedding
-        nn = aliased(ArticleEmbedding)
-        src_ids = embedding_article_ids
-
-        lateral_q = (
-            select(
-                nn.article_id.label("neighbor_id"),
-                (1 - nn.embedding.cosine_distance(src.embedding)).label("sim"),
-            )
-            .where(
-                nn.article_id != src.article_id,
-                nn.article_id.in_(src_ids),
-            )
-            .order_by(nn.embedding.cosine_distance(src.embedding))
-            .limit(k_neighbors)
-            .lateral()
-        )
-
-        sim_rows = await db.execute(
-            select(src.article_id, lateral_q.c.neighbor_id, lateral_q.c.sim)
-            .select_from(src)
-            .join(lateral_q, true())
-            .where(src.article_id.in_(src_ids))
-        )
-        for source_id, neighbor_id, sim in sim_rows.all():
-            if source_id == neighbor_id:
-                continue
-            similarity = float(sim) if sim is not None else 0.0
-            if similarity <= 0:
-                continue
-            weight = max(1, min(100, round(similarity * 100)))
-            add_edge(f"article:{source_id}", f"article:{neighbor_id}", weight)
-
-    embedded_set = set(embedding_article_ids)
+    embedded_set = set(embedding_rows.scalars().all())
     root_to_any_article: dict[str, uuid.UUID] = {}
     for aid, norms in article_to_concepts.items():
         if norms:
@@ -0,0 +1,51 @@
+"""In-process notifications for article status changes.
+
+Long-poll requests on ``GET /api/articles/{id}/status`` wait on these events
+instead of re-reading the article in a tight loop. A notification only reaches
+waiters in the same process, so waiters still re-check the database every few
+seconds to pick up changes made by another API instance or the worker.
+"""
+
+import asyncio
+import uuid
+
+
+class ArticleStatusNotifier:
+    """Wakes long-poll waiters when an article's status changes."""
+
+    def __init__(self) -> None:
+        self._waiters: dict[uuid.UUID, set[asyncio.Event]] = {}
+
+    def notify(self, article_id: uuid.UUID) -> None:
+        """Wake everyone waiting on ``article_id``."""
+        for event in self._waiters.pop(article_id, set()):
+            event.set()
+
+    async def wait(self, article_id: uuid.UUID, max_wait: float) -> bool:
+        """Wait up to ``max_wait`` seconds for a change; True if notified."""
+        event = asyncio.Event()
+        waiters = self._waiters.setdefault(article_id, set())
+        waiters.add(event)
+        try:
+            await asyncio.wait_for(event.wait(), max_wait)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            waiters.discard(event)
+            if not waiters and self._waiters.get(article_id) is waiters:
+                del self._waiters[article_id]
+
+    def waiter_count(self, article_id: uuid.UUID) -> int:
+        return len(self._waiters.get(article_id, ()))
+
+
+_notifier_instance: ArticleStatusNotifier | None = None
+
+
+def get_status_notifier() -> ArticleStatusNotifier:
+    """Get the process-wide article status notifier."""
+    global _notifier_instance
+    if _notifier_instance is None:
+        _notifier_instance = ArticleStatusNotifier()
+    return _notifier_instance
@@ -2,15 +2,23 @@
 
 from src.common.models.base import TimestampMixin, UUIDMixin
 from src.common.models.pagination import (
+    CountMode,
+    InvalidCursorError,
     PaginatedResponse,
     PaginationMeta,
     PaginationParams,
+    decode_cursor,
+    encode_cursor,
 )
 
 __all__ = [
+    "CountMode",
+    "InvalidCursorError",
     "PaginatedResponse",
     "PaginationMeta",
     "PaginationParams",
     "TimestampMixin",
     "UUIDMixin",
+    "decode_cursor",
+    "encode_cursor",
 ]
@@ -1,7 +1,51 @@
 """Pagination models and utilities."""
 
+import base64
+import binascii
+import json
+from typing import Any, Literal
+
 from pydantic import BaseModel, Field
 
+# How a paginated endpoint should compute ``meta.total``:
+# - "exact": full COUNT over the filtered query
+# - "estimate": COUNT capped at a fixed number of rows (lower bound when capped)
+# - "none": skip counting entirely (``total`` is null)
+CountMode = Literal["exact", "estimate", "none"]
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or of the wrong kind."""
+
+
+def encode_cursor(kind: str, values: list[Any]) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor string."""
+    payload = json.dumps({"k": kind, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str) -> list[Any]:
+    """
+    Decode a cursor produced by :func:`encode_cursor`.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for
+            a different ordering (``kind``).
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get("k") != kind
+        or not isinstance(payload.get("v"), list)
+    ):
+        raise InvalidCursorError("Pagination cursor does not match this listing")
+    return list(payload["v"])
+
 
 class PaginationParams(BaseModel):
     """Query parameters for pagination."""
@@ -20,10 +64,22 @@ class PaginationMeta(BaseModel):
 
     page: int = Field(description="Current page number")
     limit: int = Field(description="Items per page")
-    total: int = Field(description="Total number of items")
-    total_pages: int = Field(description="Total number of pages")
+    total: int | None = Field(
+        description="Total number of items (null when counting was skipped)"
+    )
+    total_pages: int | None = Field(
+        description="Total number of pages (null when counting was skipped)"
+    )
+    total_estimated: bool = Field(
+        default=False,
+        description="Whether total is a capped lower bound rather than exact",
+    )
     has_next: bool = Field(description="Whether there is a next page")
     has_prev: bool = Field(description="Whether there is a previous page")
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor for fetching the next page (keyset pagination)",
+    )
 
 
 class PaginatedResponse[T](BaseModel):
@@ -36,23 +92,39 @@ class PaginatedResponse[T](BaseModel):
     def create(
         cls,
         data: list[T],
-        total: int,
+        total: int | None,
         page: int,
         limit: int,
+        *,
+        next_cursor: str | None = None,
+        has_next: bool | None = None,
+        has_prev: bool | None = None,
+        total_estimated: bool = False,
     ) -> "PaginatedResponse[T]":
         """
         Create a paginated response.
 
         Args:
             data: List of items for the current page
-            total: Total number of items across all pages
+            total: Total number of items across all pages, or None if not counted
             page: Current page number (1-indexed)
             limit: Items per page
+            next_cursor: Cursor for the next page, if one exists
+            has_next: Override for has_next (derived from total when omitted)
+            has_prev: Override for has_prev (derived from page when omitted)
+            total_estimated: Whether total is a capped estimate
 
         Returns:
             PaginatedResponse with data and metadata
         """
-        total_pages = (total + limit - 1) // limit if total > 0 else 0
+        total_pages: int | None = None
+        if total is not None:
+            total_pages = (total + limit - 1) // limit if total > 0 else 0
+
+        if has_next is None:
+            has_next = total_pages is not None and page < total_pages
+        if has_prev is None:
+            has_prev = page > 1
 
         return cls(
             data=data,
@@ -61,7 +133,9 @@ class PaginatedResponse[T](BaseModel):
                 limit=limit,
                 total=total,
                 total_pages=total_pages,
-                has_next=page < total_pages,
-                has_prev=page > 1,
+                total_estimated=total_estimated,
+                has_next=has_next,
+                has_prev=has_prev,
+                next_cursor=next_cursor,
             ),
         )
@@ -0,0 +1,238 @@
+"""Polling consumer for the durable job queue."""
+
+import asyncio
+import contextlib
+import os
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from src.jobs import queue
+from src.jobs.queue import ClaimedJob
+from src.lib.config import settings
+from src.lib.logging import get_logger
+
+logger = get_logger(__name__)
+
+JobHandler = Callable[[ClaimedJob], Awaitable[None]]
+Sweeper = Callable[[], Awaitable[int]]
+
+
+@dataclass(frozen=True)
+class JobType:
+    """How to run one kind of job.
+
+    ``on_dead_letter`` runs after a job is dead-lettered, e.g. to mark the
+    article it was working on as failed.
+    """
+
+    handler: JobHandler
+    on_dead_letter: JobHandler | None = None
+
+
+def _default_consumer_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobConsumer:
+    """Claims jobs and runs them with at most ``concurrency`` in flight."""
+
+    def __init__(
+        self,
+        job_types: dict[str, JobType],
+        *,
+        concurrency: int = 4,
+        visibility_timeout_seconds: float = 300.0,
+        poll_interval_seconds: float = 1.0,
+        sweeper: Sweeper | None = None,
+        sweep_interval_seconds: float = 60.0,
+        consumer_id: str | None = None,
+    ) -> None:
+        self._job_types = job_types
+        self._concurrency = concurrency
+        self._visibility_timeout_seconds = visibility_timeout_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._sweeper = sweeper
+        self._sweep_interval_seconds = sweep_interval_seconds
+        self.consumer_id = consumer_id or _default_consumer_id()
+        self._active: set[asyncio.Task[None]] = set()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._loop_task: asyncio.Task[None] | None = None
+        self._next_sweep_at = 0.0
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    def wake(self) -> None:
+        """Poll immediately instead of waiting for the next interval."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(
+                self._run(), name=f"job-consumer-{self.consumer_id}"
+            )
+
+    async def stop(self, grace_seconds: float = 10.0) -> None:
+        """Stop claiming and give in-flight jobs ``grace_seconds`` to finish.
+
+        Jobs still running afterwards are cancelled; their leases expire and
+        another consumer picks them up.
+        """
+        self._stopping = True
+        self.wake()
+        if self._loop_task is not None:
+            await self._loop_task
+            self._loop_task = None
+        if self._active:
+            _done, pending = await asyncio.wait(self._active, timeout=grace_seconds)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run(self) -> None:
+        logger.info(
+            "Job consumer started",
+            consumer_id=self.consumer_id,
+            kinds=sorted(self._job_types),
+            concurrency=self._concurrency,
+        )
+        while not self._stopping:
+            claimed = 0
+            try:
+                await self._maybe_sweep()
+                claimed = await self.poll_once()
+            except Exception:
+                logger.exception("Job consumer poll failed")
+
+            if claimed and len(self._active) < self._concurrency:
+                continue
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self._poll_interval_seconds
+                )
+        logger.info("Job consumer stopped", consumer_id=self.consumer_id)
+
+    async def _maybe_sweep(self) -> None:
+        if self._sweeper is None:
+            return
+        now = asyncio.get_running_loop().time()
+        if now < self._next_sweep_at:
+            return
+        self._next_sweep_at = now + self._sweep_interval_seconds
+        requeued = await self._sweeper()
+        if requeued:
+            logger.warning("Requeued stale work", count=requeued)
+
+    async def poll_once(self) -> int:
+        """Claim as many jobs as there are free slots and start them."""
+        free_slots = self._concurrency - len(self._active)
+        if free_slots <= 0:
+            return 0
+
+        from src.lib.database import async_session_factory
+
+        async with async_session_factory() as session:
+            jobs = await queue.claim(
+                session,
+                list(self._job_types),
+                free_slots,
+                consumer_id=self.consumer_id,
+                visibility_timeout_seconds=self._visibility_timeout_seconds,
+            )
+            await session.commit()
+
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job), name=f"job-{job.id}")
+            self._active.add(task)
+            task.add_done_callback(self._on_task_done)
+        return len(jobs)
+
+    def _on_task_done(self, task: asyncio.Task[None]) -> None:
+        self._active.discard(task)
+        # A slot freed up; claim more without waiting for the poll interval
+        self.wake()
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        from src.lib.database import async_session_factory
+
+        job_type = self._job_types[job.kind]
+        log = logger.bind(job_id=str(job.id), kind=job.kind, attempt=job.attempts)
+
+        if job.is_exhausted:
+            log.error("Job lease expired on its last attempt, dead-lettering")
+            async with async_session_factory() as session:
+                await queue.dead_letter(session, job, "lease expired")
+                await session.commit()
+            await self._run_dead_letter_hook(job_type, job)
+            return
+
+        try:
+            await job_type.handler(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            log.exception("Job failed")
+            async with async_session_factory() as session:
+                new_status = await queue.fail(
+                    session,
+                    job,
+                    f"{type(exc).__name__}: {exc}",
+                    retry_delay=queue.retry_delay_seconds(job.attempts),
+                )
+                await session.commit()
+            if new_status == "dead":
+                log.error("Job dead-lettered")
+                await self._run_dead_letter_hook(job_type, job)
+            return
+
+        async with async_session_factory() as session:
+            completed = await queue.complete(session, job)
+            await session.commit()
+        if not completed:
+            log.warning("Job finished after its lease was taken over")
+
+    async def _run_dead_letter_hook(self, job_type: JobType, job: ClaimedJob) -> None:
+        if job_type.on_dead_letter is None:
+            return
+        try:
+            await job_type.on_dead_letter(job)
+        except Exception:
+            logger.exception("Dead-letter hook failed", job_id=str(job.id))
+
+
+_consumer_instance: JobConsumer | None = None
+
+
+def start_job_consumer(
+    job_types: dict[str, JobType], *, sweeper: Sweeper | None = None
+) -> JobConsumer:
+    """Start the process-wide consumer configured from settings."""
+    global _consumer_instance
+    if _consumer_instance is None:
+        _consumer_instance = JobConsumer(
+            job_types,
+            concurrency=settings.JOB_CONSUMER_CONCURRENCY,
+            visibility_timeout_seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+            poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS,
+            sweeper=sweeper,
+        )
+        _consumer_instance.start()
+    return _consumer_instance
+
+
+async def stop_job_consumer() -> None:
+    global _consumer_instance
+    if _consumer_instance is not None:
+        await _consumer_instance.stop()
+        _consumer_instance = None
+
+
+def wake_job_consumer() -> None:
+    """Nudge the local consumer after enqueueing (no-op if none is running)."""
+    if _consumer_instance is not None:
+        _consumer_instance.wake()
@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.common.models.base import TimestampMixin, UUIDMixin
+from src.lib.database import Base
+
+# Jobs in these states are either waiting or leased to a consumer
+ACTIVE_JOB_STATUSES = ("queued", "running")
+# Literal form used by the partial indexes (and ON CONFLICT inference)
+ACTIVE_JOB_PREDICATE = "status IN ('queued', 'running')"
+
+
+class Job(UUIDMixin, TimestampMixin, Base):
+    """Durable background job, claimed with ``FOR UPDATE SKIP LOCKED``.
+
+    ``visible_at`` doubles as the visibility timeout: a claimed job is hidden
+    until then, and if its consumer dies it becomes claimable again.
+    Finished jobs are deleted; jobs that exhaust their attempts stay behind
+    with status ``dead`` for inspection.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index(
+            "ix_jobs_claim",
+            "kind",
+            "visible_at",
+            postgresql_where=text(ACTIVE_JOB_PREDICATE),
+        ),
+        # At most one live job per (kind, dedupe_key), e.g. one analysis per article
+        Index(
+            "uq_jobs_active_dedupe_key",
+            "kind",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text(ACTIVE_JOB_PREDICATE),
+        ),
+    )
+
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    dedupe_key: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, server_default=text("'queued'")
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    # Matches DEFAULT_MAX_ATTEMPTS for rows inserted without one
+    max_attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("3")
+    )
+    visible_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    locked_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
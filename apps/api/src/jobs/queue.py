@@ -0,0 +1,184 @@
+"""Postgres-backed durable job queue.
+
+Jobs are rows in ``jobs``. Consumers claim them with
+``SELECT ... FOR UPDATE SKIP LOCKED`` so several processes can poll the same
+table without blocking each other. Claiming a job leases it until
+``visible_at`` (the visibility timeout); a consumer that crashes or is scaled
+down simply lets the lease expire and the job is picked up again.
+
+Failed jobs are retried with exponential backoff until ``max_attempts`` and
+then dead-lettered (status ``dead``). Successful jobs are deleted.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.jobs.model import ACTIVE_JOB_PREDICATE, ACTIVE_JOB_STATUSES, Job
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Longest error text kept on a job row
+MAX_ERROR_LENGTH = 2000
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    """A job leased to this consumer."""
+
+    id: uuid.UUID
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+    @property
+    def is_last_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+    @property
+    def is_exhausted(self) -> bool:
+        """True when the lease expired on the last attempt (consumer died)."""
+        return self.attempts > self.max_attempts
+
+
+def retry_delay_seconds(attempts: int, base: float = 10.0, cap: float = 600.0) -> float:
+    """Exponential backoff before the next attempt."""
+    return float(min(cap, base * 2 ** max(attempts - 1, 0)))
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: dict[str, Any],
+    *,
+    dedupe_key: str | None = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    delay_seconds: float = 0.0,
+) -> bool:
+    """Add a job in the caller's transaction.
+
+    When ``dedupe_key`` is given and a queued or running job with the same
+    kind and key already exists, nothing is inserted.
+
+    Returns:
+        True if a job was inserted.
+    """
+    stmt = (
+        insert(Job)
+        .values(
+            id=uuid.uuid4(),
+            kind=kind,
+            payload=payload,
+            dedupe_key=dedupe_key,
+            max_attempts=max_attempts,
+            visible_at=func.now() + timedelta(seconds=delay_seconds),
+        )
+        .on_conflict_do_nothing(
+            index_elements=[Job.kind, Job.dedupe_key],
+            index_where=text(ACTIVE_JOB_PREDICATE),
+        )
+        .returning(Job.id)
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none() is not None
+
+
+async def claim(
+    db: AsyncSession,
+    kinds: list[str],
+    limit: int,
+    *,
+    consumer_id: str,
+    visibility_timeout_seconds: float,
+) -> list[ClaimedJob]:
+    """Lease up to ``limit`` visible jobs of ``kinds``.
+
+    Running jobs whose lease has expired are claimable again, which is how
+    work from a dead consumer is recovered.
+    """
+    candidates = (
+        select(Job.id)
+        .where(
+            Job.kind.in_(kinds),
+            Job.status.in_(ACTIVE_JOB_STATUSES),
+            Job.visible_at <= func.now(),
+        )
+        .order_by(Job.visible_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(Job)
+        .where(Job.id.in_(candidates.scalar_subquery()))
+        .values(
+            status="running",
+            attempts=Job.attempts + 1,
+            visible_at=func.now() + timedelta(seconds=visibility_timeout_seconds),
+            locked_by=consumer_id,
+        )
+        .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+    )
+    result = await db.execute(stmt)
+    return [
+        ClaimedJob(
+            id=row.id,
+            kind=row.kind,
+            payload=row.payload,
+            attempts=row.attempts,
+            max_attempts=row.max_attempts,
+        )
+        for row in result
+    ]
+
+
+def _leased(job: ClaimedJob) -> Any:
+    # The attempt number fences off a consumer whose lease already expired
+    # and was taken over by another consumer.
+    return (Job.id == job.id) & (Job.attempts == job.attempts)
+
+
+async def complete(db: AsyncSession, job: ClaimedJob) -> bool:
+    """Delete a finished job. False if the lease was lost meanwhile."""
+    result = await db.execute(delete(Job).where(_leased(job)).returning(Job.id))
+    return result.scalar_one_or_none() is not None
+
+
+async def fail(
+    db: AsyncSession,
+    job: ClaimedJob,
+    error: str,
+    *,
+    retry_delay: float,
+) -> str:
+    """Record a failed attempt; retry later or dead-letter when exhausted.
+
+    Returns:
+        The job's new status (``queued`` or ``dead``).
+    """
+    new_status = "dead" if job.is_last_attempt else "queued"
+    await db.execute(
+        update(Job)
+        .where(_leased(job))
+        .values(
+            status=new_status,
+            visible_at=func.now() + timedelta(seconds=retry_delay),
+            locked_by=None,
+            last_error=error[:MAX_ERROR_LENGTH],
+        )
+    )
+    return new_status
+
+
+async def dead_letter(db: AsyncSession, job: ClaimedJob, error: str) -> None:
+    """Move a job straight to the dead-letter state."""
+    await db.execute(
+        update(Job)
+        .where(_leased(job))
+        .values(status="dead", locked_by=None, last_error=error[:MAX_ERROR_LENGTH])
+    )
@@ -4,6 +4,10 @@ from typing import Any
 
 
 class AIProvider[T](ABC):
+    # Provider identifier ("gemini", "openai") and the model used for embeddings.
+    name: str
+    embedding_model: str
+
     @abstractmethod
     async def analyze_image(self, image_data: bytes | list[bytes]) -> T:
         pass
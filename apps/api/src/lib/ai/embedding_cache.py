@@ -0,0 +1,184 @@
+"""Two-tier cache for query embeddings.
+
+Search queries repeat constantly (paging through results, retyping the same
+query), and each embedding is a remote round-trip. Embeddings are cached by
+``(provider, model, normalized text)`` in an in-process LRU with TTL and,
+when ``REDIS_URL`` is configured, in Redis so that all API instances share
+them. Concurrent misses for the same key are coalesced into one provider call.
+"""
+
+import asyncio
+import hashlib
+import time
+import unicodedata
+from array import array
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from src.lib.ai.base import AIProvider
+from src.lib.config import settings
+from src.lib.logging import get_logger
+from src.lib.redis_client import get_redis
+from src.lib.telemetry import get_meter
+from src.lib.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis_module
+
+logger = get_logger(__name__)
+
+_meter = get_meter(__name__)
+_lookups_counter = _meter.create_counter(
+    "embedding_cache.lookups",
+    description="Query embedding cache lookups by result tier",
+)
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Lookup counters for the embedding cache."""
+
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.local_hits + self.redis_hits + self.misses
+        return (self.local_hits + self.redis_hits) / total if total else 0.0
+
+
+def normalize_query_text(text: str) -> str:
+    """Normalize query text so trivially different inputs share a cache entry."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def _pack(vector: list[float]) -> bytes:
+    # pgvector stores float4, so float32 packing loses nothing we'd keep
+    return array("f", vector).tobytes()
+
+
+def _unpack(raw: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(raw)
+    return values.tolist()
+
+
+class EmbeddingCache:
+    """In-process LRU + optional Redis cache for text embeddings."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 2048,
+        ttl_seconds: float = 3600.0,
+        redis: "redis_module.Redis | None" = None,
+        redis_ttl_seconds: int = 86400,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._local: TTLCache[str, list[float]] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock
+        )
+        self._redis = redis
+        self._redis_ttl_seconds = redis_ttl_seconds
+        self._inflight: dict[str, asyncio.Future[list[float]]] = {}
+        self.stats = EmbeddingCacheStats()
+
+    @staticmethod
+    def make_key(provider: str, model: str, text: str) -> str:
+        digest = hashlib.sha256(normalize_query_text(text).encode("utf-8"))
+        return f"embedding:{provider}:{model}:{digest.hexdigest()}"
+
+    async def get_or_compute(
+        self,
+        *,
+        provider: str,
+        model: str,
+        text: str,
+        compute: Callable[[str], Awaitable[list[float]]],
+    ) -> list[float]:
+        """Return the cached embedding for ``text`` or compute and store it."""
+        key = self.make_key(provider, model, text)
+
+        cached = self._local.get(key)
+        if cached is not None:
+            self._record("local")
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[list[float]] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            vector = await self._get_redis_entry(key)
+            if vector is not None:
+                self._record("redis")
+            else:
+                self._record("miss")
+                vector = await compute(text)
+                await self._set_redis_entry(key, vector)
+            self._local.set(key, vector)
+            future.set_result(vector)
+            return vector
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def embed(self, ai: AIProvider[Any], text: str) -> list[float]:
+        """Embed ``text`` with ``ai`` through the cache."""
+        return await self.get_or_compute(
+            provider=ai.name,
+            model=ai.embedding_model,
+            text=text,
+            compute=ai.generate_embedding,
+        )
+
+    def _record(self, tier: str) -> None:
+        if tier == "local":
+            self.stats.local_hits += 1
+        elif tier == "redis":
+            self.stats.redis_hits += 1
+        else:
+            self.stats.misses += 1
+        _lookups_counter.add(1, {"tier": tier})
+
+    async def _get_redis_entry(self, key: str) -> list[float] | None:
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(key)
+        except Exception:
+            logger.warning("Embedding cache Redis read failed", exc_info=True)
+            return None
+        return _unpack(raw) if raw else None
+
+    async def _set_redis_entry(self, key: str, vector: list[float]) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, _pack(vector), ex=self._redis_ttl_seconds)
+        except Exception:
+            logger.warning("Embedding cache Redis write failed", exc_info=True)
+
+
+_cache_instance: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide query embedding cache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = EmbeddingCache(
+            max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+            redis=get_redis(),
+            redis_ttl_seconds=settings.EMBEDDING_CACHE_REDIS_TTL_SECONDS,
+        )
+    return _cache_instance
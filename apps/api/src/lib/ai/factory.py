@@ -1,19 +1,9 @@
 from typing import Any
 
 from src.lib.ai.base import AIProvider
-from src.lib.config import settings
+from src.lib.ai.registry import get_ai_registry
 
 
 def create_ai_provider() -> AIProvider[Any]:
-    """Create an AI provider based on the AI_PROVIDER setting."""
-    match settings.AI_PROVIDER:
-        case "openai":
-            from src.lib.ai.openai_provider import OpenAIProvider
-
-            return OpenAIProvider()
-        case "gemini":
-            from src.lib.ai.gemini_provider import GeminiProvider
-
-            return GeminiProvider()
-        case _:
-            raise ValueError(f"Unknown AI provider: {settings.AI_PROVIDER}")
+    """Return the shared AI provider selected by the AI_PROVIDER setting."""
+    return get_ai_registry().provider()
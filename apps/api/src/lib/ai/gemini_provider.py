@@ -9,10 +9,12 @@ from src.lib.config import settings
 
 
 class GeminiProvider(AIProvider[Any]):
-    def __init__(self) -> None:
-        self._client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    name = "gemini"
+
+    def __init__(self, client: genai.Client | None = None) -> None:
+        self._client = client or genai.Client(api_key=settings.GEMINI_API_KEY)
         self._model = settings.GEMINI_MODEL
-        self._embedding_model = "text-embedding-004"
+        self.embedding_model = "text-embedding-004"
 
     async def analyze_image(self, image_data: bytes | list[bytes]) -> Any:
         raise NotImplementedError("Image analysis not implemented for PoC")
@@ -54,7 +56,7 @@ class GeminiProvider(AIProvider[Any]):
 
     async def generate_embedding(self, text: str) -> list[float]:
         response = await self._client.aio.models.embed_content(
-            model=self._embedding_model,
+            model=self.embedding_model,
             contents=text,
         )
         # Gemini text-embedding-004 outputs 768 dimensions by default
@@ -8,10 +8,12 @@ from src.lib.config import settings
 
 
 class OpenAIProvider(AIProvider[Any]):
-    def __init__(self) -> None:
-        self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    name = "openai"
+
+    def __init__(self, client: AsyncOpenAI | None = None) -> None:
+        self._client = client or AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self._model = "gpt-4o-mini"
-        self._embedding_model = "text-embedding-3-small"
+        self.embedding_model = "text-embedding-3-small"
 
     async def analyze_image(self, image_data: bytes | list[bytes]) -> Any:
         raise NotImplementedError("Image analysis not implemented for PoC")
@@ -51,7 +53,7 @@ class OpenAIProvider(AIProvider[Any]):
 
     async def generate_embedding(self, text: str) -> list[float]:
         response = await self._client.embeddings.create(
-            model=self._embedding_model,
+            model=self.embedding_model,
             input=text,
             dimensions=768,
         )
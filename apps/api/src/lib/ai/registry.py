@@ -0,0 +1,112 @@
+"""Process-wide registry of AI SDK clients and providers.
+
+SDK clients own an HTTP connection pool, so building one per request or per
+summary pays a TCP + TLS handshake every time. The registry creates each
+client once, lazily on first use, and hands the same instance to every
+caller (``ai_service``, the ``AIService`` dependency, the embedding cache).
+It is opened at application startup and closed on shutdown.
+"""
+
+from typing import TYPE_CHECKING, Any, Literal
+
+from src.lib.ai.base import AIProvider
+from src.lib.config import settings
+from src.lib.logging import get_logger
+
+if TYPE_CHECKING:
+    from google import genai
+    from openai import AsyncOpenAI
+
+logger = get_logger(__name__)
+
+ProviderName = Literal["gemini", "openai"]
+
+
+class AIClientRegistry:
+    """Holds one SDK client and one provider per AI backend."""
+
+    def __init__(self) -> None:
+        self._gemini_client: genai.Client | None = None
+        self._openai_client: AsyncOpenAI | None = None
+        self._providers: dict[str, AIProvider[Any]] = {}
+
+    def open(self) -> None:
+        """Create clients for every configured API key up front."""
+        if settings.GEMINI_API_KEY:
+            self.gemini_client()
+        if settings.OPENAI_API_KEY:
+            self.openai_client()
+
+    def gemini_client(self) -> "genai.Client":
+        """Shared Google GenAI client."""
+        if self._gemini_client is None:
+            from google import genai
+
+            self._gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
+        return self._gemini_client
+
+    def openai_client(self) -> "AsyncOpenAI":
+        """Shared OpenAI async client."""
+        if self._openai_client is None:
+            from openai import AsyncOpenAI
+
+            self._openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        return self._openai_client
+
+    def provider(self, name: str | None = None) -> AIProvider[Any]:
+        """Shared provider for ``name`` (defaults to the AI_PROVIDER setting)."""
+        resolved = name or settings.AI_PROVIDER
+        provider = self._providers.get(resolved)
+        if provider is not None:
+            return provider
+
+        match resolved:
+            case "openai":
+                from src.lib.ai.openai_provider import OpenAIProvider
+
+                provider = OpenAIProvider(client=self.openai_client())
+            case "gemini":
+                from src.lib.ai.gemini_provider import GeminiProvider
+
+                provider = GeminiProvider(client=self.gemini_client())
+            case _:
+                raise ValueError(f"Unknown AI provider: {resolved}")
+
+        self._providers[resolved] = provider
+        return provider
+
+    async def aclose(self) -> None:
+        """Close every client that was opened."""
+        self._providers.clear()
+        if self._openai_client is not None:
+            try:
+                await self._openai_client.close()
+            except Exception:
+                logger.warning("Failed to close OpenAI client", exc_info=True)
+            self._openai_client = None
+        if self._gemini_client is not None:
+            try:
+                await self._gemini_client.aio.aclose()
+                self._gemini_client.close()
+            except Exception:
+                logger.warning("Failed to close Gemini client", exc_info=True)
+            self._gemini_client = None
+
+
+_registry_instance: AIClientRegistry | None = None
+
+
+def get_ai_registry() -> AIClientRegistry:
+    """Get the process-wide AI client registry."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = AIClientRegistry()
+    return _registry_instance
+
+
+async def close_ai_registry() -> None:
+    """Close the process-wide registry (application shutdown)."""
+    global _registry_instance
+    if _registry_instance is not None:
+        await _registry_instance.aclose()
+        _registry_instance = None
@@ -0,0 +1,244 @@
+"""Admission control for LLM calls.
+
+Every summarization goes through ``LLMScheduler.run``. The scheduler holds a
+bounded number of in-flight calls per provider and applies a token bucket for
+requests per minute and one for tokens per minute, so a burst of saves queues
+up locally instead of tripping provider 429s all at once.
+
+Waiting calls are admitted by priority lane. Interactive work (a user waiting
+on a save) goes first, then retries, then backfill. Queue depth per provider
+and lane is exported as the ``llm_scheduler.queue_depth`` metric.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from src.lib.config import settings
+from src.lib.telemetry import get_meter
+
+_meter = get_meter(__name__)
+_queue_depth = _meter.create_up_down_counter(
+    "llm_scheduler.queue_depth",
+    description="LLM calls waiting for admission, by provider and lane",
+)
+_wait_seconds = _meter.create_histogram(
+    "llm_scheduler.wait_seconds",
+    unit="s",
+    description="Time LLM calls spent waiting for admission",
+)
+
+# Rough chars-per-token ratio used to budget prompts before sending them
+CHARS_PER_TOKEN = 4
+
+
+class Priority(IntEnum):
+    """Admission lanes, lowest value first."""
+
+    INTERACTIVE = 0
+    RETRY = 1
+    BACKFILL = 2
+
+
+def estimate_tokens(text: str, expected_output_tokens: int = 1024) -> int:
+    """Cheap upper-bound estimate of tokens a call will consume."""
+    return len(text) // CHARS_PER_TOKEN + expected_output_tokens
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    max_concurrency: int
+    requests_per_minute: int
+    tokens_per_minute: int
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate_per_minute``.
+
+    A rate of 0 or less means no limit: nothing ever waits.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = float(rate_per_minute)
+        self._refill_per_second = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(
+            self.capacity, self._tokens + elapsed * self._refill_per_second
+        )
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now).
+
+        Requests larger than the bucket are clamped to its capacity so a
+        single oversized prompt can't wait forever.
+        """
+        if self._refill_per_second <= 0:
+            return 0.0
+        self._refill()
+        missing = min(amount, self.capacity) - self._tokens
+        return max(missing, 0.0) / self._refill_per_second
+
+    def take(self, amount: float) -> None:
+        self._tokens -= min(amount, self.capacity)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    future: asyncio.Future[None] = field(compare=False)
+
+
+class _ProviderLane:
+    """Per-provider concurrency slots handed out in priority order."""
+
+    def __init__(self, name: str, limits: ProviderLimits) -> None:
+        self.name = name
+        self.limits = limits
+        self.in_flight = 0
+        self.requests = TokenBucket(limits.requests_per_minute)
+        self.tokens = TokenBucket(limits.tokens_per_minute)
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._bucket_lock = asyncio.Lock()
+
+    def depth(self, priority: Priority | None = None) -> int:
+        return sum(
+            1
+            for w in self._waiters
+            if not w.future.done() and (priority is None or w.priority == priority)
+        )
+
+    async def acquire_slot(self, priority: Priority) -> None:
+        if self.in_flight < self.limits.max_concurrency and not self.depth():
+            self.in_flight += 1
+            return
+
+        waiter = _Waiter(
+            int(priority), next(self._seq), asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(self._waiters, waiter)
+        attributes = {"provider": self.name, "lane": priority.name.lower()}
+        _queue_depth.add(1, attributes)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release_slot()
+            raise
+        finally:
+            _queue_depth.add(-1, attributes)
+
+    def release_slot(self) -> None:
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            if not waiter.future.done():
+                # Hand the slot straight to the next waiter
+                waiter.future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def take_budget(self, estimated_tokens: int) -> None:
+        # Serialized so admitted calls spend budget in admission order
+        async with self._bucket_lock:
+            while True:
+                wait = max(
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(estimated_tokens),
+                )
+                if not wait:
+                    self.requests.take(1)
+                    self.tokens.take(estimated_tokens)
+                    return
+                await asyncio.sleep(wait)
+
+
+class LLMScheduler:
+    """Bounded, rate-limited, prioritized execution of LLM calls."""
+
+    def __init__(self, limits: dict[str, ProviderLimits]) -> None:
+        self._limits = limits
+        self._lanes: dict[str, _ProviderLane] = {}
+
+    def _lane(self, provider: str) -> _ProviderLane:
+        lane = self._lanes.get(provider)
+        if lane is None:
+            if provider not in self._limits:
+                raise ValueError(f"No scheduler limits for provider: {provider}")
+            lane = _ProviderLane(provider, self._limits[provider])
+            self._lanes[provider] = lane
+        return lane
+
+    def queue_depth(self, provider: str, priority: Priority | None = None) -> int:
+        """Calls waiting for a slot (optionally in one lane)."""
+        lane = self._lanes.get(provider)
+        return lane.depth(priority) if lane else 0
+
+    def in_flight(self, provider: str) -> int:
+        lane = self._lanes.get(provider)
+        return lane.in_flight if lane else 0
+
+    async def run[T](
+        self,
+        provider: str,
+        call: Callable[[], Awaitable[T]],
+        *,
+        priority: Priority = Priority.INTERACTIVE,
+        estimated_tokens: int = 0,
+    ) -> T:
+        """Run ``call`` once ``provider`` has a free slot and rate budget."""
+        lane = self._lane(provider)
+        started = time.monotonic()
+        await lane.acquire_slot(priority)
+        try:
+            await lane.take_budget(estimated_tokens)
+            _wait_seconds.record(
+                time.monotonic() - started,
+                {"provider": provider, "lane": priority.name.lower()},
+            )
+            return await call()
+        finally:
+            lane.release_slot()
+
+
+def _limits_from_settings() -> dict[str, ProviderLimits]:
+    return {
+        "gemini": ProviderLimits(
+            max_concurrency=settings.GEMINI_MAX_CONCURRENCY,
+            requests_per_minute=settings.GEMINI_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.GEMINI_TOKENS_PER_MINUTE,
+        ),
+        "openai": ProviderLimits(
+            max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+            requests_per_minute=settings.OPENAI_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.OPENAI_TOKENS_PER_MINUTE,
+        ),
+    }
+
+
+_scheduler_instance: LLMScheduler | None = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the process-wide LLM scheduler."""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = LLMScheduler(_limits_from_settings())
+    return _scheduler_instance
@@ -1,11 +1,14 @@
 """AI service for article summarization using content-type-aware agents."""
 
+import asyncio
 from typing import Literal
 
 import structlog
 
 from src.lib.agents.base import BaseSummaryResult
 from src.lib.agents.registry import get_agent
+from src.lib.ai.registry import get_ai_registry
+from src.lib.ai.scheduler import Priority, estimate_tokens, get_llm_scheduler
 from src.lib.config import settings
 from src.lib.content_classifier import ContentType, classify_url
 
@@ -18,8 +21,15 @@ async def summarize_article(
     url: str | None = None,
     provider: Literal["gemini", "openai"] | None = None,
     summary_language: str = "ko",
+    priority: Priority = Priority.INTERACTIVE,
+    call_timeout_seconds: float | None = None,
 ) -> tuple[BaseSummaryResult, ContentType]:
-    """Summarize an article using content-type-aware agents."""
+    """Summarize an article using content-type-aware agents.
+
+    The provider call is admitted through the LLM scheduler in the
+    ``priority`` lane; ``call_timeout_seconds`` bounds the call itself, not
+    the time spent queued behind other calls.
+    """
     content_type = classify_url(url) if url else ContentType.GENERAL_NEWS
     agent = get_agent(content_type)
 
@@ -55,13 +65,31 @@ async def summarize_article(
         logger.warning("Gemini key not set, falling back to OpenAI")
         resolved_provider = "openai"
 
+    scheduler = get_llm_scheduler()
+    estimated_tokens = estimate_tokens(system_prompt + prompt)
     if resolved_provider == "gemini":
         logger.info("Using Gemini for summarization")
         gemini_prompt = f"{system_prompt}\n\n{prompt}"
-        result = await _summarize_with_gemini(gemini_prompt, result_schema)
+        result = await scheduler.run(
+            "gemini",
+            lambda: asyncio.wait_for(
+                _summarize_with_gemini(gemini_prompt, result_schema),
+                timeout=call_timeout_seconds,
+            ),
+            priority=priority,
+            estimated_tokens=estimated_tokens,
+        )
     else:
         logger.info("Using OpenAI for summarization")
-        result = await _summarize_with_openai(prompt, system_prompt, result_schema)
+        result = await scheduler.run(
+            "openai",
+            lambda: asyncio.wait_for(
+                _summarize_with_openai(prompt, system_prompt, result_schema),
+                timeout=call_timeout_seconds,
+            ),
+            priority=priority,
+            estimated_tokens=estimated_tokens,
+        )
 
     return result, content_type
 
@@ -71,10 +99,9 @@ async def _summarize_with_gemini(
     result_schema: type[BaseSummaryResult],
 ) -> BaseSummaryResult:
     """Summarize using Google Gemini with structured output."""
-    from google import genai
     from google.genai import types
 
-    client = genai.Client(api_key=settings.GEMINI_API_KEY)
+    client = get_ai_registry().gemini_client()
 
     response = await client.aio.models.generate_content(
         model=settings.GEMINI_MODEL,
@@ -96,9 +123,7 @@ async def _summarize_with_openai(
     result_schema: type[BaseSummaryResult],
 ) -> BaseSummaryResult:
     """Summarize using OpenAI with structured output."""
-    from openai import AsyncOpenAI
-
-    client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    client = get_ai_registry().openai_client()
 
     completion = await client.beta.chat.completions.parse(
         model="gpt-4o-mini",
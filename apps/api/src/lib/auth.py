@@ -1,6 +1,8 @@
 import base64
+import functools
+import hashlib
 import json
-import uuid as uuid_lib
+import time
 from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from functools import wraps
@@ -13,9 +15,9 @@ from fastapi import Depends, HTTPException, Request, status
 from jwcrypto import jwe, jwk
 from jwcrypto.common import JWException
 from pydantic import BaseModel
-from sqlalchemy import select
 
 from src.lib.config import settings
+from src.lib.ttl_cache import TTLCache
 
 logger = structlog.get_logger(__name__)
 
@@ -97,8 +99,9 @@ class CurrentUserInfo(BaseModel):
     email_verified: bool = False
 
 
-def _get_jwe_key() -> jwk.JWK:
-    """Get JWK key for JWE encryption/decryption."""
+@functools.cache
+def get_jwe_key() -> jwk.JWK:
+    """Get JWK key for JWE encryption/decryption (built once per process)."""
     key_bytes = settings.JWE_SECRET_KEY.encode("utf-8")
     if len(key_bytes) < 32:
         key_bytes = key_bytes.ljust(32, b"\0")
@@ -117,7 +120,7 @@ def create_access_token(user_id: str) -> str:
         "iat": int(now.timestamp()),
     }
 
-    key = _get_jwe_key()
+    key = get_jwe_key()
     jwe_token = jwe.JWE(
         json.dumps(payload).encode("utf-8"),
         recipient=key,
@@ -136,7 +139,7 @@ def create_refresh_token(user_id: str) -> str:
         "iat": int(now.timestamp()),
     }
 
-    key = _get_jwe_key()
+    key = get_jwe_key()
     jwe_token = jwe.JWE(
         json.dumps(payload).encode("utf-8"),
         recipient=key,
@@ -148,7 +151,7 @@ def create_refresh_token(user_id: str) -> str:
 def decode_token(token: str) -> TokenPayload:
     """Decode and validate JWE token."""
     try:
-        key = _get_jwe_key()
+        key = get_jwe_key()
         jwe_token = jwe.JWE()
         jwe_token.deserialize(token)
         jwe_token.decrypt(key)
@@ -298,31 +301,83 @@ async def _ensure_user_exists(user_info: CurrentUserInfo) -> None:
 
     Uses a standalone session to commit independently of the request session,
     so the user exists before the route handler's session tries to reference it.
+    The session only checks out a connection for users not yet known to
+    exist.
     """
+    from sqlalchemy.exc import IntegrityError
+
     from src.lib.database import async_session_factory
-    from src.users.model import User
+    from src.users.known_users import ensure_user
 
-    uid = uuid_lib.UUID(user_info.id)
     async with async_session_factory() as session:
-        result = await session.execute(select(User.id).where(User.id == uid))
-        if result.scalar_one_or_none() is not None:
+        try:
+            created = await ensure_user(session, user_info)
+        except IntegrityError:
+            logger.error(
+                "Supabase user's email belongs to another user row",
+                user_id=user_info.id,
+            )
             return
+        if created:
+            logger.info("Auto-created user from Supabase JWT", user_id=user_info.id)
 
-        user = User(
-            id=uid,
-            email=user_info.email or f"{user_info.id}@supabase.user",
-            name=user_info.name,
-            image=user_info.image,
-            email_verified=user_info.email_verified,
+
+class AuthTokenCache:
+    """Bounded cache of authenticated users by bearer token.
+
+    Entries are keyed by a SHA-256 of the token, so raw tokens are never
+    kept in memory, and expire after ``ttl_seconds`` or at the token's own
+    ``exp``, whichever comes first. Only successful authentications are
+    cached.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._entries: TTLCache[bytes, CurrentUserInfo] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock
         )
-        session.add(user)
-        try:
-            await session.commit()
-            logger.info("Auto-created user from Supabase JWT", user_id=str(uid))
-        except Exception:
-            await session.rollback()
-            # User may have been created concurrently, which is fine
-            logger.debug("User already exists (concurrent creation)", user_id=str(uid))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> CurrentUserInfo | None:
+        return self._entries.get(self._key(token))
+
+    def set(self, token: str, user: CurrentUserInfo, exp: float) -> None:
+        self._entries.set(self._key(token), user, expires_at=exp)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_token_cache_instance: AuthTokenCache | None = None
+
+
+def get_auth_token_cache() -> AuthTokenCache:
+    """Get the process-wide authenticated token cache."""
+    global _token_cache_instance
+    if _token_cache_instance is None:
+        _token_cache_instance = AuthTokenCache(
+            max_entries=settings.AUTH_TOKEN_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+        )
+    return _token_cache_instance
+
+
+def _supabase_jwt_exp(token: str) -> float:
+    """``exp`` of a JWT already accepted by ``_decode_supabase_jwt``."""
+    payload_b64 = token.split(".")[1]
+    payload_b64 += "=" * (-len(payload_b64) % 4)
+    return float(json.loads(base64.urlsafe_b64decode(payload_b64)).get("exp", 0))
 
 
 async def get_current_user(request: Request) -> CurrentUserInfo:
@@ -340,6 +395,11 @@ async def get_current_user(request: Request) -> CurrentUserInfo:
 
     token = auth_header.replace("Bearer ", "")
 
+    cache = get_auth_token_cache()
+    cached = cache.get(token)
+    if cached is not None:
+        return cached
+
     # Try JWE token first (API-issued tokens)
     try:
         payload = decode_token(token)
@@ -354,7 +414,9 @@ async def get_current_user(request: Request) -> CurrentUserInfo:
                 detail="Token expired",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return CurrentUserInfo(id=payload.user_id)
+        user = CurrentUserInfo(id=payload.user_id)
+        cache.set(token, user, payload.exp)
+        return user
     except HTTPException:
         pass
 
@@ -363,6 +425,7 @@ async def get_current_user(request: Request) -> CurrentUserInfo:
     if user_info:
         logger.debug("Authenticated via Supabase JWT", user_id=user_info.id)
         await _ensure_user_exists(user_info)
+        cache.set(token, user_info, _supabase_jwt_exp(token))
         return user_info
 
     raise HTTPException(
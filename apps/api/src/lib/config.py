@@ -39,15 +39,40 @@ class Settings(BaseSettings):
     # JWT/JWE (stateless authentication)
     JWT_SECRET: str = "your-super-secret-jwt-key-change-in-production"  # noqa: S105
     JWE_SECRET_KEY: str = "your-super-secret-jwe-encryption-key-change-in-production"  # noqa: S105
+    # Authenticated bearer tokens cached per process (0 disables); entries
+    # never outlive the token's own exp
+    AUTH_TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_TOKEN_CACHE_TTL_SECONDS: float = 300.0
+    # Users known to have a row skip the existence check (Redis tier is used
+    # when REDIS_URL is set)
+    KNOWN_USERS_CACHE_MAX_ENTRIES: int = 100000
+    KNOWN_USERS_CACHE_TTL_SECONDS: float = 3600.0
+    KNOWN_USERS_CACHE_REDIS_TTL_SECONDS: int = 604800
 
     # Redis (optional)
     REDIS_URL: str | None = None
     REDIS_HOST: str | None = None
     REDIS_PORT: int | None = None
 
+    # Per-user rate limit policies (search, analyze-url); off disables them
+    RATE_LIMIT_ENABLED: bool = True
+    # In-memory rate limiter: keys tracked per process, and how often keys
+    # whose bucket has refilled are dropped
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    RATE_LIMIT_SWEEP_INTERVAL_SECONDS: float = 60.0
+
     # Worker
     WORKER_URL: str = "http://localhost:8080"
 
+    # Durable job queue (jobs table). The API consumes analysis jobs itself
+    # unless JOB_CONSUMER_ENABLED is off; the worker consumes embedding jobs.
+    JOB_CONSUMER_ENABLED: bool = True
+    JOB_CONSUMER_CONCURRENCY: int = 4
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 300.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 3
+    ANALYSIS_STALE_AFTER_SECONDS: float = 900.0
+
     # OpenTelemetry (optional)
     OTEL_EXPORTER_OTLP_ENDPOINT: str | None = None
     OTEL_SERVICE_NAME: str | None = None
@@ -59,6 +84,53 @@ class Settings(BaseSettings):
     GEMINI_MODEL: str = "gemini-3-flash-preview"
     OPENAI_API_KEY: str | None = None
 
+    # LLM scheduler limits per provider (src/lib/ai/scheduler.py); a rate of 0
+    # disables that limit
+    GEMINI_MAX_CONCURRENCY: int = 8
+    GEMINI_REQUESTS_PER_MINUTE: int = 300
+    GEMINI_TOKENS_PER_MINUTE: int = 1_000_000
+    OPENAI_MAX_CONCURRENCY: int = 8
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_TOKENS_PER_MINUTE: int = 200_000
+
+    # Query embedding cache (Redis tier is used when REDIS_URL is set)
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 2048
+    EMBEDDING_CACHE_TTL_SECONDS: float = 3600.0
+    EMBEDDING_CACHE_REDIS_TTL_SECONDS: int = 86400
+
+    # Plan + monthly usage per user for the analysis credit check. Keep the
+    # local TTL short: other instances' changes show up when it expires.
+    ENTITLEMENT_CACHE_MAX_ENTRIES: int = 10000
+    ENTITLEMENT_CACHE_TTL_SECONDS: float = 30.0
+    ENTITLEMENT_CACHE_REDIS_TTL_SECONDS: int = 3600
+
+    # Users whose concept vocabulary is kept in memory, per process
+    CONCEPT_VOCABULARY_CACHE_MAX_USERS: int = 1024
+    # Memoized concept label normalizations, per process
+    CONCEPT_NORMALIZATION_CACHE_SIZE: int = 16384
+
+    # In-memory article kNN (similar articles) instead of pgvector queries.
+    # Each cached user costs ~3 KB per embedded article, so it is opt-in.
+    VECTOR_INDEX_ENABLED: bool = False
+    VECTOR_INDEX_MAX_USERS: int = 128
+    # Embeddings written by other processes show up after at most this long
+    VECTOR_INDEX_TTL_SECONDS: float = 30.0
+
+    # Fused rankings of mode=hybrid searches, cached per user and query
+    HYBRID_SEARCH_CACHE_MAX_ENTRIES: int = 1024
+    HYBRID_SEARCH_CACHE_TTL_SECONDS: float = 120.0
+
+    # pgvector ANN search. ef_search applies to the HNSW index, probes to
+    # IVFFlat; higher values trade latency for recall. Both indexes filter
+    # by user after the scan, so per-user queries can come back short;
+    # iterative scans (pgvector >= 0.8, an error on older versions) keep
+    # scanning until enough rows pass the filter.
+    VECTOR_SEARCH_EF_SEARCH: int = 200
+    VECTOR_SEARCH_PROBES: int = 10
+    VECTOR_SEARCH_ITERATIVE_SCAN: Literal["off", "strict_order", "relaxed_order"] = (
+        "off"
+    )
+
     # Storage (optional)
     STORAGE_BACKEND: Literal["gcs", "s3", "minio"] = "minio"
     GCS_BUCKET_NAME: str | None = None
@@ -1,22 +1,48 @@
-"""Rate limiting middleware with Redis or in-memory backend."""
-
+"""Rate limiting middleware with Redis or in-memory backend.
+
+The in-memory limiter implements GCRA (the generic cell rate algorithm, a
+token bucket stored as one timestamp): ``requests`` per ``window`` may be
+spent in a burst and are replenished evenly over the window. Each key keeps
+a single float, keys live in an LRU capped at ``RATE_LIMIT_MAX_KEYS``, and
+keys whose bucket is full again are swept out periodically. The Redis
+limiter runs the same algorithm as one Lua script call per request, keeping
+one small string per key that expires when the bucket is full again.
+
+Keys are built from templates such as ``"{ip}:{route}"``. ``{route}`` is the
+matched route's path (``/articles/{article_id}``), or the path with UUID and
+numeric segments collapsed when no route has been matched yet (middleware),
+so every article URL shares one bucket.
+"""
+
+import functools
+import math
+import re
 import time
-from collections import defaultdict
-from collections.abc import Awaitable, Callable
+import uuid
+from collections.abc import Awaitable, Callable, Mapping
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, cast
 
 from fastapi import HTTPException, Request, status
 from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.lib.config import settings
+from src.lib.dependencies import CurrentUser, DBSession
 from src.lib.logging import get_logger
+from src.lib.redis_client import get_redis
+from src.lib.ttl_cache import TTLCache
 
 if TYPE_CHECKING:
     import redis.asyncio as redis_module
+    from redis.commands.core import AsyncScript
 
 logger = get_logger(__name__)
 
+_PATH_PARAM_RE = re.compile(
+    r"(?<=/)(?:[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}|\d+)(?=/|$)"
+)
+
 
 @dataclass
 class RateLimitConfig:
@@ -25,133 +51,236 @@ class RateLimitConfig:
     requests: int = 100  # Number of requests
     window: int = 60  # Time window in seconds
     key_func: Callable[[Request], str] | None = None  # Custom key function
+    key_template: str | None = None  # e.g. "{ip}:{method}:{route}"
 
 
-def default_key_func(request: Request) -> str:
-    """Default rate limit key: IP address + path."""
+def client_ip(request: Request) -> str:
+    """Client IP, preferring the first ``X-Forwarded-For`` hop."""
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        ip = forwarded.split(",")[0].strip()
-    else:
-        ip = request.client.host if request.client else "unknown"
-    return f"{ip}:{request.url.path}"
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def route_template(request: Request) -> str:
+    """The request path with path parameters collapsed."""
+    route = request.scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if isinstance(path_format, str):
+        return path_format
+    return _PATH_PARAM_RE.sub("{id}", request.url.path)
+
+
+def make_key_func(template: str) -> Callable[[Request], str]:
+    """Key function filling ``template`` from the request.
+
+    Available fields are ``ip``, ``route`` (see ``route_template``), ``path``
+    and ``method``.
+    """
+    # Fail at import time on unknown fields rather than on the first request
+    template.format(ip="", route="", path="", method="")
+
+    def key_func(request: Request) -> str:
+        return template.format(
+            ip=client_ip(request),
+            route=route_template(request),
+            path=request.url.path,
+            method=request.method,
+        )
+
+    return key_func
+
+
+def default_key_func(request: Request) -> str:
+    """Default rate limit key: IP address + route template."""
+    return f"{client_ip(request)}:{route_template(request)}"
+
+
+def _resolve_key_func(config: RateLimitConfig) -> Callable[[Request], str]:
+    if config.key_func is not None:
+        return config.key_func
+    if config.key_template is not None:
+        return make_key_func(config.key_template)
+    return default_key_func
 
 
-@dataclass
 class InMemoryRateLimiter:
-    """Simple in-memory rate limiter using sliding window."""
+    """In-memory GCRA rate limiter with constant state per key."""
+
+    def __init__(
+        self,
+        requests: int,
+        window: int,
+        *,
+        max_keys: int = 100_000,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.requests = requests
+        self.window = window
+        self._emission_interval = window / requests
+        self._sweep_interval = sweep_interval
+        self._clock = clock
+        # Theoretical arrival time: when the key's bucket is full again, which
+        # is also when the key carries no state any more
+        self._tats: TTLCache[str, float] = TTLCache(
+            max_entries=max_keys, ttl_seconds=window, clock=clock
+        )
+        self._next_sweep = clock() + sweep_interval
 
-    requests: int
-    window: int
-    _storage: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    def __len__(self) -> int:
+        return len(self._tats)
 
-    def is_allowed(self, key: str) -> tuple[bool, int, int]:
+    def is_allowed(self, key: str, cost: int = 1) -> tuple[bool, int, int]:
         """
-        Check if request is allowed.
+        Check if request is allowed, spending ``cost`` units of the budget.
 
         Returns:
             tuple: (allowed, remaining, reset_after)
         """
-        now = time.time()
-        window_start = now - self.window
-
-        # Clean old entries
-        self._storage[key] = [ts for ts in self._storage[key] if ts > window_start]
-
-        current_count = len(self._storage[key])
-        remaining = max(0, self.requests - current_count - 1)
-        reset_after = (
-            int(self.window - (now - self._storage[key][0]))
-            if self._storage[key]
-            else self.window
-        )
-
-        if current_count >= self.requests:
-            return False, 0, reset_after
-
-        self._storage[key].append(now)
-        return True, remaining, reset_after
+        now = self._clock()
+        if now >= self._next_sweep:
+            self._tats.purge_expired()
+            self._next_sweep = now + self._sweep_interval
+
+        tat = max(self._tats.get(key) or now, now)
+        new_tat = tat + self._emission_interval * cost
+        allow_at = new_tat - self.window
+        if now < allow_at:
+            return False, 0, math.ceil(allow_at - now)
+
+        self._tats.set(key, new_tat, expires_at=new_tat)
+
+        remaining = int((now - allow_at) / self._emission_interval + 1e-9)
+        return True, remaining, math.ceil(new_tat - now)
+
+
+# GCRA in one round-trip. Times are in microseconds from the Redis clock, so
+# every API instance agrees on "now"; the key holds the theoretical arrival
+# time and expires when the bucket is full again.
+_GCRA_SCRIPT = """
+local emission = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + emission * cost
+local allow_at = new_tat - window
+if now < allow_at then
+    return {0, 0, math.ceil(allow_at - now)}
+end
+local ttl = math.ceil(new_tat - now)
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX', math.ceil(ttl / 1000))
+return {1, math.floor((now - allow_at) / emission + 1e-6), ttl}
+"""
 
 
 class RedisRateLimiter:
-    """Redis-based rate limiter using sliding window."""
+    """Redis-based GCRA rate limiter: one script call and one key per client."""
 
-    def __init__(self, requests: int, window: int):
+    def __init__(self, requests: int, window: int, redis: "redis_module.Redis"):
         self.requests = requests
         self.window = window
-        self._redis: redis_module.Redis | None = None
-
-    async def _get_redis(self) -> "redis_module.Redis":
-        """Lazy Redis connection."""
-        if self._redis is None:
-            import redis.asyncio as redis
-
-            self._redis = cast(
-                redis_module.Redis,
-                redis.from_url(settings.REDIS_URL),  # type: ignore[no-untyped-call]
-            )
-        return self._redis
+        self._redis = redis
+        self._script: AsyncScript | None = None
 
-    async def is_allowed(self, key: str) -> tuple[bool, int, int]:
+    async def is_allowed(self, key: str, cost: int = 1) -> tuple[bool, int, int]:
         """
-        Check if request is allowed using Redis sorted sets.
+        Check if request is allowed with the GCRA script, spending ``cost``.
 
         Returns:
             tuple: (allowed, remaining, reset_after)
         """
-        redis = await self._get_redis()
-        now = time.time()
-        window_start = now - self.window
-        rate_key = f"rate_limit:{key}"
+        if self._script is None:
+            self._script = self._redis.register_script(_GCRA_SCRIPT)
+        window_us = self.window * 1_000_000
+        allowed, remaining, reset_us = await self._script(
+            keys=[f"rate_limit:gcra:{key}"],
+            args=[window_us / self.requests, window_us, cost],
+        )
+        # Denied: seconds until one request fits; allowed: until full again
+        return bool(allowed), int(remaining), math.ceil(int(reset_us) / 1_000_000)
 
-        pipe = redis.pipeline()
-        pipe.zremrangebyscore(rate_key, 0, window_start)
-        pipe.zcard(rate_key)
-        pipe.zadd(rate_key, {str(now): now})
-        pipe.expire(rate_key, self.window)
-        results = await pipe.execute()
 
-        current_count = results[1]
-        remaining = max(0, self.requests - current_count - 1)
-        reset_after = self.window
+RateLimiter = InMemoryRateLimiter | RedisRateLimiter
 
-        if current_count >= self.requests:
-            # Remove the just-added entry
-            await redis.zrem(rate_key, str(now))
-            return False, 0, reset_after
 
-        return True, remaining, reset_after
+class RateLimiterRegistry:
+    """Limiters by ``(requests, window)``, on Redis when a client is given."""
 
-    async def close(self) -> None:
-        """Close Redis connection."""
-        if self._redis:
-            await self._redis.aclose()
-            self._redis = None
+    def __init__(
+        self,
+        redis: "redis_module.Redis | None" = None,
+        *,
+        max_keys: int = 100_000,
+        sweep_interval: float = 60.0,
+    ) -> None:
+        self._redis = redis
+        self._max_keys = max_keys
+        self._sweep_interval = sweep_interval
+        self._limiters: dict[tuple[int, int], RateLimiter] = {}
 
+    def get(self, requests: int, window: int) -> RateLimiter:
+        limiter = self._limiters.get((requests, window))
+        if limiter is None:
+            limiter = self._create(requests, window)
+            self._limiters[(requests, window)] = limiter
+        return limiter
 
-# Global rate limiter instance
-_rate_limiter: InMemoryRateLimiter | RedisRateLimiter | None = None
+    def _create(self, requests: int, window: int) -> RateLimiter:
+        if self._redis is None:
+            return InMemoryRateLimiter(
+                requests,
+                window,
+                max_keys=self._max_keys,
+                sweep_interval=self._sweep_interval,
+            )
+        return RedisRateLimiter(requests, window, self._redis)
 
 
-def get_rate_limiter(config: RateLimitConfig) -> InMemoryRateLimiter | RedisRateLimiter:
-    """Get or create rate limiter instance."""
-    global _rate_limiter
+_registry_instance: RateLimiterRegistry | None = None
 
-    if _rate_limiter is None:
-        if settings.REDIS_URL:
-            logger.info("Using Redis rate limiter")
-            _rate_limiter = RedisRateLimiter(config.requests, config.window)
-        else:
-            logger.info("Using in-memory rate limiter")
-            _rate_limiter = InMemoryRateLimiter(config.requests, config.window)
 
-    return _rate_limiter
+def get_rate_limiter_registry() -> RateLimiterRegistry:
+    """Get the process-wide rate limiter registry."""
+    global _registry_instance
+    if _registry_instance is None:
+        logger.info(
+            "Using Redis rate limiter"
+            if settings.REDIS_URL
+            else "Using in-memory rate limiter"
+        )
+        _registry_instance = RateLimiterRegistry(
+            get_redis(),
+            max_keys=settings.RATE_LIMIT_MAX_KEYS,
+            sweep_interval=settings.RATE_LIMIT_SWEEP_INTERVAL_SECONDS,
+        )
+    return _registry_instance
+
+
+def get_rate_limiter(config: RateLimitConfig) -> RateLimiter:
+    """Get the limiter for ``config``'s limits."""
+    return get_rate_limiter_registry().get(config.requests, config.window)
+
+
+async def check_rate_limit(
+    limiter: RateLimiter, key: str, cost: int = 1
+) -> tuple[bool, int, int]:
+    """Spend ``cost`` from ``key``'s budget on either limiter."""
+    if isinstance(limiter, RedisRateLimiter):
+        return await limiter.is_allowed(key, cost)
+    return limiter.is_allowed(key, cost)
 
 
 def rate_limit(
     requests: int = 100,
     window: int = 60,
     key_func: Callable[[Request], str] | None = None,
+    key_template: str | None = None,
 ) -> Callable[[Callable[..., Awaitable[Response]]], Callable[..., Awaitable[Response]]]:
     """
     Rate limit decorator for FastAPI endpoints.
@@ -160,19 +289,27 @@ def rate_limit(
         requests: Maximum requests allowed in the window
         window: Time window in seconds
         key_func: Custom function to generate rate limit key
+        key_template: Key template such as "{ip}:{route}" (see make_key_func)
 
     Usage:
         @app.get("/api/resource")
         @rate_limit(requests=10, window=60)
-        async def get_resource():
+        async def get_resource(request: Request):
             ...
     """
-    config = RateLimitConfig(requests=requests, window=window, key_func=key_func)
-    actual_key_func = key_func or default_key_func
+    config = RateLimitConfig(
+        requests=requests,
+        window=window,
+        key_func=key_func,
+        key_template=key_template,
+    )
+    actual_key_func = _resolve_key_func(config)
 
     def decorator(
         func: Callable[..., Awaitable[Response]],
     ) -> Callable[..., Awaitable[Response]]:
+        # functools.wraps exposes the endpoint's signature to FastAPI
+        @functools.wraps(func)
         async def wrapper(*args: object, **kwargs: object) -> Response:
             # Find request in args/kwargs
             request: Request | None = None
@@ -188,11 +325,7 @@ def rate_limit(
 
             limiter = get_rate_limiter(config)
             key = actual_key_func(request)
-
-            if isinstance(limiter, RedisRateLimiter):
-                allowed, _remaining, reset_after = await limiter.is_allowed(key)
-            else:
-                allowed, _remaining, reset_after = limiter.is_allowed(key)
+            allowed, _remaining, reset_after = await check_rate_limit(limiter, key)
 
             if not allowed:
                 logger.warning("Rate limit exceeded", key=key)
@@ -210,8 +343,6 @@ def rate_limit(
             response = await func(*args, **kwargs)
             return response
 
-        wrapper.__name__ = func.__name__
-        wrapper.__doc__ = func.__doc__
         return wrapper
 
     return decorator
@@ -237,14 +368,10 @@ async def rate_limit_middleware(
     if request.url.path.startswith("/health"):
         return await call_next(request)
 
-    key_func = config.key_func or default_key_func
+    key_func = _resolve_key_func(config)
     limiter = get_rate_limiter(config)
     key = key_func(request)
-
-    if isinstance(limiter, RedisRateLimiter):
-        allowed, remaining, reset_after = await limiter.is_allowed(key)
-    else:
-        allowed, remaining, reset_after = limiter.is_allowed(key)
+    allowed, remaining, reset_after = await check_rate_limit(limiter, key)
 
     if not allowed:
         logger.warning("Rate limit exceeded", key=key, path=request.url.path)
@@ -266,3 +393,71 @@ async def rate_limit_middleware(
     response.headers["X-RateLimit-Remaining"] = str(remaining)
     response.headers["X-RateLimit-Reset"] = str(reset_after)
     return response
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """A named per-user budget of ``requests`` units per ``window`` seconds.
+
+    ``plan_requests`` overrides the budget per subscription plan, and ``cost``
+    weighs a request (one unit when unset). Each policy has its own budget,
+    so spending it on one endpoint doesn't throttle the others.
+    """
+
+    name: str
+    requests: int
+    window: int
+    plan_requests: Mapping[str, int] = field(default_factory=dict)
+    cost: Callable[[Request], int] | None = None
+
+    def requests_for(self, plan: str) -> int:
+        return self.plan_requests.get(plan, self.requests)
+
+
+async def _user_plan(db: AsyncSession, user_id: str) -> str:
+    from src.subscriptions.entitlements import get_entitlement
+
+    return (await get_entitlement(db, uuid.UUID(user_id))).plan
+
+
+def limit_by_user(policy: RateLimitPolicy) -> Callable[..., Awaitable[None]]:
+    """FastAPI dependency enforcing ``policy`` for the current user.
+
+    Usage:
+        SEARCH_LIMIT = limit_by_user(RateLimitPolicy("search", 60, 60))
+
+        @router.get("/search", dependencies=[Depends(SEARCH_LIMIT)])
+        async def search(...):
+            ...
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        user: CurrentUser,
+        db: DBSession,
+    ) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        plan = await _user_plan(db, user.id) if policy.plan_requests else "basic"
+        requests = policy.requests_for(plan)
+        cost = policy.cost(request) if policy.cost else 1
+        limiter = get_rate_limiter_registry().get(requests, policy.window)
+        key = f"{policy.name}:{plan}:{user.id}"
+        allowed, remaining, reset_after = await check_rate_limit(limiter, key, cost)
+
+        headers = {
+            "X-RateLimit-Limit": str(requests),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset_after),
+        }
+        if not allowed:
+            logger.warning("Rate limit exceeded", policy=policy.name, user_id=user.id)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={**headers, "Retry-After": str(reset_after)},
+            )
+        response.headers.update(headers)
+
+    return dependency
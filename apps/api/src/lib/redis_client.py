@@ -0,0 +1,41 @@
+"""The process-wide Redis client.
+
+The caches and rate limiters share one client, and so one connection pool,
+created on first use when ``REDIS_URL`` is configured and closed on
+application shutdown.
+"""
+
+from typing import TYPE_CHECKING, cast
+
+from src.lib.config import settings
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis_module
+
+_client: "redis_module.Redis | None" = None
+
+
+def get_redis() -> "redis_module.Redis | None":
+    """The shared client (None when Redis is not configured).
+
+    Creating it doesn't connect; the pool connects on the first command.
+    """
+    global _client
+    if not settings.REDIS_URL:
+        return None
+    if _client is None:
+        import redis.asyncio as redis
+
+        _client = cast(
+            "redis_module.Redis",
+            redis.from_url(settings.REDIS_URL),  # type: ignore[no-untyped-call]
+        )
+    return _client
+
+
+async def close_redis() -> None:
+    """Close the shared client's connections (application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
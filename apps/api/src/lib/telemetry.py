@@ -1,14 +1,17 @@
-"""OpenTelemetry configuration for distributed tracing."""
+"""OpenTelemetry configuration for distributed tracing and metrics."""
 
 import contextlib
 
 from fastapi import FastAPI
-from opentelemetry import trace
+from opentelemetry import metrics, trace
+from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
 from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
 from opentelemetry.instrumentation.redis import RedisInstrumentor
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
@@ -17,7 +20,7 @@ from src.lib.config import settings
 
 
 def configure_telemetry() -> None:
-    """Configure OpenTelemetry tracing with OTLP exporter."""
+    """Configure OpenTelemetry tracing and metrics with OTLP exporters."""
     resource = Resource.create(
         {
             "service.name": settings.PROJECT_NAME,
@@ -42,6 +45,19 @@ def configure_telemetry() -> None:
 
     trace.set_tracer_provider(provider)
 
+    # Metrics are only exported when an OTLP endpoint is configured;
+    # otherwise instruments created via get_meter() are no-ops.
+    if settings.OTEL_EXPORTER_OTLP_ENDPOINT:
+        metric_reader = PeriodicExportingMetricReader(
+            OTLPMetricExporter(
+                endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT,
+                insecure=settings.PROJECT_ENV != "prod",
+            )
+        )
+        metrics.set_meter_provider(
+            MeterProvider(resource=resource, metric_readers=[metric_reader])
+        )
+
 
 def instrument_app(app: FastAPI) -> None:
     """Instrument FastAPI and other libraries for tracing."""
@@ -70,3 +86,8 @@ def instrument_app(app: FastAPI) -> None:
 def get_tracer(name: str = __name__) -> trace.Tracer:
     """Get a tracer instance for manual instrumentation."""
     return trace.get_tracer(name)
+
+
+def get_meter(name: str = __name__) -> metrics.Meter:
+    """Get a meter instance for recording metrics."""
+    return metrics.get_meter(name)
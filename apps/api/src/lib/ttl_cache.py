@@ -0,0 +1,69 @@
+"""In-process LRU whose entries expire.
+
+The local tier of the caches in front of Redis and the database (known
+users, entitlements, query embeddings, auth tokens, search rankings) and the
+in-memory rate limiter's per-key state.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+
+class TTLCache[K: Hashable, V]:
+    """LRU capped at ``max_entries``; entries expire ``ttl_seconds`` after
+    they are set, or at the ``expires_at`` given to ``set``."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, *, expires_at: float | None = None) -> None:
+        """Store ``value``; ``expires_at`` (on ``clock``) caps its TTL."""
+        now = self._clock()
+        deadline = now + self._ttl_seconds
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        if deadline <= now or self._max_entries <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (deadline, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def purge_expired(self) -> None:
+        """Drop every expired entry (``get`` only drops the ones it finds)."""
+        now = self._clock()
+        for key in [
+            k for k, (expires_at, _) in self._entries.items() if expires_at <= now
+        ]:
+            del self._entries[key]
@@ -12,9 +12,12 @@ from opentelemetry import trace
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from src.lib.ai.registry import close_ai_registry, get_ai_registry
+from src.lib.auth import get_jwe_key
 from src.lib.config import settings
 from src.lib.database import async_session_factory
 from src.lib.logging import configure_logging, get_logger
+from src.lib.redis_client import close_redis
 from src.lib.telemetry import configure_telemetry, instrument_app
 
 # Configure logging first
@@ -29,9 +32,25 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("Starting application", env=settings.PROJECT_ENV)
     configure_telemetry()
     instrument_app(app)
+    # Build the JWE key now rather than on the first authenticated request
+    get_jwe_key()
+    get_ai_registry().open()
+    if settings.JOB_CONSUMER_ENABLED:
+        from src.articles import analysis, concept_graph
+        from src.jobs.consumer import start_job_consumer
+
+        start_job_consumer(
+            {**analysis.JOB_TYPES, **concept_graph.JOB_TYPES},
+            sweeper=analysis.requeue_stale_analyses,
+        )
     yield
     # Shutdown
     logger.info("Shutting down application")
+    from src.jobs.consumer import stop_job_consumer
+
+    await stop_job_consumer()
+    await close_redis()
+    await close_ai_registry()
 
 
 app = FastAPI(
@@ -0,0 +1,134 @@
+"""Analysis credits reserved at dispatch and settled when the analysis ends.
+
+Checking ``can_summarize`` and counting the summary after the analysis let
+concurrent requests from one user all pass the check. Instead, dispatching
+an analysis reserves a credit in the same transaction that creates the
+article and enqueues its job:
+
+- ``reserve_credit`` bumps ``usage_records.summaries_reserved`` only while
+  ``summaries_used + summaries_reserved`` is under the plan's limit (the row
+  lock of ``INSERT ... ON CONFLICT DO UPDATE ... WHERE`` serializes
+  concurrent reservations) and records the reservation per article.
+- ``commit_credit`` turns the reservation into a used summary once the
+  analysis succeeds.
+- ``release_credit`` hands it back when the analysis fails for good or the
+  article is deleted.
+
+Each is a single statement. Commit and release consume the article's
+reservation row, so repeating either (a retried job, a second dead-letter
+hook) changes nothing.
+
+None of them touch the entitlement cache: the caller invalidates the user's
+entry after committing, or a concurrent lookup could cache the old usage
+again.
+"""
+
+import uuid
+
+from sqlalchemy import bindparam, delete, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.subscriptions.entitlements import current_month
+from src.subscriptions.model import CreditReservation, UsageRecord
+from src.subscriptions.schemas import PLAN_LIMITS
+
+
+async def reserve_credit(
+    db: AsyncSession, user_id: uuid.UUID, article_id: uuid.UUID, plan: str
+) -> bool:
+    """Reserve one analysis credit for ``article_id``.
+
+    Returns False (and changes nothing) when the plan's monthly limit is
+    used up. The caller commits, then invalidates the user's entitlement.
+    """
+    limit = PLAN_LIMITS.get(plan, PLAN_LIMITS["basic"])["summaries_per_month"]
+    if limit == 0:
+        return False
+    month = current_month()
+    usage = (
+        insert(UsageRecord)
+        .values(
+            id=uuid.uuid4(),
+            user_id=bindparam("user_id", user_id),
+            month=bindparam("month", month),
+            summaries_used=0,
+            summaries_reserved=1,
+            articles_saved=0,
+        )
+        .on_conflict_do_update(
+            constraint="uq_user_month",
+            set_={"summaries_reserved": UsageRecord.summaries_reserved + 1},
+            where=(
+                UsageRecord.summaries_used + UsageRecord.summaries_reserved
+                < bindparam("limit", limit)
+                if limit > 0
+                else None
+            ),
+        )
+        .returning(UsageRecord.user_id, UsageRecord.month)
+        .cte("usage")
+    )
+    reservation = (
+        insert(CreditReservation)
+        .from_select(
+            ["id", "user_id", "article_id", "month"],
+            select(
+                literal(uuid.uuid4()),
+                usage.c.user_id,
+                bindparam("article_id", article_id),
+                usage.c.month,
+            ),
+        )
+        .returning(CreditReservation.id)
+        .cte("reservation")
+    )
+    reserved = (await db.execute(select(reservation.c.id))).one_or_none()
+    return reserved is not None
+
+
+async def _settle_credit(
+    db: AsyncSession, article_id: uuid.UUID, *, used: bool
+) -> uuid.UUID | None:
+    reservation = (
+        delete(CreditReservation)
+        .where(CreditReservation.article_id == article_id)
+        .returning(CreditReservation.user_id, CreditReservation.month)
+        .cte("reservation")
+    )
+    values = {"summaries_reserved": UsageRecord.summaries_reserved - 1}
+    if used:
+        values["summaries_used"] = UsageRecord.summaries_used + 1
+    user_id: uuid.UUID | None = (
+        await db.execute(
+            update(UsageRecord)
+            .where(
+                UsageRecord.user_id == reservation.c.user_id,
+                UsageRecord.month == reservation.c.month,
+            )
+            .values(values)
+            .returning(UsageRecord.user_id)
+            .execution_options(synchronize_session=False)
+        )
+    ).scalar_one_or_none()
+    return user_id
+
+
+async def commit_credit(db: AsyncSession, article_id: uuid.UUID) -> uuid.UUID | None:
+    """Count the article's reserved credit as used.
+
+    Returns:
+        The user whose usage changed, for the caller to invalidate after it
+        commits; None when the article holds no reservation (already
+        settled, or dispatched before reservations existed).
+    """
+    return await _settle_credit(db, article_id, used=True)
+
+
+async def release_credit(db: AsyncSession, article_id: uuid.UUID) -> uuid.UUID | None:
+    """Give back the article's reserved credit, if it holds one.
+
+    Returns:
+        The user whose usage changed, as ``commit_credit`` does.
+    """
+    return await _settle_credit(db, article_id, used=False)
@@ -0,0 +1,202 @@
+"""Cached plan and monthly usage per user.
+
+The analysis credit check used to read the subscription and the month's
+usage row (creating either if missing) on every ``create_article``,
+``analyze_url`` and retry. ``get_entitlement`` reads both in one query on a
+miss and keeps the result in an in-process LRU with a short TTL, backed by
+Redis when ``REDIS_URL`` is configured.
+
+The credit operations in ``src.subscriptions.credits`` and Paddle webhooks
+invalidate the user's entry. Other API instances see a change when their
+short-lived local entry expires. A stale entry only affects the early
+``can_summarize`` check; reserving a credit always goes to the database.
+"""
+
+import json
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.lib.config import settings
+from src.lib.logging import get_logger
+from src.lib.redis_client import get_redis
+from src.lib.ttl_cache import TTLCache
+from src.subscriptions.model import Subscription, UsageRecord
+from src.subscriptions.schemas import PLAN_LIMITS, UsageResponse
+from src.users.model import User
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis_module
+
+logger = get_logger(__name__)
+
+
+def current_month() -> str:
+    return datetime.now(UTC).strftime("%Y-%m")
+
+
+@dataclass(frozen=True)
+class Entitlement:
+    """A user's plan and summaries used (or in flight) in ``month``."""
+
+    plan: str
+    status: str
+    month: str
+    summaries_used: int
+    summaries_reserved: int = 0
+
+    @property
+    def summaries_limit(self) -> int:
+        limits = PLAN_LIMITS.get(self.plan, PLAN_LIMITS["basic"])
+        return limits["summaries_per_month"]
+
+    @property
+    def can_summarize(self) -> bool:
+        limit = self.summaries_limit
+        return limit == -1 or self.summaries_used + self.summaries_reserved < limit
+
+    def to_usage(self) -> UsageResponse:
+        return UsageResponse(
+            plan=self.plan,
+            status=self.status,
+            summaries_used=self.summaries_used,
+            summaries_reserved=self.summaries_reserved,
+            summaries_limit=self.summaries_limit,
+            can_summarize=self.can_summarize,
+        )
+
+
+class EntitlementCache:
+    """In-process LRU + optional Redis cache of ``Entitlement`` by user."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        redis: "redis_module.Redis | None" = None,
+        redis_ttl_seconds: int = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._local: TTLCache[uuid.UUID, Entitlement] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock
+        )
+        self._redis = redis
+        self._redis_ttl_seconds = redis_ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    @staticmethod
+    def make_key(user_id: uuid.UUID) -> str:
+        return f"entitlement:{user_id}"
+
+    async def get(self, user_id: uuid.UUID, month: str) -> Entitlement | None:
+        """The cached entitlement for ``month``; a new month is a miss."""
+        entitlement = self._local.get(user_id)
+        if entitlement is None:
+            entitlement = await self._get_redis_entry(user_id)
+            if entitlement is not None:
+                self._local.set(user_id, entitlement)
+        if entitlement is None or entitlement.month != month:
+            return None
+        return entitlement
+
+    async def set(self, user_id: uuid.UUID, entitlement: Entitlement) -> None:
+        self._local.set(user_id, entitlement)
+        await self._set_redis_entry(user_id, entitlement)
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        self._local.pop(user_id)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(self.make_key(user_id))
+        except Exception:
+            logger.warning("Entitlement cache Redis delete failed", exc_info=True)
+
+    async def _get_redis_entry(self, user_id: uuid.UUID) -> Entitlement | None:
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(self.make_key(user_id))
+        except Exception:
+            logger.warning("Entitlement cache Redis read failed", exc_info=True)
+            return None
+        return Entitlement(**json.loads(raw)) if raw else None
+
+    async def _set_redis_entry(
+        self, user_id: uuid.UUID, entitlement: Entitlement
+    ) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                self.make_key(user_id),
+                json.dumps(asdict(entitlement)),
+                ex=self._redis_ttl_seconds,
+            )
+        except Exception:
+            logger.warning("Entitlement cache Redis write failed", exc_info=True)
+
+
+async def load_entitlement(db: AsyncSession, user_id: uuid.UUID) -> Entitlement:
+    """Read plan and this month's usage in one query (no rows are created)."""
+    month = current_month()
+    row = (
+        await db.execute(
+            select(
+                Subscription.plan,
+                Subscription.status,
+                UsageRecord.summaries_used,
+                UsageRecord.summaries_reserved,
+            )
+            .select_from(User)
+            .outerjoin(Subscription, Subscription.user_id == User.id)
+            .outerjoin(
+                UsageRecord,
+                and_(UsageRecord.user_id == User.id, UsageRecord.month == month),
+            )
+            .where(User.id == user_id)
+        )
+    ).one_or_none()
+    plan, status, used, reserved = row if row is not None else (None,) * 4
+    return Entitlement(
+        plan=plan or "basic",
+        status=status or "active",
+        month=month,
+        summaries_used=used or 0,
+        summaries_reserved=reserved or 0,
+    )
+
+
+async def get_entitlement(db: AsyncSession, user_id: uuid.UUID) -> Entitlement:
+    """The user's entitlement, from the cache or one query."""
+    cache = get_entitlement_cache()
+    entitlement = await cache.get(user_id, current_month())
+    if entitlement is None:
+        entitlement = await load_entitlement(db, user_id)
+        await cache.set(user_id, entitlement)
+    return entitlement
+
+
+_cache_instance: EntitlementCache | None = None
+
+
+def get_entitlement_cache() -> EntitlementCache:
+    """Get the process-wide entitlement cache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = EntitlementCache(
+            max_entries=settings.ENTITLEMENT_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.ENTITLEMENT_CACHE_TTL_SECONDS,
+            redis=get_redis(),
+            redis_ttl_seconds=settings.ENTITLEMENT_CACHE_REDIS_TTL_SECONDS,
+        )
+    return _cache_instance
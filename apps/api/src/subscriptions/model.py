@@ -61,6 +61,31 @@ class UsageRecord(UUIDMixin, TimestampMixin, Base):
     summaries_used: Mapped[int] = mapped_column(
         Integer, nullable=False, server_default=text("0")
     )
+    # Analyses dispatched but not yet finished (see src/subscriptions/credits.py)
+    summaries_reserved: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
     articles_saved: Mapped[int] = mapped_column(
         Integer, nullable=False, server_default=text("0")
     )
+
+
+class CreditReservation(UUIDMixin, TimestampMixin, Base):
+    """An analysis credit held by an article until its analysis finishes."""
+
+    __tablename__ = "credit_reservations"
+
+    user_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    article_id: Mapped[uuid_lib.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+    )
+    # The usage month charged, even if the analysis finishes in the next one
+    month: Mapped[str] = mapped_column(String(7), nullable=False)
@@ -9,6 +9,7 @@ from fastapi import APIRouter, HTTPException, Request, status
 from src.lib.config import settings
 from src.lib.dependencies import CurrentUser, DBSession
 from src.subscriptions import service
+from src.subscriptions.entitlements import get_entitlement_cache
 from src.subscriptions.paddle_verify import verify_paddle_signature
 from src.subscriptions.schemas import (
     CheckoutResponse,
@@ -207,9 +208,10 @@ async def paddle_webhook(
         ):
             cancel_at = datetime.fromisoformat(data["scheduled_change"]["effective_at"])
 
+        uid = uuid.UUID(user_id)
         await service.update_subscription_from_paddle(
             db=db,
-            user_id=uuid.UUID(user_id),
+            user_id=uid,
             paddle_subscription_id=paddle_sub_id,
             paddle_customer_id=paddle_customer_id,
             plan=plan,
@@ -218,6 +220,9 @@ async def paddle_webhook(
             current_period_end=period_end,
             cancel_at=cancel_at,
         )
+        # Commit before invalidating so the next lookup reads the new plan
+        await db.commit()
+        await get_entitlement_cache().invalidate(uid)
 
         logger.info(
             "Subscription updated from Paddle",
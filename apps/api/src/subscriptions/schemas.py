@@ -36,6 +36,8 @@ class UsageResponse(BaseModel):
     plan: str
     status: str
     summaries_used: int
+    # Analyses in flight; they count against the limit until they finish
+    summaries_reserved: int = 0
     summaries_limit: int
     can_summarize: bool
 
@@ -5,8 +5,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.lib.content_classifier import ContentType
+from src.subscriptions import entitlements
 from src.subscriptions.model import Subscription, UsageRecord
-from src.subscriptions.schemas import PLAN_LIMITS, UsageResponse
+from src.subscriptions.schemas import UsageResponse
 
 FREE_ALLOWED_CONTENT_TYPES = {
     ContentType.GENERAL_NEWS,
@@ -75,30 +76,9 @@ async def get_or_create_usage(
 async def get_usage_info(
     db: AsyncSession, user_id: uuid_lib.UUID | str
 ) -> UsageResponse:
-    """Get combined subscription + usage info for the user."""
-    subscription = await get_or_create_subscription(db, user_id)
-    usage = await get_or_create_usage(db, user_id)
-    limits = PLAN_LIMITS.get(subscription.plan, PLAN_LIMITS["basic"])
-
-    summaries_limit = limits["summaries_per_month"]
-    can_summarize = summaries_limit == -1 or usage.summaries_used < summaries_limit
-
-    return UsageResponse(
-        plan=subscription.plan,
-        status=subscription.status,
-        summaries_used=usage.summaries_used,
-        summaries_limit=summaries_limit,
-        can_summarize=can_summarize,
-    )
-
-
-async def increment_summary_usage(
-    db: AsyncSession, user_id: uuid_lib.UUID | str
-) -> None:
-    """Increment the summary usage counter for the current month."""
-    usage = await get_or_create_usage(db, user_id)
-    usage.summaries_used = usage.summaries_used + 1
-    await db.flush()
+    """Get combined subscription + usage info for the user (cached)."""
+    entitlement = await entitlements.get_entitlement(db, _normalize_user_id(user_id))
+    return entitlement.to_usage()
 
 
 async def check_can_summarize(db: AsyncSession, user_id: uuid_lib.UUID | str) -> bool:
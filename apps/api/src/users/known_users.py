@@ -0,0 +1,138 @@
+"""Users known to have a ``users`` row.
+
+Supabase JWT users are created on first sight, and the app used to look the
+row up on every request to find out. ``ensure_user`` asks ``KnownUsersCache``
+first (an in-process LRU with TTL and, when ``REDIS_URL`` is configured, a
+Redis key shared by all API instances); only a user neither tier knows costs
+a statement, a single ``INSERT ... ON CONFLICT (id) DO NOTHING``.
+
+Only a user whose row was inserted or already existed is cached. An email
+taken by another row is not a conflict on ``id``, so it raises instead of
+being remembered as known. Users are never deleted, so a cached entry can't
+point at a missing row.
+"""
+
+import time
+import uuid
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.lib.auth import CurrentUserInfo
+from src.lib.config import settings
+from src.lib.logging import get_logger
+from src.lib.redis_client import get_redis
+from src.lib.ttl_cache import TTLCache
+from src.users.model import User
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis_module
+
+logger = get_logger(__name__)
+
+
+class KnownUsersCache:
+    """In-process LRU + optional Redis set of user ids with a row."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        redis: "redis_module.Redis | None" = None,
+        redis_ttl_seconds: int = 86400,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._local: TTLCache[uuid.UUID, bool] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock
+        )
+        self._redis = redis
+        self._redis_ttl_seconds = redis_ttl_seconds
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    @staticmethod
+    def make_key(user_id: uuid.UUID) -> str:
+        return f"known-user:{user_id}"
+
+    async def contains(self, user_id: uuid.UUID) -> bool:
+        if self._local.get(user_id):
+            return True
+        if await self._get_redis_entry(user_id):
+            self._local.set(user_id, True)
+            return True
+        return False
+
+    async def add(self, user_id: uuid.UUID) -> None:
+        self._local.set(user_id, True)
+        await self._set_redis_entry(user_id)
+
+    async def _get_redis_entry(self, user_id: uuid.UUID) -> bool:
+        if self._redis is None:
+            return False
+        try:
+            return bool(await self._redis.exists(self.make_key(user_id)))
+        except Exception:
+            logger.warning("Known users Redis read failed", exc_info=True)
+            return False
+
+    async def _set_redis_entry(self, user_id: uuid.UUID) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(
+                self.make_key(user_id), b"1", ex=self._redis_ttl_seconds
+            )
+        except Exception:
+            logger.warning("Known users Redis write failed", exc_info=True)
+
+
+async def ensure_user(session: AsyncSession, user: CurrentUserInfo) -> bool:
+    """Create the user's row unless it is known to exist.
+
+    Commits ``session`` when it has to insert. Returns True when a row was
+    created. Raises ``IntegrityError`` when the user's email belongs to
+    another row; nothing is cached then.
+    """
+    uid = uuid.UUID(user.id)
+    cache = get_known_users_cache()
+    if await cache.contains(uid):
+        return False
+
+    # Only a row with this id is a conflict; any other violation raises
+    result = await session.execute(
+        insert(User)
+        .values(
+            id=uid,
+            email=user.email or f"{user.id}@supabase.user",
+            name=user.name,
+            image=user.image,
+            email_verified=user.email_verified,
+        )
+        .on_conflict_do_nothing(index_elements=[User.id])
+        .returning(User.id)
+    )
+    created = result.scalar_one_or_none() is not None
+    await session.commit()
+    # Inserted now, or skipped because the id exists: the row is there
+    await cache.add(uid)
+    return created
+
+
+_cache_instance: KnownUsersCache | None = None
+
+
+def get_known_users_cache() -> KnownUsersCache:
+    """Get the process-wide known users cache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = KnownUsersCache(
+            max_entries=settings.KNOWN_USERS_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.KNOWN_USERS_CACHE_TTL_SECONDS,
+            redis=get_redis(),
+            redis_ttl_seconds=settings.KNOWN_USERS_CACHE_REDIS_TTL_SECONDS,
+        )
+    return _cache_instance
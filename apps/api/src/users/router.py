@@ -2,11 +2,13 @@ import uuid
 from datetime import UTC, datetime
 from typing import Literal
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from src.lib.dependencies import CurrentUser, DBSession
+from src.users.known_users import ensure_user
 from src.users.model import User
 
 router = APIRouter()
@@ -28,23 +30,15 @@ class UpdateUserMeRequest(BaseModel):
 
 
 async def _get_or_create_user(db: DBSession, user: CurrentUser) -> User:
-    uid = uuid.UUID(user.id)
-    result = await db.execute(select(User).where(User.id == uid))
-    existing = result.scalar_one_or_none()
-    if existing is not None:
-        return existing
-
-    model = User(
-        id=uid,
-        email=user.email or f"{user.id}@supabase.user",
-        name=user.name,
-        image=user.image,
-        email_verified=user.email_verified,
-    )
-    db.add(model)
-    await db.commit()
-    await db.refresh(model)
-    return model
+    try:
+        await ensure_user(db, user)
+    except IntegrityError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="This email is already registered to another account",
+        ) from exc
+    result = await db.execute(select(User).where(User.id == uuid.UUID(user.id)))
+    return result.scalar_one()
 
 
 def _to_response(model: User) -> UserMeResponse:
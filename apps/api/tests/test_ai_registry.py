@@ -0,0 +1,51 @@
+import pytest
+
+from src.lib.ai import registry as registry_module
+from src.lib.ai.factory import create_ai_provider
+from src.lib.ai.registry import AIClientRegistry
+
+
+@pytest.fixture
+def configured(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(registry_module.settings, "OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(registry_module.settings, "AI_PROVIDER", "openai")
+    monkeypatch.setattr(registry_module, "_registry_instance", None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("configured")
+async def test_provider_and_client_are_shared() -> None:
+    registry = AIClientRegistry()
+
+    provider = registry.provider()
+
+    assert registry.provider("openai") is provider
+    assert provider._client is registry.openai_client()  # type: ignore[attr-defined]
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("configured")
+async def test_create_ai_provider_reuses_process_registry() -> None:
+    assert create_ai_provider() is create_ai_provider()
+
+    await registry_module.close_ai_registry()
+    assert registry_module._registry_instance is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("configured")
+async def test_aclose_drops_clients_so_they_can_be_reopened() -> None:
+    registry = AIClientRegistry()
+    client = registry.openai_client()
+
+    await registry.aclose()
+
+    assert client.is_closed()
+    assert registry.openai_client() is not client
+    await registry.aclose()
+
+
+def test_unknown_provider_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown AI provider"):
+        AIClientRegistry().provider("anthropic")
@@ -0,0 +1,100 @@
+import uuid
+from typing import Any, cast
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles import search, service
+
+
+def test_has_search_terms() -> None:
+    assert search.has_search_terms("타입스크립트")
+    assert search.has_search_terms("node.js")
+    assert not search.has_search_terms("  -- _ ")
+    assert search.to_tsquery("  --  ") is None
+
+
+def _compile(tsquery: Any) -> tuple[str, dict[str, Any]]:
+    compiled = search.matches(tsquery).compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def test_dotted_terms_are_split_by_the_document_parser() -> None:
+    tsquery = search.to_tsquery("Node.js streams")
+    assert tsquery is not None
+
+    sql, params = _compile(tsquery)
+
+    # The raw text goes to to_tsvector, which keeps node.js as one lexeme
+    assert "Node.js streams" in params.values()
+    assert "FROM unnest(to_tsvector(" in sql
+    assert "AS TSQUERY)" in sql
+    assert search.MAX_QUERY_TERMS in params.values()
+
+
+def test_capped_terms_are_the_first_ones_in_the_query() -> None:
+    tsquery = search.to_tsquery(" ".join(f"term{i}" for i in range(12)))
+    assert tsquery is not None
+
+    sql, _params = _compile(tsquery)
+
+    # unnest() yields lexemes alphabetically; order by first position instead
+    assert ".positions[" in sql.split("ORDER BY")[1].split("LIMIT")[0]
+
+
+def test_matches_compiles_to_gin_servable_predicate() -> None:
+    tsquery = search.to_tsquery("react")
+    assert tsquery is not None
+
+    sql, _params = _compile(tsquery)
+
+    assert sql.startswith("articles.search_vector @@ (SELECT")
+
+
+class _EmptyResult:
+    def all(self) -> list[Any]:
+        return []
+
+
+class _RecordingSession:
+    def __init__(self) -> None:
+        self.statements: list[Any] = []
+
+    async def execute(self, stmt: Any) -> _EmptyResult:
+        self.statements.append(stmt)
+        return _EmptyResult()
+
+
+async def test_ann_search_params_default_to_settings() -> None:
+    session = _RecordingSession()
+
+    await service.set_ann_search_params(
+        cast(AsyncSession, session), ef_search=None, probes=3
+    )
+
+    (stmt,) = session.statements
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert set(params.values()) >= {
+        "hnsw.ef_search",
+        str(service.settings.VECTOR_SEARCH_EF_SEARCH),
+        "ivfflat.probes",
+        "3",
+    }
+
+
+async def test_ann_search_orders_by_distance_only_and_skips_count() -> None:
+    session = _RecordingSession()
+
+    page = await service.search_articles_semantic(
+        cast(AsyncSession, session),
+        str(uuid.uuid4()),
+        [0.1] * 768,
+        count_mode="none",
+        mode="ann",
+    )
+
+    _params, query = session.statements
+    order_by = str(query.compile(dialect=postgresql.dialect())).split("ORDER BY")[1]
+    assert "<=>" in order_by
+    assert "articles.id" not in order_by
+    assert page.meta.total is None
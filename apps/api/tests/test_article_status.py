@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from src.articles import router
+from src.articles.status_notifier import ArticleStatusNotifier
+from src.lib.auth import CurrentUserInfo
+
+
+@pytest.mark.asyncio
+async def test_notifier_wakes_waiters() -> None:
+    notifier = ArticleStatusNotifier()
+    article_id = uuid.uuid4()
+
+    waiter = asyncio.create_task(notifier.wait(article_id, 5))
+    await asyncio.sleep(0)
+    assert notifier.waiter_count(article_id) == 1
+
+    notifier.notify(article_id)
+
+    assert await waiter is True
+    assert notifier.waiter_count(article_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_notifier_wait_times_out() -> None:
+    notifier = ArticleStatusNotifier()
+    article_id = uuid.uuid4()
+
+    assert await notifier.wait(article_id, 0.01) is False
+    assert notifier.waiter_count(article_id) == 0
+
+
+@pytest.fixture
+def notifier(monkeypatch: pytest.MonkeyPatch) -> ArticleStatusNotifier:
+    instance = ArticleStatusNotifier()
+    monkeypatch.setattr(router, "get_status_notifier", lambda: instance)
+    return instance
+
+
+@pytest.mark.asyncio
+async def test_status_long_poll_returns_when_analysis_settles(
+    monkeypatch: pytest.MonkeyPatch, notifier: ArticleStatusNotifier
+) -> None:
+    article_id = uuid.uuid4()
+    statuses = ["processing", "analyzed"]
+
+    async def _fake_status(article_id_arg: uuid.UUID, user_id: uuid.UUID) -> str:
+        if statuses[0] == "processing":
+            # Analysis finishes shortly after the client starts waiting
+            asyncio.get_running_loop().call_later(0.01, notifier.notify, article_id)
+        return statuses.pop(0)
+
+    monkeypatch.setattr(router.service, "get_article_status", _fake_status)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    response = await router.get_article_status(
+        article_id, user=CurrentUserInfo(id=str(uuid.uuid4())), wait=10
+    )
+
+    assert loop.time() - started < router.ARTICLE_STATUS_RECHECK_SECONDS
+
+    assert response.status == "analyzed"
+    assert response.settled is True
+
+
+@pytest.mark.asyncio
+async def test_status_without_wait_does_not_block(
+    monkeypatch: pytest.MonkeyPatch, notifier: ArticleStatusNotifier
+) -> None:
+    async def _fake_status(article_id: uuid.UUID, user_id: uuid.UUID) -> str:
+        return "processing"
+
+    monkeypatch.setattr(router.service, "get_article_status", _fake_status)
+
+    response = await router.get_article_status(
+        uuid.uuid4(), user=CurrentUserInfo(id=str(uuid.uuid4())), wait=0
+    )
+
+    assert response.status == "processing"
+    assert response.settled is False
+
+
+@pytest.mark.asyncio
+async def test_status_of_unknown_article_is_404(
+    monkeypatch: pytest.MonkeyPatch, notifier: ArticleStatusNotifier
+) -> None:
+    async def _fake_status(article_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        return None
+
+    monkeypatch.setattr(router.service, "get_article_status", _fake_status)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await router.get_article_status(
+            uuid.uuid4(), user=CurrentUserInfo(id=str(uuid.uuid4())), wait=5
+        )
+
+    assert exc_info.value.status_code == 404
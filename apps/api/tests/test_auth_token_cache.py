@@ -0,0 +1,69 @@
+import time
+import uuid
+
+import pytest
+from starlette.requests import Request
+
+from src.lib import auth
+from src.lib.auth import AuthTokenCache, CurrentUserInfo
+
+
+def _request(token: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+    )
+
+
+async def test_get_current_user_decrypts_each_token_once(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        auth,
+        "_token_cache_instance",
+        AuthTokenCache(max_entries=10, ttl_seconds=60),
+    )
+    decode_calls = 0
+    real_decode = auth.decode_token
+
+    def counting_decode(token: str) -> auth.TokenPayload:
+        nonlocal decode_calls
+        decode_calls += 1
+        return real_decode(token)
+
+    monkeypatch.setattr(auth, "decode_token", counting_decode)
+    user_id = str(uuid.uuid4())
+    token = auth.create_access_token(user_id)
+
+    for _ in range(3):
+        user = await auth.get_current_user(_request(token))
+        assert user.id == user_id
+
+    assert decode_calls == 1
+
+
+def test_token_cache_entries_expire_with_the_token() -> None:
+    now = [1000.0]
+    cache = AuthTokenCache(max_entries=10, ttl_seconds=300, clock=lambda: now[0])
+    user = CurrentUserInfo(id=str(uuid.uuid4()))
+
+    cache.set("token", user, exp=1010.0)
+    cache.set("expired", user, exp=999.0)
+
+    assert cache.get("token") is user
+    assert cache.get("expired") is None
+    now[0] = 1011.0
+    assert cache.get("token") is None
+
+
+def test_token_cache_is_bounded() -> None:
+    cache = AuthTokenCache(max_entries=2, ttl_seconds=60)
+    user = CurrentUserInfo(id=str(uuid.uuid4()))
+
+    for token in ("a", "b", "c"):
+        cache.set(token, user, exp=time.time() + 60)
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
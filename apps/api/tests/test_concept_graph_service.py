@@ -1,4 +1,5 @@
-from src.articles import service
+from src.articles import concept_graph, concept_normalization, service
+from src.articles.concept_index import ConceptMatchIndex
 
 
 def test_normalize_concept_applies_alias_mapping() -> None:
@@ -17,3 +18,64 @@ def test_resolve_concept_candidates_reuses_similar_existing_norm() -> None:
     assert root_label == "typescript"
     assert root_norm == "typescript"
     assert concept_labels == ["typescript", "fastapi"]
+
+
+def test_extract_graph_concepts_puts_root_first_and_limits() -> None:
+    pairs = service.extract_graph_concepts(
+        ["React.js", "  Type   Script ", "Rust"],
+        root_concept_label="Next.js",
+        root_concept_norm=None,
+    )
+
+    assert pairs == [("Next.js", "nextjs"), ("React.js", "react")]
+
+
+def test_resolve_graph_concepts_snaps_to_existing_nodes() -> None:
+    nodes = ConceptMatchIndex(["kubernetes"])
+
+    resolved = concept_graph.resolve_graph_concepts(
+        [("Kubernete", "kubernete"), ("K8s", "kubernetes"), ("Rust", "rust")],
+        nodes,
+    )
+
+    assert resolved == [("Kubernete", "kubernetes"), ("Rust", "rust")]
+    # The shared vocabulary is never modified
+    assert "rust" not in nodes
+
+
+def test_resolve_graph_concepts_snaps_new_norms_within_an_article() -> None:
+    resolved = concept_graph.resolve_graph_concepts(
+        [("Kubernetes", "kubernetes"), ("Kubernete", "kubernete")],
+        ConceptMatchIndex(),
+    )
+
+    assert resolved == [("Kubernetes", "kubernetes")]
+
+
+def test_normalize_concept_is_memoized() -> None:
+    concept_normalization.normalize_concept.cache_clear()
+
+    for _ in range(3):
+        assert concept_normalization.normalize_concept("Node.js (runtime)") == "nodejs"
+
+    stats = concept_normalization.concept_normalization_stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+    assert stats.hit_rate == 2 / 3
+
+
+def test_normalize_concepts_keeps_positions() -> None:
+    assert concept_normalization.normalize_concepts(
+        ["  React.js ", 3, "[draft] Rust 입문"]
+    ) == ["react", "", "rust"]
+    assert concept_normalization.normalize_concepts(None) == []
+
+
+def test_extract_graph_concepts_uses_stored_norms() -> None:
+    pairs = service.extract_graph_concepts(
+        ["Rust Lang"],
+        root_concept_label=None,
+        root_concept_norm=None,
+        concept_norms=["rust"],
+    )
+
+    assert pairs == [("Rust Lang", "rust")]
@@ -0,0 +1,72 @@
+import difflib
+import random
+
+from src.articles.concept_index import ConceptMatchIndex
+
+
+def _full_scan(target: str, norms: list[str], threshold: float) -> str:
+    # What service._resolve_similar_concept used to do
+    if target in norms:
+        return target
+    matcher = difflib.SequenceMatcher(None, target, "")
+    best_ratio = 0.0
+    best_match = None
+    for existing in norms:
+        matcher.set_seq2(existing)
+        ratio = matcher.ratio()
+        if ratio > best_ratio:
+            best_ratio = ratio
+            best_match = existing
+    if best_ratio >= threshold and best_match:
+        return best_match
+    return target
+
+
+def _mutate(rng: random.Random, value: str, alphabet: str) -> str:
+    chars = list(value)
+    for _ in range(rng.randint(0, 3)):
+        op = rng.choice(("insert", "delete", "replace"))
+        position = rng.randint(0, max(len(chars) - 1, 0))
+        if op == "insert" or not chars:
+            chars.insert(position, rng.choice(alphabet))
+        elif op == "delete":
+            del chars[position]
+        else:
+            chars[position] = rng.choice(alphabet)
+    return "".join(chars)
+
+
+def test_match_index_agrees_with_full_scan() -> None:
+    rng = random.Random(7)  # noqa: S311
+    alphabet = "abcdefghij "
+    norms = list(
+        dict.fromkeys(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(2, 30)))
+            for _ in range(250)
+        )
+    )
+    index = ConceptMatchIndex(norms)
+
+    for _ in range(100):
+        target = _mutate(rng, rng.choice(norms), alphabet)
+        # 0.92 and 0.85 use trigram blocking, 0.8 falls back to length buckets
+        for threshold in (0.92, 0.85, 0.8):
+            assert index.resolve(target, threshold) == _full_scan(
+                target, norms, threshold
+            )
+
+
+def test_match_index_prefers_earliest_of_equally_similar_norms() -> None:
+    index = ConceptMatchIndex(["typescripts", "typescriptx"])
+
+    assert index.resolve("typescript") == "typescripts"
+
+
+def test_match_index_discard_removes_norm() -> None:
+    index = ConceptMatchIndex(["typescript", "react"])
+    index.discard("typescript")
+
+    assert "typescript" not in index
+    assert index.best_match("typescrip", 0.9) is None
+    assert len(index) == 1
+    assert index.candidates("typescripts", 0.92) == []
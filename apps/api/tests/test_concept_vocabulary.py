@@ -0,0 +1,77 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles import service
+from src.articles.concept_index import ConceptMatchIndex
+from src.articles.concept_vocabulary import ConceptVocabularyCache
+
+
+def test_resolve_concept_candidates_accepts_match_index() -> None:
+    index = ConceptMatchIndex(["typescript"])
+
+    _label, root_norm, concept_labels = service.resolve_concept_candidates(
+        root_concept_label="Type Script",
+        concepts=["FastAPI", "fast api"],
+        existing_norms=index,
+        max_candidates=3,
+    )
+
+    assert root_norm == "typescript"
+    assert concept_labels == ["typescript", "fastapi"]
+    # Norms picked for this summary don't leak into the shared index
+    assert "fastapi" not in index
+
+
+class _FakeResult:
+    def __init__(self, rows: list[tuple[str, int, datetime]]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[tuple[str, int, datetime]]:
+        return self._rows
+
+
+class _FakeSession:
+    def __init__(self) -> None:
+        self.responses: list[list[tuple[str, int, datetime]]] = []
+        self.statements: list[Any] = []
+
+    async def execute(self, stmt: Any) -> _FakeResult:
+        self.statements.append(stmt)
+        return _FakeResult(self.responses.pop(0))
+
+
+async def test_vocabulary_cache_applies_incremental_changes() -> None:
+    cache = ConceptVocabularyCache(max_users=10)
+    session = _FakeSession()
+    db = cast(AsyncSession, session)
+    user_id = uuid.uuid4()
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+    session.responses.append([("react", 2, t0), ("rust", 1, t0)])
+    index = await cache.get(db, user_id)
+    assert "react" in index and "rust" in index
+
+    session.responses.append([("rust", 0, t0 + timedelta(seconds=5)), ("go", 1, t0)])
+    index = await cache.get(db, user_id)
+    assert "rust" not in index
+    assert "go" in index
+
+    # The refresh only asks for rows changed since the last sync
+    assert "updated_at >" in str(session.statements[1])
+    assert "updated_at >" not in str(session.statements[0])
+
+
+async def test_vocabulary_cache_evicts_least_recent_user() -> None:
+    cache = ConceptVocabularyCache(max_users=1)
+    session = _FakeSession()
+    db = cast(AsyncSession, session)
+    t0 = datetime(2026, 1, 1, tzinfo=UTC)
+
+    session.responses.extend([[("a", 1, t0)], [("b", 1, t0)]])
+    await cache.get(db, uuid.uuid4())
+    await cache.get(db, uuid.uuid4())
+
+    assert len(cache) == 1
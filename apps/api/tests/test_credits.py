@@ -0,0 +1,179 @@
+import asyncio
+import uuid
+from typing import Any
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from src.subscriptions import credits, entitlements
+from src.subscriptions.entitlements import Entitlement, EntitlementCache
+
+
+class _Result:
+    def __init__(self, row: Any) -> None:
+        self._row = row
+
+    def one_or_none(self) -> Any:
+        return self._row
+
+    def scalar_one_or_none(self) -> Any:
+        return self._row
+
+
+class _FakeSession:
+    def __init__(self, *rows: Any) -> None:
+        self._rows = list(rows)
+        self.statements: list[str] = []
+
+    async def execute(self, stmt: Any) -> _Result:
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return _Result(self._rows.pop(0))
+
+
+class _LedgerSession:
+    """Applies the credit statements to in-memory usage and reservations.
+
+    Reads each statement's bound parameters the way Postgres would use them:
+    the reserve upsert is skipped when ``limit`` is reached, and settling
+    consumes the article's reservation.
+    """
+
+    def __init__(self) -> None:
+        # (user_id, month) -> [summaries_used, summaries_reserved]
+        self.usage: dict[tuple[uuid.UUID, str], list[int]] = {}
+        self.reservations: dict[uuid.UUID, tuple[uuid.UUID, str]] = {}
+
+    async def execute(self, stmt: Any) -> _Result:
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        if "article_id" in params:
+            return _Result(self._reserve(params))
+        return _Result(self._settle(params))
+
+    def _reserve(self, params: dict[str, Any]) -> Any:
+        article_id = params["article_id"]
+        if article_id in self.reservations:
+            raise IntegrityError("reserve", {}, Exception("uq_article_id"))
+        key = (params["user_id"], params["month"])
+        counts = self.usage.setdefault(key, [0, 0])
+        limit = params.get("limit")
+        if limit is not None and sum(counts) >= limit:
+            return None
+        counts[1] += 1
+        self.reservations[article_id] = key
+        return (uuid.uuid4(),)
+
+    def _settle(self, params: dict[str, Any]) -> Any:
+        key = self.reservations.pop(params["article_id_1"], None)
+        if key is None:
+            return None
+        counts = self.usage[key]
+        counts[1] -= 1
+        if "summaries_used_1" in params:
+            counts[0] += 1
+        return key[0]
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> EntitlementCache:
+    cache = EntitlementCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(entitlements, "_cache_instance", cache)
+    monkeypatch.setattr(credits, "current_month", lambda: "2026-10")
+    return cache
+
+
+async def test_reserve_is_one_conditional_upsert_and_insert(
+    cache: EntitlementCache,
+) -> None:
+    user_id = uuid.uuid4()
+    await cache.set(user_id, Entitlement("basic", "active", "2026-10", 3))
+    db = _FakeSession((uuid.uuid4(),))
+
+    assert await credits.reserve_credit(db, user_id, uuid.uuid4(), "basic")  # type: ignore[arg-type]
+
+    [sql] = db.statements
+    assert "ON CONFLICT ON CONSTRAINT uq_user_month DO UPDATE" in sql
+    assert (
+        "WHERE usage_records.summaries_used + usage_records.summaries_reserved <" in sql
+    )
+    assert "INSERT INTO credit_reservations" in sql
+    # Invalidated by the caller once the reservation is committed
+    assert await cache.get(user_id, "2026-10") is not None
+
+
+async def test_reserve_fails_when_the_limit_is_used_up(
+    cache: EntitlementCache,
+) -> None:
+    user_id = uuid.uuid4()
+    await cache.set(user_id, Entitlement("basic", "active", "2026-10", 20))
+    db = _FakeSession(None)
+
+    assert not await credits.reserve_credit(db, user_id, uuid.uuid4(), "basic")  # type: ignore[arg-type]
+    assert await cache.get(user_id, "2026-10") is not None
+
+
+async def test_unlimited_plans_reserve_without_a_guard(
+    cache: EntitlementCache,
+) -> None:
+    db = _FakeSession((uuid.uuid4(),))
+
+    assert await credits.reserve_credit(db, uuid.uuid4(), uuid.uuid4(), "pro")  # type: ignore[arg-type]
+
+    assert "summaries_reserved <" not in db.statements[0]
+
+
+async def test_commit_and_release_settle_the_reservation_once(
+    cache: EntitlementCache,
+) -> None:
+    user_id = uuid.uuid4()
+    await cache.set(user_id, Entitlement("basic", "active", "2026-10", 3, 1))
+    db = _FakeSession(user_id, None)
+
+    assert await credits.commit_credit(db, uuid.uuid4()) == user_id  # type: ignore[arg-type]
+    assert await credits.release_credit(db, uuid.uuid4()) is None  # type: ignore[arg-type]
+
+    committed, released = db.statements
+    assert "DELETE FROM credit_reservations" in committed
+    assert "summaries_used=(usage_records.summaries_used +" in committed
+    assert "summaries_used" not in released.split("SET", 1)[1].split("FROM")[0]
+    assert await cache.get(user_id, "2026-10") is not None
+
+
+async def test_parallel_reservations_stop_at_the_plan_limit(
+    cache: EntitlementCache,
+) -> None:
+    user_id = uuid.uuid4()
+    db = _LedgerSession()
+    article_ids = [uuid.uuid4() for _ in range(300)]
+
+    results = await asyncio.gather(
+        *(
+            credits.reserve_credit(db, user_id, article_id, "basic")  # type: ignore[arg-type]
+            for article_id in article_ids
+        )
+    )
+
+    assert sum(results) == 20
+    assert db.usage[(user_id, "2026-10")] == [0, 20]
+
+
+async def test_commit_and_release_free_the_reservation(
+    cache: EntitlementCache,
+) -> None:
+    user_id = uuid.uuid4()
+    db = _LedgerSession()
+    first, second, third = (uuid.uuid4() for _ in range(3))
+    for article_id in (first, second):
+        assert await credits.reserve_credit(db, user_id, article_id, "basic")  # type: ignore[arg-type]
+
+    assert await credits.commit_credit(db, first)  # type: ignore[arg-type]
+    assert not await credits.commit_credit(db, first)  # type: ignore[arg-type]
+    assert await credits.release_credit(db, second)  # type: ignore[arg-type]
+    assert not await credits.release_credit(db, third)  # type: ignore[arg-type]
+
+    assert db.usage[(user_id, "2026-10")] == [1, 0]
+    assert db.reservations == {}
+    # A released article can reserve again; a reserved one can't twice
+    assert await credits.reserve_credit(db, user_id, second, "basic")  # type: ignore[arg-type]
+    with pytest.raises(IntegrityError):
+        await credits.reserve_credit(db, user_id, second, "basic")  # type: ignore[arg-type]
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from src.lib.ai.embedding_cache import EmbeddingCache, normalize_query_text
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Embedder:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def __call__(self, text: str) -> list[float]:
+        self.calls.append(text)
+        await asyncio.sleep(0)
+        return [float(len(text)), 0.5]
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int) -> None:
+        self.store[key] = value
+
+
+def test_normalize_query_text_collapses_case_and_whitespace() -> None:
+    assert normalize_query_text("  React   HOOKS ") == "react hooks"
+    assert normalize_query_text("\uff21\uff22\uff23") == "abc"
+
+
+def test_make_key_is_scoped_by_provider_and_model() -> None:
+    key = EmbeddingCache.make_key("gemini", "m1", "React")
+
+    assert key == EmbeddingCache.make_key("gemini", "m1", " react ")
+    assert key != EmbeddingCache.make_key("openai", "m1", "React")
+    assert key != EmbeddingCache.make_key("gemini", "m2", "React")
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_hits_local_tier() -> None:
+    cache = EmbeddingCache()
+    embedder = _Embedder()
+
+    first = await cache.get_or_compute(
+        provider="gemini", model="m", text="react", compute=embedder
+    )
+    second = await cache.get_or_compute(
+        provider="gemini", model="m", text="React ", compute=embedder
+    )
+
+    assert first == second
+    assert embedder.calls == ["react"]
+    assert cache.stats.local_hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.hit_rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl() -> None:
+    clock = _Clock()
+    cache = EmbeddingCache(ttl_seconds=10, clock=clock)
+    embedder = _Embedder()
+
+    await cache.get_or_compute(provider="p", model="m", text="q", compute=embedder)
+    clock.now = 11
+    await cache.get_or_compute(provider="p", model="m", text="q", compute=embedder)
+
+    assert len(embedder.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used() -> None:
+    cache = EmbeddingCache(max_entries=2)
+    embedder = _Embedder()
+
+    for text in ("a", "b", "a", "c", "a", "b"):
+        await cache.get_or_compute(provider="p", model="m", text=text, compute=embedder)
+
+    assert embedder.calls == ["a", "b", "c", "b"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_provider_call() -> None:
+    cache = EmbeddingCache()
+    embedder = _Embedder()
+
+    results = await asyncio.gather(
+        *(
+            cache.get_or_compute(provider="p", model="m", text="q", compute=embedder)
+            for _ in range(5)
+        )
+    )
+
+    assert embedder.calls == ["q"]
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_between_instances() -> None:
+    redis = _FakeRedis()
+    embedder = _Embedder()
+    first = EmbeddingCache(redis=redis)  # type: ignore[arg-type]
+    second = EmbeddingCache(redis=redis)  # type: ignore[arg-type]
+
+    vector = await first.get_or_compute(
+        provider="p", model="m", text="q", compute=embedder
+    )
+    shared = await second.get_or_compute(
+        provider="p", model="m", text="q", compute=embedder
+    )
+
+    assert shared == vector
+    assert embedder.calls == ["q"]
+    assert second.stats.redis_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_compute_is_not_cached() -> None:
+    cache = EmbeddingCache()
+
+    async def _boom(_text: str) -> list[float]:
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute(provider="p", model="m", text="q", compute=_boom)
+
+    embedder = _Embedder()
+    await cache.get_or_compute(provider="p", model="m", text="q", compute=embedder)
+    assert embedder.calls == ["q"]
@@ -0,0 +1,78 @@
+import uuid
+from typing import Any
+
+import pytest
+
+from src.subscriptions import entitlements
+from src.subscriptions.entitlements import Entitlement, EntitlementCache
+
+
+class _Result:
+    def __init__(self, row: Any) -> None:
+        self._row = row
+
+    def one_or_none(self) -> Any:
+        return self._row
+
+    def scalar_one(self) -> Any:
+        return self._row
+
+
+class _FakeSession:
+    def __init__(self, *rows: Any) -> None:
+        self._rows = list(rows)
+        self.statements: list[Any] = []
+
+    async def execute(self, stmt: Any) -> _Result:
+        self.statements.append(stmt)
+        return _Result(self._rows.pop(0))
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> EntitlementCache:
+    cache = EntitlementCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(entitlements, "_cache_instance", cache)
+    monkeypatch.setattr(entitlements, "current_month", lambda: "2026-10")
+    return cache
+
+
+async def test_get_entitlement_reads_once_then_serves_the_cache(
+    cache: EntitlementCache,
+) -> None:
+    user_id = uuid.uuid4()
+    db = _FakeSession(("pro", "active", 3, 1))
+
+    for _ in range(3):
+        entitlement = await entitlements.get_entitlement(db, user_id)  # type: ignore[arg-type]
+
+    assert entitlement == Entitlement("pro", "active", "2026-10", 3, 1)
+    assert entitlement.to_usage().summaries_limit == -1
+    assert len(db.statements) == 1
+
+
+async def test_missing_rows_default_to_an_unused_basic_plan(
+    cache: EntitlementCache,
+) -> None:
+    db = _FakeSession(None)
+
+    usage = (await entitlements.get_entitlement(db, uuid.uuid4())).to_usage()  # type: ignore[arg-type]
+
+    assert (usage.plan, usage.summaries_used, usage.can_summarize) == ("basic", 0, True)
+
+
+def test_reserved_credits_count_against_the_limit() -> None:
+    entitlement = Entitlement("basic", "active", "2026-10", 15, summaries_reserved=5)
+
+    assert not entitlement.can_summarize
+    assert entitlement.to_usage().summaries_reserved == 5
+
+
+async def test_cached_entitlements_expire_with_the_month_and_on_invalidate() -> None:
+    cache = EntitlementCache(max_entries=10, ttl_seconds=60)
+    user_id = uuid.uuid4()
+    await cache.set(user_id, Entitlement("basic", "active", "2026-09", 20))
+
+    assert await cache.get(user_id, "2026-10") is None
+    assert await cache.get(user_id, "2026-09") is not None
+    await cache.invalidate(user_id)
+    assert await cache.get(user_id, "2026-09") is None
@@ -0,0 +1,110 @@
+import math
+import uuid
+from typing import Any, cast
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles.graph_layout import (
+    layout_graph,
+    read_graph_layout,
+    update_graph_layout,
+)
+from src.articles.schemas import ConceptGraphEdge, ConceptGraphNode
+
+
+def _star(concept: str, articles: int) -> tuple[list[str], list[ConceptGraphEdge]]:
+    article_ids = [f"article:{concept}-{i}" for i in range(articles)]
+    edges = [
+        ConceptGraphEdge(source=f"concept:{concept}", target=article_id, weight=10)
+        for article_id in article_ids
+    ]
+    return [f"concept:{concept}", *article_ids], edges
+
+
+def test_layout_graph_is_deterministic() -> None:
+    rust_ids, rust_edges = _star("rust", 6)
+    go_ids, go_edges = _star("go", 6)
+    node_ids = rust_ids + go_ids
+    edges = rust_edges + go_edges
+
+    first = layout_graph(node_ids, edges)
+
+    assert first == layout_graph(node_ids, edges)
+    assert set(first) == set(node_ids)
+
+
+def test_layout_graph_keeps_known_positions_and_places_new_node_nearby() -> None:
+    rust_ids, rust_edges = _star("rust", 6)
+    go_ids, go_edges = _star("go", 6)
+    previous = layout_graph(rust_ids + go_ids, rust_edges + go_edges)
+
+    new_edge = ConceptGraphEdge(source="concept:go", target="article:new", weight=10)
+    positions = layout_graph(
+        [*rust_ids, *go_ids, "article:new"],
+        [*rust_edges, *go_edges, new_edge],
+        previous,
+    )
+
+    assert {node_id: positions[node_id] for node_id in previous} == previous
+    new = positions["article:new"]
+    assert math.dist(new, positions["concept:go"]) < math.dist(
+        new, positions["concept:rust"]
+    )
+
+
+def test_layout_graph_handles_isolated_nodes() -> None:
+    positions = layout_graph(["concept:a", "concept:b"], [])
+
+    assert positions["concept:a"] != positions["concept:b"]
+    assert layout_graph([], []) == {}
+
+
+class _Result:
+    def __init__(self, value: Any) -> None:
+        self._value = value
+
+    def scalar_one_or_none(self) -> Any:
+        return self._value
+
+
+class _LayoutSession:
+    """Serves stored positions and records the layouts written."""
+
+    def __init__(self, positions: dict[str, list[float]] | None) -> None:
+        self.positions = positions
+        self.writes = 0
+
+    async def execute(self, stmt: Any) -> _Result:
+        if stmt.is_insert:
+            self.writes += 1
+            self.positions = stmt.compile().params["positions"]
+        return _Result(self.positions)
+
+
+def _nodes(*node_ids: str) -> list[ConceptGraphNode]:
+    return [
+        ConceptGraphNode(id=node_id, label=node_id, value=1, kind="concept")
+        for node_id in node_ids
+    ]
+
+
+async def test_read_graph_layout_never_computes_positions() -> None:
+    db = _LayoutSession({"concept:a": [1.0, 2.0]})
+    nodes = _nodes("concept:a", "concept:b")
+
+    await read_graph_layout(cast(AsyncSession, db), uuid.uuid4(), nodes)
+
+    assert (nodes[0].x, nodes[0].y) == (1.0, 2.0)
+    assert (nodes[1].x, nodes[1].y) == (None, None)
+    assert db.writes == 0
+
+
+async def test_update_graph_layout_only_stores_when_nodes_are_new() -> None:
+    db = _LayoutSession(None)
+    user_id = uuid.uuid4()
+    nodes = _nodes("concept:a", "concept:b")
+
+    assert await update_graph_layout(cast(AsyncSession, db), user_id, nodes, [])
+    assert not await update_graph_layout(cast(AsyncSession, db), user_id, nodes, [])
+    assert db.writes == 1
+    assert set(db.positions or {}) == {"concept:a", "concept:b"}
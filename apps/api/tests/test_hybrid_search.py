@@ -0,0 +1,98 @@
+import uuid
+from typing import Any, cast
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles import hybrid_search
+from src.articles.hybrid_search import SearchRankingCache, fuse_rankings
+
+
+def test_fuse_rankings_prefers_articles_found_by_both_searches() -> None:
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+
+    fused = fuse_rankings([[a, b], [c, b]], {}, set())
+
+    assert fused[0][0] == b
+    assert {article_id for article_id, _score in fused} == {a, b, c}
+
+
+def test_fuse_rankings_reranks_by_concept_overlap() -> None:
+    a, b = uuid.uuid4(), uuid.uuid4()
+
+    fused = fuse_rankings(
+        [[a, b]],
+        {a: {"python"}, b: {"rust", "tokio"}},
+        hybrid_search.query_concepts("Rust async"),
+    )
+
+    assert [article_id for article_id, _score in fused] == [b, a]
+
+
+def test_query_concepts_normalizes_query_and_terms() -> None:
+    assert hybrid_search.query_concepts("React.js hooks") >= {"react", "hooks"}
+
+
+def test_ranking_cache_expires_entries() -> None:
+    now = [0.0]
+    cache = SearchRankingCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    key = (uuid.uuid4(), "rust", None, None)
+    cache.set(key, [(uuid.uuid4(), 1.0)])
+
+    assert cache.get(key) is not None
+    now[0] = 11.0
+    assert cache.get(key) is None
+
+
+async def test_rank_articles_serves_lexical_results_when_vector_leg_fails(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    article_id = uuid.uuid4()
+
+    async def lexical(*_args: Any) -> list[uuid.UUID]:
+        return [article_id]
+
+    async def vector(*_args: Any) -> list[uuid.UUID]:
+        raise RuntimeError("embedding provider down")
+
+    async def concepts(*_args: Any) -> dict[uuid.UUID, set[str]]:
+        return {}
+
+    monkeypatch.setattr(hybrid_search, "_lexical_candidates", lexical)
+    monkeypatch.setattr(hybrid_search, "_vector_candidates", vector)
+    monkeypatch.setattr(hybrid_search, "_article_concepts", concepts)
+
+    ranking, complete = await hybrid_search.rank_articles(
+        cast(AsyncSession, object()), cast(Any, object()), uuid.uuid4(), "rust"
+    )
+
+    assert [ranked_id for ranked_id, _score in ranking] == [article_id]
+    assert not complete
+
+
+@pytest.mark.parametrize(("complete", "rankings_built"), [(True, 1), (False, 2)])
+async def test_search_caches_only_rankings_from_both_legs(
+    monkeypatch: pytest.MonkeyPatch, complete: bool, rankings_built: int
+) -> None:
+    calls = 0
+
+    async def rank(*_args: Any) -> tuple[hybrid_search.Ranking, bool]:
+        nonlocal calls
+        calls += 1
+        return [], complete
+
+    monkeypatch.setattr(hybrid_search, "rank_articles", rank)
+    monkeypatch.setattr(
+        hybrid_search,
+        "_cache_instance",
+        SearchRankingCache(max_entries=10, ttl_seconds=60),
+    )
+    user_id = str(uuid.uuid4())
+
+    for _ in range(2):
+        page = await hybrid_search.search_articles_hybrid(
+            cast(AsyncSession, object()), cast(Any, object()), user_id, "rust"
+        )
+        assert page.data == []
+
+    assert calls == rankings_built
@@ -0,0 +1,221 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from src.articles import analysis
+from src.jobs import queue
+from src.jobs.consumer import JobConsumer, JobType
+from src.jobs.queue import ClaimedJob
+
+
+class _FakeSession:
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+
+class _FakeQueue:
+    """Records queue calls made by the consumer."""
+
+    def __init__(self, pending: list[ClaimedJob] | None = None) -> None:
+        self.pending = list(pending or [])
+        self.completed: list[uuid.UUID] = []
+        self.failed: list[tuple[uuid.UUID, str]] = []
+        self.dead: list[uuid.UUID] = []
+
+    async def claim(self, _db: object, kinds: list[str], limit: int, **_kw: Any):
+        claimed = [job for job in self.pending if job.kind in kinds][:limit]
+        for job in claimed:
+            self.pending.remove(job)
+        return claimed
+
+    async def complete(self, _db: object, job: ClaimedJob) -> bool:
+        self.completed.append(job.id)
+        return True
+
+    async def fail(self, _db: object, job: ClaimedJob, error: str, **_kw: Any) -> str:
+        self.failed.append((job.id, error))
+        return "dead" if job.is_last_attempt else "queued"
+
+    async def dead_letter(self, _db: object, job: ClaimedJob, _error: str) -> None:
+        self.dead.append(job.id)
+
+
+def _job(kind: str = "t", attempts: int = 1, max_attempts: int = 3) -> ClaimedJob:
+    return ClaimedJob(
+        id=uuid.uuid4(),
+        kind=kind,
+        payload={"article_id": str(uuid.uuid4())},
+        attempts=attempts,
+        max_attempts=max_attempts,
+    )
+
+
+@pytest.fixture
+def fake_queue(monkeypatch: pytest.MonkeyPatch) -> _FakeQueue:
+    fake = _FakeQueue()
+    for name in ("claim", "complete", "fail", "dead_letter"):
+        monkeypatch.setattr(queue, name, getattr(fake, name))
+    monkeypatch.setattr("src.lib.database.async_session_factory", _FakeSession)
+    return fake
+
+
+def test_retry_delay_backs_off_exponentially_with_cap() -> None:
+    assert queue.retry_delay_seconds(1) == 10
+    assert queue.retry_delay_seconds(3) == 40
+    assert queue.retry_delay_seconds(20) == 600
+
+
+@pytest.mark.asyncio
+async def test_poll_respects_concurrency_bound(fake_queue: _FakeQueue) -> None:
+    release = asyncio.Event()
+
+    async def _handler(_job: ClaimedJob) -> None:
+        await release.wait()
+
+    fake_queue.pending = [_job() for _ in range(5)]
+    consumer = JobConsumer({"t": JobType(_handler)}, concurrency=2)
+
+    assert await consumer.poll_once() == 2
+    assert await consumer.poll_once() == 0
+    assert consumer.active_count == 2
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert len(fake_queue.completed) == 2
+    assert await consumer.poll_once() == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_then_dead_lettered(fake_queue: _FakeQueue) -> None:
+    dead_letters: list[uuid.UUID] = []
+
+    async def _handler(_job: ClaimedJob) -> None:
+        raise RuntimeError("provider down")
+
+    async def _on_dead(job: ClaimedJob) -> None:
+        dead_letters.append(job.id)
+
+    first, last = _job(attempts=1), _job(attempts=3)
+    fake_queue.pending = [first, last]
+    consumer = JobConsumer({"t": JobType(_handler, _on_dead)}, concurrency=2)
+
+    await consumer.poll_once()
+    await asyncio.sleep(0.01)
+
+    assert {job_id for job_id, _ in fake_queue.failed} == {first.id, last.id}
+    assert "RuntimeError: provider down" in fake_queue.failed[0][1]
+    assert dead_letters == [last.id]
+    assert fake_queue.completed == []
+
+
+@pytest.mark.asyncio
+async def test_expired_last_attempt_is_dead_lettered_without_running(
+    fake_queue: _FakeQueue,
+) -> None:
+    async def _handler(_job: ClaimedJob) -> None:
+        raise AssertionError("exhausted job must not run again")
+
+    job = _job(attempts=4, max_attempts=3)
+    fake_queue.pending = [job]
+    consumer = JobConsumer({"t": JobType(_handler)}, concurrency=1)
+
+    await consumer.poll_once()
+    await asyncio.sleep(0.01)
+
+    assert fake_queue.dead == [job.id]
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_in_flight_jobs(fake_queue: _FakeQueue) -> None:
+    async def _handler(_job: ClaimedJob) -> None:
+        await asyncio.sleep(0.01)
+
+    fake_queue.pending = [_job()]
+    consumer = JobConsumer(
+        {"t": JobType(_handler)}, concurrency=1, poll_interval_seconds=0.01
+    )
+    consumer.start()
+    await asyncio.sleep(0.005)
+    await consumer.stop(grace_seconds=1)
+
+    assert len(fake_queue.completed) == 1
+
+
+def _article(status: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        title="t",
+        content="c",
+        url=None,
+        status=status,
+        requested_summary_language="en",
+    )
+
+
+class _ArticleSession(_FakeSession):
+    def __init__(self, article: SimpleNamespace) -> None:
+        self._article = article
+
+    async def execute(self, *_args: object) -> SimpleNamespace:
+        return SimpleNamespace(scalar_one_or_none=lambda: self._article)
+
+
+@pytest.mark.asyncio
+async def test_analysis_job_skips_articles_no_longer_processing(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    article = _article("analyzed")
+    settled: list[uuid.UUID] = []
+
+    async def _should_not_run(*_args: object, **_kwargs: object) -> bool:
+        raise AssertionError("analysis must not run twice")
+
+    async def _commit_credit(_db: object, article_id: uuid.UUID) -> None:
+        settled.append(article_id)
+
+    monkeypatch.setattr(
+        "src.lib.database.async_session_factory", lambda: _ArticleSession(article)
+    )
+    monkeypatch.setattr(analysis, "run_analysis", _should_not_run)
+    monkeypatch.setattr(analysis.credits, "commit_credit", _commit_credit)
+
+    job = _job(kind=analysis.ANALYSIS_JOB)
+    await analysis.handle_analysis_job(job)
+
+    # A redelivered job settles a credit its first attempt left reserved
+    assert settled == [uuid.UUID(str(job.payload["article_id"]))]
+
+
+@pytest.mark.asyncio
+async def test_analysis_job_failure_raises_and_only_fails_article_at_the_end(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    article = _article("processing")
+    mark_failed_flags: list[bool] = []
+
+    async def _fake_run_analysis(*_args: object, mark_failed: bool, **_kw: object):
+        mark_failed_flags.append(mark_failed)
+        return False
+
+    monkeypatch.setattr(
+        "src.lib.database.async_session_factory", lambda: _ArticleSession(article)
+    )
+    monkeypatch.setattr(analysis, "run_analysis", _fake_run_analysis)
+
+    for attempts in (1, 3):
+        with pytest.raises(analysis.AnalysisFailedError):
+            await analysis.handle_analysis_job(
+                _job(kind=analysis.ANALYSIS_JOB, attempts=attempts, max_attempts=3)
+            )
+
+    assert mark_failed_flags == [False, True]
@@ -0,0 +1,105 @@
+import uuid
+from typing import Any
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.lib.auth import CurrentUserInfo
+from src.users import known_users
+from src.users.known_users import KnownUsersCache
+
+
+class _Result:
+    def __init__(self, value: Any) -> None:
+        self._value = value
+
+    def scalar_one_or_none(self) -> Any:
+        return self._value
+
+
+class _FakeSession:
+    def __init__(self, inserted: bool, email_taken: bool = False) -> None:
+        self.inserted = inserted
+        self.email_taken = email_taken
+        self.statements: list[Any] = []
+        self.commits = 0
+
+    async def execute(self, stmt: Any) -> _Result:
+        self.statements.append(stmt)
+        if self.email_taken:
+            raise IntegrityError(str(stmt), {}, Exception("uq_users_email"))
+        return _Result(uuid.uuid4() if self.inserted else None)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+async def test_ensure_user_inserts_once_then_skips_the_database(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        known_users,
+        "_cache_instance",
+        KnownUsersCache(max_entries=10, ttl_seconds=60),
+    )
+    user = CurrentUserInfo(id=str(uuid.uuid4()), email="reader@example.com")
+    session = _FakeSession(inserted=True)
+
+    assert await known_users.ensure_user(session, user) is True  # type: ignore[arg-type]
+    for _ in range(3):
+        assert await known_users.ensure_user(session, user) is False  # type: ignore[arg-type]
+
+    assert len(session.statements) == 1
+    assert session.commits == 1
+    sql = str(session.statements[0].compile(compile_kwargs={"literal_binds": True}))
+    assert "ON CONFLICT (id) DO NOTHING" in sql
+
+
+async def test_ensure_user_remembers_existing_rows(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        known_users,
+        "_cache_instance",
+        KnownUsersCache(max_entries=10, ttl_seconds=60),
+    )
+    user = CurrentUserInfo(id=str(uuid.uuid4()))
+    session = _FakeSession(inserted=False)
+
+    assert await known_users.ensure_user(session, user) is False  # type: ignore[arg-type]
+    assert await known_users.ensure_user(session, user) is False  # type: ignore[arg-type]
+
+    assert len(session.statements) == 1
+
+
+async def test_ensure_user_does_not_cache_an_email_conflict(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    cache = KnownUsersCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(known_users, "_cache_instance", cache)
+    user = CurrentUserInfo(id=str(uuid.uuid4()), email="taken@example.com")
+    session = _FakeSession(inserted=False, email_taken=True)
+
+    with pytest.raises(IntegrityError):
+        await known_users.ensure_user(session, user)  # type: ignore[arg-type]
+
+    assert not await cache.contains(uuid.UUID(user.id))
+    assert session.commits == 0
+
+
+async def test_known_users_expire_and_are_bounded() -> None:
+    now = [0.0]
+    cache = KnownUsersCache(max_entries=2, ttl_seconds=60, clock=lambda: now[0])
+    first, second, third = (uuid.uuid4() for _ in range(3))
+
+    await cache.add(first)
+    now[0] = 30.0
+    await cache.add(second)
+    await cache.add(third)
+
+    assert len(cache) == 2
+    assert not await cache.contains(first)
+    assert await cache.contains(second)
+    now[0] = 91.0
+    assert not await cache.contains(second)
+    assert not await cache.contains(third)
@@ -0,0 +1,148 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+
+from src.lib.ai.scheduler import (
+    LLMScheduler,
+    Priority,
+    ProviderLimits,
+    TokenBucket,
+    estimate_tokens,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _scheduler(max_concurrency: int = 2) -> LLMScheduler:
+    return LLMScheduler(
+        {
+            "gemini": ProviderLimits(
+                max_concurrency=max_concurrency,
+                requests_per_minute=10_000,
+                tokens_per_minute=10_000_000,
+            )
+        }
+    )
+
+
+def test_estimate_tokens_counts_prompt_and_output() -> None:
+    assert estimate_tokens("x" * 400, expected_output_tokens=100) == 200
+
+
+def test_token_bucket_waits_for_refill() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(60, clock=clock)
+
+    assert bucket.wait_time(60) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+    clock.now = 30.0
+    assert bucket.wait_time(30) == 0
+    # Oversized requests are clamped to the capacity
+    assert bucket.wait_time(1_000) == pytest.approx(30.0)
+
+
+def test_token_bucket_with_zero_rate_never_waits() -> None:
+    bucket = TokenBucket(0, clock=_Clock())
+
+    bucket.take(1_000)
+
+    assert bucket.wait_time(1_000) == 0
+
+
+async def test_run_bounds_in_flight_calls() -> None:
+    scheduler = _scheduler(max_concurrency=2)
+    peak = 0
+    release = asyncio.Event()
+
+    async def _call() -> None:
+        nonlocal peak
+        peak = max(peak, scheduler.in_flight("gemini"))
+        await release.wait()
+
+    tasks = [asyncio.create_task(scheduler.run("gemini", _call)) for _ in range(5)]
+    await asyncio.sleep(0.01)
+
+    assert scheduler.in_flight("gemini") == 2
+    assert scheduler.queue_depth("gemini") == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    assert scheduler.in_flight("gemini") == 0
+    assert scheduler.queue_depth("gemini") == 0
+
+
+async def test_waiters_are_admitted_by_priority() -> None:
+    scheduler = _scheduler(max_concurrency=1)
+    release = asyncio.Event()
+    order: list[str] = []
+
+    async def _blocker() -> None:
+        await release.wait()
+
+    def _record(name: str) -> Callable[[], Awaitable[None]]:
+        async def _call() -> None:
+            order.append(name)
+
+        return _call
+
+    blocker = asyncio.create_task(scheduler.run("gemini", _blocker))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(
+            scheduler.run("gemini", _record("backfill"), priority=Priority.BACKFILL)
+        ),
+        asyncio.create_task(
+            scheduler.run("gemini", _record("retry"), priority=Priority.RETRY)
+        ),
+        asyncio.create_task(scheduler.run("gemini", _record("interactive"))),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth("gemini", Priority.BACKFILL) == 1
+
+    release.set()
+    await asyncio.gather(blocker, *waiting)
+
+    assert order == ["interactive", "retry", "backfill"]
+
+
+async def test_cancelled_waiter_does_not_leak_a_slot() -> None:
+    scheduler = _scheduler(max_concurrency=1)
+    release = asyncio.Event()
+
+    async def _blocker() -> None:
+        await release.wait()
+
+    async def _noop() -> str:
+        return "ok"
+
+    blocker = asyncio.create_task(scheduler.run("gemini", _blocker))
+    await asyncio.sleep(0)
+    cancelled = asyncio.create_task(scheduler.run("gemini", _noop))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+    await blocker
+
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert await scheduler.run("gemini", _noop) == "ok"
+    assert scheduler.in_flight("gemini") == 0
+
+
+async def test_unknown_provider_is_rejected() -> None:
+    async def _noop() -> None:
+        return None
+
+    with pytest.raises(ValueError, match="No scheduler limits"):
+        await _scheduler().run("anthropic", _noop)
@@ -0,0 +1,75 @@
+from typing import cast
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles import service
+from src.common.models.pagination import (
+    InvalidCursorError,
+    PaginatedResponse,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_cursor_round_trip() -> None:
+    cursor = encode_cursor("created", ["2026-01-01T00:00:00+00:00", "abc"])
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "created") == ["2026-01-01T00:00:00+00:00", "abc"]
+
+
+def test_decode_cursor_rejects_other_kind() -> None:
+    cursor = encode_cursor("distance", [0.1, "abc"])
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "created")
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", "bm90LWpzb24", "W10"])
+def test_decode_cursor_rejects_garbage(cursor: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "created")
+
+
+def test_create_without_total_uses_explicit_has_next() -> None:
+    response = PaginatedResponse[int].create(
+        data=[1, 2],
+        total=None,
+        page=1,
+        limit=2,
+        next_cursor="next",
+        has_next=True,
+    )
+
+    assert response.meta.total is None
+    assert response.meta.total_pages is None
+    assert response.meta.has_next is True
+    assert response.meta.has_prev is False
+    assert response.meta.next_cursor == "next"
+
+
+def test_create_with_total_keeps_offset_semantics() -> None:
+    response = PaginatedResponse[int].create(data=[1], total=5, page=2, limit=2)
+
+    assert response.meta.total_pages == 3
+    assert response.meta.has_next is True
+    assert response.meta.has_prev is True
+    assert response.meta.next_cursor is None
+
+
+class _FailingDB:
+    async def execute(self, *_args: object, **_kwargs: object) -> None:
+        raise AssertionError("database should not be queried for a bad cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_articles_rejects_malformed_cursor_before_querying() -> None:
+    bad_cursor = encode_cursor("created", ["not-a-date", "not-a-uuid"])
+
+    with pytest.raises(InvalidCursorError):
+        await service.list_articles(
+            cast(AsyncSession, _FailingDB()),
+            "00000000-0000-0000-0000-000000000001",
+            cursor=bad_cursor,
+        )
@@ -0,0 +1,174 @@
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+from fastapi.testclient import TestClient
+
+from src.lib import rate_limit
+from src.lib.auth import CurrentUserInfo, get_current_user
+from src.lib.database import get_db
+from src.lib.rate_limit import (
+    InMemoryRateLimiter,
+    RateLimitConfig,
+    RateLimiterRegistry,
+    RateLimitPolicy,
+    make_key_func,
+    rate_limit_middleware,
+)
+
+
+def test_gcra_allows_a_burst_then_refills_evenly() -> None:
+    now = [0.0]
+    limiter = InMemoryRateLimiter(3, 30, clock=lambda: now[0])
+
+    assert [limiter.is_allowed("k") for _ in range(3)] == [
+        (True, 2, 10),
+        (True, 1, 20),
+        (True, 0, 30),
+    ]
+    assert limiter.is_allowed("k") == (False, 0, 10)
+
+    now[0] = 10.0
+    assert limiter.is_allowed("k") == (True, 0, 30)
+    assert limiter.is_allowed("k")[0] is False
+    assert limiter.is_allowed("other")[0] is True
+
+
+def test_in_memory_limiter_keys_are_bounded_and_swept() -> None:
+    now = [0.0]
+    limiter = InMemoryRateLimiter(
+        10, 60, max_keys=2, sweep_interval=30, clock=lambda: now[0]
+    )
+
+    for key in ("a", "b", "c"):
+        limiter.is_allowed(key)
+    assert len(limiter) == 2
+
+    # One request refills after window / requests seconds
+    now[0] = 30.0
+    limiter.is_allowed("d")
+    assert len(limiter) == 1
+
+
+def test_key_templates_collapse_path_parameters() -> None:
+    app = FastAPI()
+    keys: list[str] = []
+    config = RateLimitConfig(
+        requests=100,
+        window=60,
+        key_template="{ip}:{method}:{route}",
+    )
+
+    @app.middleware("http")
+    async def limit(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        keys.append(rate_limit._resolve_key_func(config)(request))
+        return await rate_limit_middleware(request, call_next, config)
+
+    @app.get("/articles/{article_id}")
+    async def get_article(article_id: uuid.UUID) -> JSONResponse:
+        return JSONResponse({"id": str(article_id)})
+
+    with TestClient(app) as client:
+        for _ in range(2):
+            client.get(f"/articles/{uuid.uuid4()}")
+        client.get("/articles/42/related")
+
+    assert keys == [
+        "testclient:GET:/articles/{id}",
+        "testclient:GET:/articles/{id}",
+        "testclient:GET:/articles/{id}/related",
+    ]
+
+
+def test_rate_limit_decorator_uses_the_route_template(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(rate_limit, "_registry_instance", RateLimiterRegistry())
+    app = FastAPI()
+
+    @app.get("/articles/{article_id}")
+    @rate_limit.rate_limit(requests=2, window=60)
+    async def get_article(request: Request, article_id: str) -> JSONResponse:
+        return JSONResponse({"id": article_id})
+
+    with TestClient(app) as client:
+        statuses = [client.get(f"/articles/{uuid.uuid4()}").status_code for _ in "abc"]
+
+    assert statuses == [200, 200, 429]
+
+
+def test_make_key_func_rejects_unknown_fields() -> None:
+    with pytest.raises(KeyError):
+        make_key_func("{ip}:{user}")
+
+
+async def test_redis_limiter_converts_script_results_to_seconds() -> None:
+    calls: list[tuple[list[str], list[float]]] = []
+
+    async def script(keys: list[str], args: list[float]) -> list[int]:
+        calls.append((keys, args))
+        return [0, 0, 2_500_000]
+
+    limiter = rate_limit.RedisRateLimiter(4, 60, object())  # type: ignore[arg-type]
+    limiter._script = script  # type: ignore[assignment]
+
+    assert await limiter.is_allowed("1.2.3.4:/search") == (False, 0, 3)
+    assert calls == [(["rate_limit:gcra:1.2.3.4:/search"], [15_000_000, 60_000_000, 1])]
+
+
+def test_user_policies_have_separate_plan_and_cost_weighted_budgets(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(rate_limit, "_registry_instance", RateLimiterRegistry())
+    plans = {"basic-user": "basic", "pro-user": "pro"}
+
+    async def user_plan(_db: object, user_id: str) -> str:
+        return plans[user_id]
+
+    monkeypatch.setattr(rate_limit, "_user_plan", user_plan)
+    search_limit = rate_limit.limit_by_user(
+        RateLimitPolicy(
+            "search",
+            requests=4,
+            window=60,
+            plan_requests={"pro": 8},
+            cost=lambda request: int(request.query_params.get("cost", 1)),
+        )
+    )
+    analyze_limit = rate_limit.limit_by_user(RateLimitPolicy("analyze", 1, 60))
+
+    app = FastAPI()
+
+    @app.get("/search", dependencies=[Depends(search_limit)])
+    async def search() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.post("/analyze", dependencies=[Depends(analyze_limit)])
+    async def analyze() -> dict[str, bool]:
+        return {"ok": True}
+
+    async def no_db() -> AsyncIterator[None]:
+        yield None
+
+    current = ["basic-user"]
+    app.dependency_overrides[get_current_user] = lambda: CurrentUserInfo(id=current[0])
+    app.dependency_overrides[get_db] = no_db
+
+    with TestClient(app) as client:
+        first = client.get("/search", params={"cost": 2})
+        assert first.headers["X-RateLimit-Limit"] == "4"
+        assert first.headers["X-RateLimit-Remaining"] == "2"
+        assert client.get("/search", params={"cost": 2}).status_code == 200
+        denied = client.get("/search")
+        assert denied.status_code == 429
+        assert int(denied.headers["Retry-After"]) >= 1
+        # Other policies and other users keep their own budgets
+        assert client.post("/analyze").status_code == 200
+        current[0] = "pro-user"
+        statuses = [client.get("/search").status_code for _ in range(9)]
+
+    assert statuses == [200] * 8 + [429]
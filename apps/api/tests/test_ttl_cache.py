@@ -0,0 +1,46 @@
+from src.lib.ttl_cache import TTLCache
+
+
+def test_evicts_least_recently_used_entry() -> None:
+    cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_expires_at_caps_the_ttl() -> None:
+    now = [0.0]
+    cache: TTLCache[str, int] = TTLCache(
+        max_entries=10, ttl_seconds=60, clock=lambda: now[0]
+    )
+    cache.set("short", 1, expires_at=5.0)
+    cache.set("long", 2, expires_at=500.0)
+    cache.set("past", 3, expires_at=0.0)
+
+    now[0] = 10.0
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.get("past") is None
+
+    now[0] = 60.0
+    assert cache.get("long") is None
+
+
+def test_purge_expired_drops_entries_that_were_not_read() -> None:
+    now = [0.0]
+    cache: TTLCache[str, int] = TTLCache(
+        max_entries=10, ttl_seconds=60, clock=lambda: now[0]
+    )
+    cache.set("old", 1, expires_at=5.0)
+    cache.set("new", 2)
+
+    now[0] = 10.0
+    cache.purge_expired()
+
+    assert len(cache) == 1
+    assert cache.get("new") == 2
@@ -0,0 +1,25 @@
+import pytest
+
+from src.articles.url_normalization import normalize_url
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        (
+            "HTTPS://Example.com:443/blog/post/?utm_source=x&b=2&a=1#comments",
+            "https://example.com/blog/post?a=1&b=2",
+        ),
+        (
+            "https://youtube.com/watch?v=abc123&fbclid=zz&t=30",
+            "https://youtube.com/watch?t=30&v=abc123",
+        ),
+        ("http://example.com", "http://example.com/"),
+        ("http://example.com:8080//", "http://example.com:8080/"),
+        ("https://app.example.com/#/inbox", "https://app.example.com/#/inbox"),
+        ("  not a url ", "not a url"),
+    ],
+)
+def test_normalize_url(url: str, expected: str) -> None:
+    assert normalize_url(url) == expected
+    assert normalize_url(expected) == expected
@@ -0,0 +1,129 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.articles.vector_index import UserVectorIndex, VectorIndexCache
+
+
+def test_search_matches_brute_force_ranking() -> None:
+    rng = np.random.default_rng(7)
+    embeddings = rng.normal(size=(200, 16))
+    article_ids = [uuid.uuid4() for _ in range(200)]
+    index = UserVectorIndex(article_ids, embeddings)
+
+    queries = rng.normal(size=(3, 16))
+    results = index.search(queries, k=5)
+
+    unit = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    for query, hits in zip(queries, results, strict=True):
+        scores = unit @ (query / np.linalg.norm(query))
+        expected = [article_ids[i] for i in np.argsort(-scores)[:5]]
+        assert [article_id for article_id, _score in hits] == expected
+        assert np.allclose([score for _id, score in hits], np.sort(scores)[::-1][:5])
+
+
+def test_neighbors_excludes_the_article_itself() -> None:
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index = UserVectorIndex([a, b, c], [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+
+    neighbors = index.neighbors(a, k=5)
+
+    assert neighbors is not None
+    assert [article_id for article_id, _score in neighbors] == [b, c]
+    assert index.neighbors(uuid.uuid4(), k=5) is None
+    assert UserVectorIndex([], []).search([1.0, 0.0], k=3) == [[]]
+
+
+Row = tuple[uuid.UUID, list[float] | None, datetime]
+
+
+class _FakeResult:
+    def __init__(self, rows: list[Row]) -> None:
+        self._rows = rows
+
+    def all(self) -> list[Row]:
+        return self._rows
+
+
+class _FakeSession:
+    """Holds embeddings as ``id -> (vector, written_at)``.
+
+    Like the refresh query's ``CASE``, it only returns vectors written after
+    the statement's cutoff, if it has one.
+    """
+
+    def __init__(self, embeddings: dict[uuid.UUID, tuple[list[float], datetime]]):
+        self.embeddings = embeddings
+        self.loads = 0
+
+    async def execute(self, stmt: Any) -> _FakeResult:
+        self.loads += 1
+        cutoffs = [
+            value
+            for value in stmt.compile().params.values()
+            if isinstance(value, datetime)
+        ]
+        return _FakeResult(
+            [
+                (
+                    article_id,
+                    vector if not cutoffs or at > cutoffs[0] else None,
+                    at,
+                )
+                for article_id, (vector, at) in self.embeddings.items()
+            ]
+        )
+
+
+T0 = datetime(2026, 10, 1, tzinfo=UTC)
+
+
+async def test_cache_refreshes_after_ttl_and_evicts_least_recent_user() -> None:
+    now = [0.0]
+    cache = VectorIndexCache(max_users=1, ttl_seconds=30, clock=lambda: now[0])
+    session = _FakeSession({uuid.uuid4(): ([1.0, 0.0], T0)})
+    db = cast(AsyncSession, session)
+    user_id = uuid.uuid4()
+
+    first = await cache.get(db, user_id)
+    assert await cache.get(db, user_id) is first
+    assert session.loads == 1
+
+    # Nothing written since: the refresh keeps the index
+    now[0] = 31.0
+    assert await cache.get(db, user_id) is first
+    assert session.loads == 2
+
+    await cache.get(db, uuid.uuid4())
+    assert len(cache) == 1
+    cache.invalidate(user_id)
+    await cache.get(db, user_id)
+    assert session.loads == 4
+
+
+async def test_refresh_applies_new_embeddings_and_deletions() -> None:
+    now = [0.0]
+    cache = VectorIndexCache(max_users=4, ttl_seconds=30, clock=lambda: now[0])
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    session = _FakeSession(
+        {a: ([1.0, 0.0], T0), b: ([0.0, 1.0], T0 + timedelta(minutes=5))}
+    )
+    db = cast(AsyncSession, session)
+    user_id = uuid.uuid4()
+    await cache.get(db, user_id)
+
+    later = T0 + timedelta(minutes=10)
+    del session.embeddings[b]
+    session.embeddings[a] = ([0.0, 1.0], later)
+    session.embeddings[c] = ([0.6, 0.8], later)
+    now[0] = 31.0
+    index = await cache.get(db, user_id)
+
+    assert set(index.article_ids) == {a, c}
+    assert [article_id for article_id, _score in index.search([0.0, 1.0], 2)[0]] == [
+        a,
+        c,
+    ]
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import uuid
 from datetime import UTC, datetime
 from types import SimpleNamespace
@@ -12,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.articles import router
 from src.articles.schemas import ArticleAnalyzeURL
+from src.lib.ai.scheduler import Priority
 from src.lib.auth import CurrentUserInfo
 from src.lib.pdf_extractor import PDFExtractResult
 from src.lib.video_transcript.errors import (
@@ -30,6 +30,10 @@ def _fake_db_session() -> AsyncSession:
     return cast(AsyncSession, cast(object, _FakeDB()))
 
 
+async def _fake_lock_article_url(_db: object, _user_id: str, _url: str) -> None:
+    return None
+
+
 def _build_existing_article(user_id: str) -> SimpleNamespace:
     return SimpleNamespace(
         id=uuid.uuid4(),
@@ -209,6 +213,7 @@ async def test_analyze_url_checks_plan_gate_before_content_preparation(
         raise AssertionError("content preparation should not run for disallowed plan")
 
     monkeypatch.setattr(router.service, "get_article_by_url", _fake_get_article_by_url)
+    monkeypatch.setattr(router.service, "lock_article_url", _fake_lock_article_url)
     monkeypatch.setattr(router.sub_service, "get_usage_info", _fake_get_usage_info)
     monkeypatch.setattr(router, "prepare_analyze_url_content", _should_not_prepare)
 
@@ -227,13 +232,60 @@ async def test_analyze_url_checks_plan_gate_before_content_preparation(
     assert exc_info.value.status_code == status.HTTP_402_PAYMENT_REQUIRED
 
 
+@pytest.mark.asyncio
+async def test_analyze_url_attaches_to_a_concurrent_request_for_the_url(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    user_id = str(uuid.uuid4())
+    in_flight = _build_existing_article(user_id)
+    calls: list[str] = []
+
+    async def _fake_get_article_by_url(
+        _db: object, _user_id: str, _url: str
+    ) -> SimpleNamespace | None:
+        calls.append("lookup")
+        # Created by the request that held the lock before us
+        return in_flight if "lock" in calls else None
+
+    async def _record_lock(_db: object, _user_id: str, _url: str) -> None:
+        calls.append("lock")
+
+    async def _fake_get_usage_info(_db: object, _user_id: str) -> SimpleNamespace:
+        return SimpleNamespace(plan="pro", can_summarize=True)
+
+    async def _record_prepare(**_kwargs: object) -> tuple[str, str]:
+        calls.append("prepare")
+        return "Video title", "transcript"
+
+    monkeypatch.setattr(router.service, "get_article_by_url", _fake_get_article_by_url)
+    monkeypatch.setattr(router.service, "lock_article_url", _record_lock)
+    monkeypatch.setattr(router.sub_service, "get_usage_info", _fake_get_usage_info)
+    monkeypatch.setattr(router, "prepare_analyze_url_content", _record_prepare)
+
+    response = await router.analyze_url(
+        ArticleAnalyzeURL(
+            url="https://youtube.com/watch?v=abc123",
+            title="Video title",
+            content=None,
+            source="extension",
+        ),
+        db=_fake_db_session(),
+        user=CurrentUserInfo(id=user_id),
+    )
+
+    # The page is fetched before the lock, so the lock isn't held during it
+    assert calls == ["lookup", "prepare", "lock", "lookup"]
+    assert response.already_saved is True
+    assert response.id == in_flight.id
+
+
 @pytest.mark.asyncio
 async def test_retry_uses_requested_summary_language_when_summary_missing(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     user_id = str(uuid.uuid4())
     article_id = uuid.uuid4()
-    captured: dict[str, str] = {}
+    captured: dict[str, object] = {}
 
     article = SimpleNamespace(
         id=article_id,
@@ -254,46 +306,94 @@ async def test_retry_uses_requested_summary_language_when_summary_missing(
         db: object,
         article_id_arg: uuid.UUID,
         user_id_arg: str,
+        *,
+        for_update: bool,
     ) -> SimpleNamespace | None:
         assert db is not None
         assert article_id_arg == article_id
         assert user_id_arg == user_id
+        assert for_update
         return article
 
     async def _fake_get_usage_info(_db: object, _user_id: str) -> SimpleNamespace:
         return SimpleNamespace(plan="pro", can_summarize=True)
 
-    async def _fake_update_status(_article_id: uuid.UUID, _status: str) -> None:
-        return None
-
-    async def _fake_run_analysis_async(
+    async def _fake_start_analysis(
+        db: object,
         article_id_arg: uuid.UUID,
-        title: str,
-        content: str,
-        provider: str,
+        *,
         summary_language: str,
-        user_id_arg: str,
-        article_url: str | None = None,
+        priority: Priority,
     ) -> None:
+        assert db is not None
         assert article_id_arg == article_id
-        assert title == article.title
-        assert content == article.content
-        assert provider == "gemini"
-        assert user_id_arg == user_id
-        assert article_url == article.url
         captured["summary_language"] = summary_language
+        captured["priority"] = priority
+
+    async def _fake_release_credit(_db: object, article_id_arg: uuid.UUID) -> bool:
+        captured["released"] = article_id_arg
+        return False
+
+    async def _fake_reserve_credit(
+        _db: object, _user_id: uuid.UUID, article_id_arg: uuid.UUID, plan: str
+    ) -> bool:
+        captured["reserved"] = (article_id_arg, plan)
+        return True
+
+    async def _fake_get_article_by_url(
+        _db: object, _user_id: str, _url: str, *, status: str
+    ) -> None:
+        assert status == "processing"
+        return None
 
     monkeypatch.setattr(router.service, "get_article", _fake_get_article)
+    monkeypatch.setattr(router.service, "get_article_by_url", _fake_get_article_by_url)
+    monkeypatch.setattr(router.service, "lock_article_url", _fake_lock_article_url)
     monkeypatch.setattr(router.sub_service, "get_usage_info", _fake_get_usage_info)
-    monkeypatch.setattr(router.service, "update_article_status", _fake_update_status)
-    monkeypatch.setattr(router, "_run_analysis_async", _fake_run_analysis_async)
+    monkeypatch.setattr(router.analysis, "start_analysis", _fake_start_analysis)
+    monkeypatch.setattr(router.credits, "release_credit", _fake_release_credit)
+    monkeypatch.setattr(router.credits, "reserve_credit", _fake_reserve_credit)
 
     response = await router.retry_article_analysis(
         article_id=article_id,
         db=_fake_db_session(),
         user=CurrentUserInfo(id=user_id),
     )
-    await asyncio.sleep(0)
 
     assert response.id == article_id
+    assert response.status == "processing"
     assert captured["summary_language"] == "en"
+    assert captured["priority"] == Priority.RETRY
+    assert captured["released"] == article_id
+    assert captured["reserved"] == (article_id, "pro")
+
+
+@pytest.mark.asyncio
+async def test_retry_attaches_to_a_concurrent_retry_of_the_article(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    user_id = str(uuid.uuid4())
+    # What the second of two double-clicked retries sees once it gets the row
+    article = _build_existing_article(user_id)
+    article.status = "processing"
+
+    async def _fake_get_article(
+        _db: object, _article_id: uuid.UUID, _user_id: str, *, for_update: bool
+    ) -> SimpleNamespace:
+        assert for_update
+        return article
+
+    async def _should_not_reserve(*_args: object) -> bool:
+        raise AssertionError("the first retry already holds the credit")
+
+    monkeypatch.setattr(router.service, "get_article", _fake_get_article)
+    monkeypatch.setattr(router.credits, "reserve_credit", _should_not_reserve)
+
+    response = await router.retry_article_analysis(
+        article_id=article.id,
+        db=_fake_db_session(),
+        user=CurrentUserInfo(id=user_id),
+    )
+
+    assert response.id == article.id
+    assert response.status == "processing"
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 from src.lib.ai.factory import create_ai_provider
 from src.lib.ai.prompts import ARTICLE_ANALYSIS_PROMPT
+from src.lib.ai.scheduler import Priority, estimate_tokens, get_llm_scheduler
 from src.lib.ai.schemas import ArticleAnalysisResult
 from src.lib.config import settings
 from src.lib.database import Base, async_session_factory
@@ -77,7 +78,9 @@ class ArticleEmbedding(Base):
 
 
 @with_retry(max_attempts=3)
-async def analyze_article(article_id: str) -> None:
+async def analyze_article(
+    article_id: str, priority: Priority = Priority.INTERACTIVE
+) -> None:
     """Analyze an article: generate summary, concepts, key points."""
     logger.info("Starting article analysis", article_id=article_id)
     aid = uuid.UUID(article_id)
@@ -102,8 +105,11 @@ async def analyze_article(article_id: str) -> None:
                 title=article.title,
                 content=article.content[:10000],  # Limit content length
             )
-            analysis: ArticleAnalysisResult = await ai.generate_structured(
-                prompt, ArticleAnalysisResult
+            analysis: ArticleAnalysisResult = await get_llm_scheduler().run(
+                settings.AI_PROVIDER,
+                lambda: ai.generate_structured(prompt, ArticleAnalysisResult),
+                priority=priority,
+                estimated_tokens=estimate_tokens(prompt),
             )
 
             # Determine AI model name
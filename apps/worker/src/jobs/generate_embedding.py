@@ -1,84 +1,381 @@
+"""Article embeddings, generated in batches.
+
+``embed_articles`` embeds a set of articles with one provider call and one
+bulk upsert. Embedding jobs submit their article to a shared
+``EmbeddingBatcher``, which coalesces everything that arrives within a short
+window into one such batch. ``backfill_embeddings`` streams articles that are
+missing an embedding (or, with ``reembed``, were embedded by another model)
+through ``embed_articles`` a batch at a time.
+
+Each batch enqueues the API's neighbours job for the users it embedded
+articles for, which keeps their concept graph's nearest-article lists current.
+"""
+
+import asyncio
 import uuid
+from collections.abc import Awaitable, Callable, Sequence
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 
 # Reuse models from analyze_article
 from src.jobs.analyze_article import Article, ArticleEmbedding, ArticleSummary
 from src.lib.ai.factory import create_ai_provider
 from src.lib.ai.prompts import EMBEDDING_TEXT_TEMPLATE
+from src.lib.ai.scheduler import Priority, estimate_tokens, get_llm_scheduler
 from src.lib.config import settings
 from src.lib.database import async_session_factory
-from src.lib.retry import with_retry
+from src.lib.job_queue import enqueue
 
 logger = structlog.get_logger(__name__)
 
+EMBEDDING_JOB = "embedding"
+BACKFILL_EMBEDDINGS_JOB = "backfill-embeddings"
+# Consumed by the API (``src.articles.concept_graph``)
+CONCEPT_GRAPH_NEIGHBORS_JOB = "concept-graph-neighbors"
 
-@with_retry(max_attempts=3)
-async def generate_embedding(article_id: str) -> None:
-    """Generate embedding for an article using its title and summary."""
-    logger.info("Starting embedding generation", article_id=article_id)
-    aid = uuid.UUID(article_id)
+# Neighbours jobs wait this long so a burst of embeddings is handled in one pass
+NEIGHBORS_DELAY_SECONDS = 30.0
 
-    async with async_session_factory() as session:
-        # Fetch article and summary
-        result = await session.execute(select(Article).where(Article.id == aid))
-        article = result.scalar_one_or_none()
+BatchFlush = Callable[
+    [list[uuid.UUID], Priority], Awaitable[dict[uuid.UUID, Exception]]
+]
 
-        if not article:
-            logger.error("Article not found", article_id=article_id)
-            return
 
-        summary_result = await session.execute(
-            select(ArticleSummary).where(ArticleSummary.article_id == aid)
+def _embedding_text(title: str, summary: str, concepts: object) -> str:
+    concepts_str = ", ".join(concepts) if isinstance(concepts, list) else ""
+    return EMBEDDING_TEXT_TEMPLATE.format(
+        title=title, summary=summary, concepts=concepts_str
+    )
+
+
+async def _embed_texts(
+    texts: list[str], priority: Priority
+) -> list[list[float] | Exception]:
+    """One provider call for all ``texts``; falls back to one call per text
+    if the batch fails, so a single bad input doesn't fail its neighbours."""
+    ai = create_ai_provider()
+    scheduler = get_llm_scheduler()
+    try:
+        vectors = await scheduler.run(
+            settings.AI_PROVIDER,
+            lambda: ai.generate_embeddings(texts),
+            priority=priority,
+            estimated_tokens=sum(
+                estimate_tokens(t, expected_output_tokens=0) for t in texts
+            ),
         )
-        summary = summary_result.scalar_one_or_none()
+        batch: list[list[float] | Exception] = list(vectors)
+        return batch
+    except Exception as exc:
+        if len(texts) == 1:
+            return [exc]
+        logger.warning("Batch embedding failed, retrying one by one", size=len(texts))
 
-        if not summary:
-            logger.error("Article summary not found", article_id=article_id)
-            return
+    async def _one(text: str) -> list[float]:
+        return await scheduler.run(
+            settings.AI_PROVIDER,
+            lambda: ai.generate_embedding(text),
+            priority=priority,
+            estimated_tokens=estimate_tokens(text, expected_output_tokens=0),
+        )
 
-        try:
-            # Compose text for embedding
-            concepts_str = (
-                ", ".join(summary.concepts)
-                if isinstance(summary.concepts, list)
-                else ""
+    results = await asyncio.gather(*(_one(t) for t in texts), return_exceptions=True)
+    for result in results:
+        if not isinstance(result, list | Exception):
+            raise result
+    return [r for r in results if isinstance(r, list | Exception)]
+
+
+async def embed_articles(
+    article_ids: Sequence[uuid.UUID],
+    priority: Priority = Priority.INTERACTIVE,
+    *,
+    replace: bool = False,
+) -> dict[uuid.UUID, Exception]:
+    """Embed ``article_ids`` with one provider call and one bulk upsert.
+
+    Articles without a summary are skipped, as are articles that already have
+    an embedding unless ``replace`` is set. Successful articles are marked
+    ``completed``. Failed ones are left as they are: the job queue retries
+    them and ``mark_embedding_failed`` runs once it gives up.
+
+    Returns:
+        The error for each article whose embedding could not be generated.
+    """
+    ai = create_ai_provider()
+    async with async_session_factory() as session:
+        stmt = (
+            select(
+                Article.id,
+                Article.user_id,
+                Article.title,
+                ArticleSummary.summary,
+                ArticleSummary.concepts,
             )
-            text = EMBEDDING_TEXT_TEMPLATE.format(
-                title=article.title,
-                summary=summary.summary,
-                concepts=concepts_str,
+            .join(ArticleSummary, ArticleSummary.article_id == Article.id)
+            .where(Article.id.in_(article_ids))
+        )
+        if not replace:
+            # Redelivered jobs whose earlier attempt already stored the embedding
+            stmt = stmt.where(
+                ~select(ArticleEmbedding.id)
+                .where(ArticleEmbedding.article_id == Article.id)
+                .exists()
             )
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return {}
 
-            # Generate embedding
-            ai = create_ai_provider()
-            embedding_vector = await ai.generate_embedding(text)
+        vectors = await _embed_texts(
+            [_embedding_text(r.title, r.summary, r.concepts) for r in rows], priority
+        )
 
-            # Determine AI model name
-            ai_model = (
-                "text-embedding-3-small"
-                if settings.AI_PROVIDER == "openai"
-                else settings.GEMINI_MODEL
+        errors: dict[uuid.UUID, Exception] = {}
+        values: list[dict[str, object]] = []
+        for row, vector in zip(rows, vectors, strict=True):
+            if isinstance(vector, Exception):
+                errors[row.id] = vector
+            else:
+                values.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "article_id": row.id,
+                        "embedding": vector,
+                        "ai_provider": settings.AI_PROVIDER,
+                        "ai_model": ai.embedding_model,
+                    }
+                )
+
+        if values:
+            stmt_insert = insert(ArticleEmbedding).values(values)
+            await session.execute(
+                stmt_insert.on_conflict_do_update(
+                    index_elements=[ArticleEmbedding.article_id],
+                    set_={
+                        "embedding": stmt_insert.excluded.embedding,
+                        "ai_provider": stmt_insert.excluded.ai_provider,
+                        "ai_model": stmt_insert.excluded.ai_model,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+            # Leave articles that are being re-analyzed alone
+            await session.execute(
+                update(Article)
+                .where(
+                    Article.id.in_([v["article_id"] for v in values]),
+                    Article.status != "processing",
+                )
+                .values(status="completed")
             )
+            embedded_ids = {v["article_id"] for v in values}
+            for user_id in {r.user_id for r in rows if r.id in embedded_ids}:
+                await enqueue(
+                    session,
+                    CONCEPT_GRAPH_NEIGHBORS_JOB,
+                    {"user_id": str(user_id)},
+                    dedupe_key=str(user_id),
+                    delay_seconds=NEIGHBORS_DELAY_SECONDS,
+                )
+        await session.commit()
+
+    logger.info(
+        "Embedded articles",
+        embedded=len(values),
+        failed=len(errors),
+        model=ai.embedding_model,
+    )
+    return errors
+
+
+class EmbeddingBatcher:
+    """Coalesces embedding requests into batches.
+
+    Requests that arrive within ``max_wait_seconds`` of the first pending one
+    (or until ``max_batch_size`` articles are pending) are flushed together.
+    A batch runs at the most urgent priority among its requests.
+    """
+
+    def __init__(
+        self,
+        flush: BatchFlush,
+        *,
+        max_batch_size: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self._flush_batch = flush
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_seconds
+        self._pending: dict[uuid.UUID, asyncio.Future[None]] = {}
+        self._priority = Priority.BACKFILL
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task[None]] = set()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def submit(
+        self, article_id: uuid.UUID, priority: Priority = Priority.INTERACTIVE
+    ) -> None:
+        """Wait until ``article_id`` is embedded; raises if it failed."""
+        future = self._pending.get(article_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[article_id] = future
+        self._priority = min(self._priority, priority)
 
-            # Create embedding record
-            embedding = ArticleEmbedding(
-                article_id=aid,
-                embedding=embedding_vector,
-                ai_provider=settings.AI_PROVIDER,
-                ai_model=ai_model,
+        if len(self._pending) >= self._max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._max_wait_seconds, self.flush
             )
-            session.add(embedding)
+        # Shielded: one cancelled job must not cancel a batch it shares
+        await asyncio.shield(future)
 
-            # Update article status to completed
-            article.status = "completed"
-            await session.commit()
+    def flush(self) -> None:
+        """Start a batch with everything pending now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        priority, self._priority = self._priority, Priority.BACKFILL
+        task = asyncio.create_task(self._run_batch(batch, priority))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(
+        self, batch: dict[uuid.UUID, asyncio.Future[None]], priority: Priority
+    ) -> None:
+        try:
+            errors = await self._flush_batch(list(batch), priority)
+        except Exception as exc:
+            logger.exception("Embedding batch failed", size=len(batch))
+            errors = dict.fromkeys(batch, exc)
+        for article_id, future in batch.items():
+            if future.done():
+                continue
+            error = errors.get(article_id)
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+                # Retrieved here so an abandoned request doesn't log a warning
+                future.exception()
+
+    async def aclose(self) -> None:
+        """Flush what is pending and wait for running batches."""
+        self.flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+
+
+_batcher: EmbeddingBatcher | None = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    global _batcher
+    if _batcher is None:
+        _batcher = EmbeddingBatcher(
+            embed_articles,
+            max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_wait_seconds=settings.EMBEDDING_BATCH_MAX_WAIT_SECONDS,
+        )
+    return _batcher
+
+
+async def close_embedding_batcher() -> None:
+    global _batcher
+    if _batcher is not None:
+        await _batcher.aclose()
+        _batcher = None
+
+
+async def generate_embedding(
+    article_id: str, priority: Priority = Priority.INTERACTIVE
+) -> None:
+    """Generate embedding for an article using its title and summary.
+
+    Raises on failure; the job queue owns retries.
+    """
+    logger.info("Starting embedding generation", article_id=article_id)
+    await get_embedding_batcher().submit(uuid.UUID(article_id), priority)
+
+
+async def mark_embedding_failed(article_id: str) -> None:
+    """Fail an article whose embedding job was dead-lettered."""
+    async with async_session_factory() as session:
+        await session.execute(
+            update(Article)
+            .where(Article.id == uuid.UUID(article_id), Article.status != "processing")
+            .values(status="failed")
+        )
+        await session.commit()
+
+
+async def backfill_embeddings(
+    *,
+    reembed: bool = False,
+    after: uuid.UUID | None = None,
+    max_articles: int | None = None,
+) -> uuid.UUID | None:
+    """Embed every summarized article that has no embedding.
+
+    With ``reembed``, articles embedded by a different model than the current
+    provider's are embedded again. Articles are visited in id order starting
+    after ``after``.
+
+    Returns:
+        The last visited id if ``max_articles`` was reached before the end,
+        to resume from; None when done.
+    """
+    ai = create_ai_provider()
+    batch_size = settings.EMBEDDING_BATCH_SIZE
+    visited = failed = 0
+    cursor = after
+
+    while max_articles is None or visited < max_articles:
+        limit = batch_size
+        if max_articles is not None:
+            limit = min(limit, max_articles - visited)
+        missing = ArticleEmbedding.id.is_(None)
+        stmt = (
+            select(Article.id)
+            .join(ArticleSummary, ArticleSummary.article_id == Article.id)
+            .outerjoin(ArticleEmbedding, ArticleEmbedding.article_id == Article.id)
+            .where(
+                or_(missing, ArticleEmbedding.ai_model != ai.embedding_model)
+                if reembed
+                else missing
+            )
+            .order_by(Article.id)
+            .limit(limit)
+        )
+        if cursor is not None:
+            stmt = stmt.where(Article.id > cursor)
+        async with async_session_factory() as session:
+            ids = list((await session.execute(stmt)).scalars())
+        if not ids:
+            cursor = None
+            break
 
-            logger.info("Embedding generation completed", article_id=article_id)
+        errors = await embed_articles(ids, Priority.BACKFILL, replace=reembed)
+        failed += len(errors)
+        visited += len(ids)
+        cursor = ids[-1]
+        if len(ids) < limit:
+            cursor = None
+            break
 
-        except Exception:
-            logger.exception("Embedding generation failed", article_id=article_id)
-            article.status = "failed"
-            await session.commit()
-            raise
+    logger.info(
+        "Embedding backfill pass finished",
+        visited=visited,
+        failed=failed,
+        resume_after=str(cursor) if cursor else None,
+    )
+    return cursor
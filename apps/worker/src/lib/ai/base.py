@@ -4,6 +4,8 @@ from typing import Any
 
 
 class AIProvider[T](ABC):
+    embedding_model: str
+
     @abstractmethod
     async def analyze_image(self, image_data: bytes | list[bytes]) -> T:
         pass
@@ -25,3 +27,11 @@ class AIProvider[T](ABC):
     @abstractmethod
     async def generate_embedding(self, text: str) -> list[float]:
         pass
+
+    @abstractmethod
+    async def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Embed several texts in one provider call, in input order."""
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        pass
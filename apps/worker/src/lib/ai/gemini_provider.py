@@ -12,7 +12,7 @@ class GeminiProvider(AIProvider[Any]):
     def __init__(self) -> None:
         self._client = genai.Client(api_key=settings.GEMINI_API_KEY)
         self._model = settings.GEMINI_MODEL
-        self._embedding_model = "text-embedding-004"
+        self.embedding_model = "text-embedding-004"
 
     async def analyze_image(self, image_data: bytes | list[bytes]) -> Any:
         raise NotImplementedError
@@ -54,10 +54,24 @@ class GeminiProvider(AIProvider[Any]):
 
     async def generate_embedding(self, text: str) -> list[float]:
         response = await self._client.aio.models.embed_content(
-            model=self._embedding_model,
+            model=self.embedding_model,
             contents=text,
         )
         embeddings = response.embeddings
         if not embeddings or not embeddings[0].values:
             raise ValueError("Gemini returned empty embeddings")
         return list(embeddings[0].values)
+
+    async def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        response = await self._client.aio.models.embed_content(
+            model=self.embedding_model,
+            contents=texts,
+        )
+        embeddings = response.embeddings or []
+        if len(embeddings) != len(texts) or not all(e.values for e in embeddings):
+            raise ValueError("Gemini returned incomplete embeddings")
+        return [list(e.values or []) for e in embeddings]
+
+    async def aclose(self) -> None:
+        await self._client.aio.aclose()
+        self._client.close()
@@ -11,7 +11,7 @@ class OpenAIProvider(AIProvider[Any]):
     def __init__(self) -> None:
         self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self._model = "gpt-4o-mini"
-        self._embedding_model = "text-embedding-3-small"
+        self.embedding_model = "text-embedding-3-small"
 
     async def analyze_image(self, image_data: bytes | list[bytes]) -> Any:
         raise NotImplementedError
@@ -51,8 +51,19 @@ class OpenAIProvider(AIProvider[Any]):
 
     async def generate_embedding(self, text: str) -> list[float]:
         response = await self._client.embeddings.create(
-            model=self._embedding_model,
+            model=self.embedding_model,
             input=text,
             dimensions=768,
         )
         return response.data[0].embedding
+
+    async def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        response = await self._client.embeddings.create(
+            model=self.embedding_model,
+            input=texts,
+            dimensions=768,
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    async def aclose(self) -> None:
+        await self._client.close()
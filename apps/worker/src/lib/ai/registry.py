@@ -0,0 +1,43 @@
+"""Process-wide AI providers, so jobs reuse SDK clients and their connection pools."""
+
+from typing import Any
+
+import structlog
+
+from src.lib.ai.base import AIProvider
+from src.lib.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_providers: dict[str, AIProvider[Any]] = {}
+
+
+def get_provider(name: str | None = None) -> AIProvider[Any]:
+    resolved = name or settings.AI_PROVIDER
+    provider = _providers.get(resolved)
+    if provider is not None:
+        return provider
+
+    match resolved:
+        case "openai":
+            from src.lib.ai.openai_provider import OpenAIProvider
+
+            provider = OpenAIProvider()
+        case "gemini":
+            from src.lib.ai.gemini_provider import GeminiProvider
+
+            provider = GeminiProvider()
+        case _:
+            raise ValueError(f"Unknown AI provider: {resolved}")
+
+    _providers[resolved] = provider
+    return provider
+
+
+async def close_providers() -> None:
+    for name, provider in list(_providers.items()):
+        try:
+            await provider.aclose()
+        except Exception:
+            logger.warning("Failed to close AI provider", provider=name, exc_info=True)
+    _providers.clear()
@@ -0,0 +1,199 @@
+"""Admission control for LLM calls: per-provider concurrency, RPM/TPM budgets
+and priority lanes, so bursts queue locally instead of tripping provider 429s.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+import structlog
+
+from src.lib.config import settings
+
+logger = structlog.get_logger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+# Admission waits longer than this are logged
+SLOW_ADMISSION_SECONDS = 1.0
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    RETRY = 1
+    BACKFILL = 2
+
+
+def estimate_tokens(text: str, expected_output_tokens: int = 1024) -> int:
+    return len(text) // CHARS_PER_TOKEN + expected_output_tokens
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    max_concurrency: int
+    requests_per_minute: int
+    tokens_per_minute: int
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate_per_minute: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.capacity = float(rate_per_minute)
+        self._refill_per_second = rate_per_minute / 60.0
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated_at = clock()
+
+    def wait_time(self, amount: float) -> float:
+        # A rate of 0 or less means no limit
+        if self._refill_per_second <= 0:
+            return 0.0
+        now = self._clock()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated_at) * self._refill_per_second,
+        )
+        self._updated_at = now
+        missing = min(amount, self.capacity) - self._tokens
+        return max(missing, 0.0) / self._refill_per_second
+
+    def take(self, amount: float) -> None:
+        self._tokens -= min(amount, self.capacity)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    future: asyncio.Future[None] = field(compare=False)
+
+
+class _ProviderLane:
+    def __init__(self, limits: ProviderLimits) -> None:
+        self.limits = limits
+        self.in_flight = 0
+        self.requests = TokenBucket(limits.requests_per_minute)
+        self.tokens = TokenBucket(limits.tokens_per_minute)
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._bucket_lock = asyncio.Lock()
+
+    def depth(self, priority: Priority | None = None) -> int:
+        return sum(
+            1
+            for w in self._waiters
+            if not w.future.done() and (priority is None or w.priority == priority)
+        )
+
+    async def acquire_slot(self, priority: Priority) -> None:
+        if self.in_flight < self.limits.max_concurrency and not self.depth():
+            self.in_flight += 1
+            return
+
+        waiter = _Waiter(
+            int(priority), next(self._seq), asyncio.get_running_loop().create_future()
+        )
+        heapq.heappush(self._waiters, waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release_slot()
+            raise
+
+    def release_slot(self) -> None:
+        while self._waiters:
+            waiter = heapq.heappop(self._waiters)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    async def take_budget(self, estimated_tokens: int) -> None:
+        async with self._bucket_lock:
+            while True:
+                wait = max(
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(estimated_tokens),
+                )
+                if not wait:
+                    self.requests.take(1)
+                    self.tokens.take(estimated_tokens)
+                    return
+                await asyncio.sleep(wait)
+
+
+class LLMScheduler:
+    def __init__(self, limits: dict[str, ProviderLimits]) -> None:
+        self._limits = limits
+        self._lanes: dict[str, _ProviderLane] = {}
+
+    def _lane(self, provider: str) -> _ProviderLane:
+        lane = self._lanes.get(provider)
+        if lane is None:
+            if provider not in self._limits:
+                raise ValueError(f"No scheduler limits for provider: {provider}")
+            lane = _ProviderLane(self._limits[provider])
+            self._lanes[provider] = lane
+        return lane
+
+    def queue_depth(self, provider: str, priority: Priority | None = None) -> int:
+        lane = self._lanes.get(provider)
+        return lane.depth(priority) if lane else 0
+
+    async def run[T](
+        self,
+        provider: str,
+        call: Callable[[], Awaitable[T]],
+        *,
+        priority: Priority = Priority.INTERACTIVE,
+        estimated_tokens: int = 0,
+    ) -> T:
+        lane = self._lane(provider)
+        started = time.monotonic()
+        await lane.acquire_slot(priority)
+        try:
+            await lane.take_budget(estimated_tokens)
+            waited = time.monotonic() - started
+            if waited > SLOW_ADMISSION_SECONDS:
+                logger.info(
+                    "LLM call waited for admission",
+                    provider=provider,
+                    lane=priority.name.lower(),
+                    waited_seconds=round(waited, 2),
+                    queue_depth=lane.depth(),
+                )
+            return await call()
+        finally:
+            lane.release_slot()
+
+
+_scheduler: LLMScheduler | None = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler(
+            {
+                "gemini": ProviderLimits(
+                    max_concurrency=settings.GEMINI_MAX_CONCURRENCY,
+                    requests_per_minute=settings.GEMINI_REQUESTS_PER_MINUTE,
+                    tokens_per_minute=settings.GEMINI_TOKENS_PER_MINUTE,
+                ),
+                "openai": ProviderLimits(
+                    max_concurrency=settings.OPENAI_MAX_CONCURRENCY,
+                    requests_per_minute=settings.OPENAI_REQUESTS_PER_MINUTE,
+                    tokens_per_minute=settings.OPENAI_TOKENS_PER_MINUTE,
+                ),
+            }
+        )
+    return _scheduler
@@ -36,9 +36,31 @@ class Settings(BaseSettings):
     GEMINI_MODEL: str = "gemini-3-flash-preview"
     OPENAI_API_KEY: str | None = None
 
+    # LLM scheduler limits, per process (see src/lib/ai/scheduler.py); a rate
+    # of 0 disables that limit
+    GEMINI_MAX_CONCURRENCY: int = 8
+    GEMINI_REQUESTS_PER_MINUTE: int = 300
+    GEMINI_TOKENS_PER_MINUTE: int = 1_000_000
+    OPENAI_MAX_CONCURRENCY: int = 8
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_TOKENS_PER_MINUTE: int = 200_000
+
     # Worker URL (self, for chaining tasks)
     WORKER_URL: str = "http://localhost:8080"
 
+    # Durable job queue (jobs table, filled by the API)
+    JOB_CONSUMER_ENABLED: bool = True
+    JOB_CONSUMER_CONCURRENCY: int = 4
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 300.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+
+    # Embedding jobs arriving within the wait window share one provider call
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_WAIT_SECONDS: float = 0.2
+    # Articles one backfill-embeddings job embeds before handing off to a
+    # follow-up job, so a single job stays well within its lease
+    EMBEDDING_BACKFILL_ARTICLES_PER_JOB: int = 1000
+
     def model_post_init(self, __context: object) -> None:
         if (
             self.ENVIRONMENT
@@ -0,0 +1,255 @@
+"""Consumer for the durable ``jobs`` table shared with the API.
+
+Mirrors ``apps/api/src/jobs``: jobs are leased with ``FOR UPDATE SKIP LOCKED``
+until ``visible_at``, retried with exponential backoff and dead-lettered after
+``max_attempts``. The API enqueues; this process consumes the kinds it has
+handlers for with bounded concurrency. A kind's ``dead_letter_handlers``
+entry runs once its job is dead-lettered, e.g. to mark the article failed.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import socket
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.lib.database import async_session_factory
+
+logger = structlog.get_logger(__name__)
+
+MAX_ERROR_LENGTH = 2000
+
+_CLAIM_SQL = text(
+    """
+    UPDATE jobs
+    SET status = 'running',
+        attempts = attempts + 1,
+        visible_at = now() + make_interval(secs => :visibility_timeout),
+        locked_by = :consumer_id,
+        updated_at = now()
+    WHERE id IN (
+        SELECT id FROM jobs
+        WHERE kind = ANY(:kinds)
+          AND status IN ('queued', 'running')
+          AND visible_at <= now()
+        ORDER BY visible_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, payload, attempts, max_attempts
+    """
+)
+
+_ENQUEUE_SQL = text(
+    """
+    INSERT INTO jobs (id, kind, payload, dedupe_key, max_attempts, visible_at)
+    VALUES (
+        :id, :kind, CAST(:payload AS jsonb), :dedupe_key, :max_attempts,
+        now() + make_interval(secs => :delay_seconds)
+    )
+    ON CONFLICT (kind, dedupe_key) WHERE status IN ('queued', 'running')
+    DO NOTHING
+    """
+)
+
+_COMPLETE_SQL = text("DELETE FROM jobs WHERE id = :id AND attempts = :attempts")
+
+_FAIL_SQL = text(
+    """
+    UPDATE jobs
+    SET status = :status,
+        visible_at = now() + make_interval(secs => :retry_delay),
+        locked_by = NULL,
+        last_error = :error,
+        updated_at = now()
+    WHERE id = :id AND attempts = :attempts
+    RETURNING status
+    """
+)
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: uuid.UUID
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+JobHandler = Callable[[ClaimedJob], Awaitable[None]]
+
+
+def retry_delay_seconds(attempts: int, base: float = 10.0, cap: float = 600.0) -> float:
+    return float(min(cap, base * 2 ** max(attempts - 1, 0)))
+
+
+async def enqueue(
+    session: AsyncSession,
+    kind: str,
+    payload: dict[str, Any],
+    *,
+    dedupe_key: str | None = None,
+    max_attempts: int = 3,
+    delay_seconds: float = 0.0,
+) -> None:
+    """Add a job in the caller's transaction (skipped if an active job with
+    the same kind and ``dedupe_key`` exists), runnable after ``delay_seconds``."""
+    await session.execute(
+        _ENQUEUE_SQL,
+        {
+            "id": uuid.uuid4(),
+            "kind": kind,
+            "payload": json.dumps(payload),
+            "dedupe_key": dedupe_key,
+            "max_attempts": max_attempts,
+            "delay_seconds": delay_seconds,
+        },
+    )
+
+
+class JobConsumer:
+    def __init__(
+        self,
+        handlers: dict[str, JobHandler],
+        *,
+        dead_letter_handlers: dict[str, JobHandler] | None = None,
+        concurrency: int,
+        visibility_timeout_seconds: float,
+        poll_interval_seconds: float,
+    ) -> None:
+        self._handlers = handlers
+        self._dead_letter_handlers = dead_letter_handlers or {}
+        self._concurrency = concurrency
+        self._visibility_timeout_seconds = visibility_timeout_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self.consumer_id = (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self._active: set[asyncio.Task[None]] = set()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._loop_task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self, grace_seconds: float = 10.0) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._loop_task is not None:
+            await self._loop_task
+            self._loop_task = None
+        if self._active:
+            _done, pending = await asyncio.wait(self._active, timeout=grace_seconds)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run(self) -> None:
+        logger.info("Job consumer started", consumer_id=self.consumer_id)
+        while not self._stopping:
+            claimed = 0
+            try:
+                claimed = await self._poll_once()
+            except Exception:
+                logger.exception("Job consumer poll failed")
+
+            if claimed and len(self._active) < self._concurrency:
+                continue
+            self._wakeup.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self._poll_interval_seconds
+                )
+
+    async def _poll_once(self) -> int:
+        free_slots = self._concurrency - len(self._active)
+        if free_slots <= 0:
+            return 0
+
+        async with async_session_factory() as session:
+            result = await session.execute(
+                _CLAIM_SQL,
+                {
+                    "kinds": list(self._handlers),
+                    "limit": free_slots,
+                    "consumer_id": self.consumer_id,
+                    "visibility_timeout": self._visibility_timeout_seconds,
+                },
+            )
+            jobs = [
+                ClaimedJob(
+                    id=row.id,
+                    kind=row.kind,
+                    payload=row.payload,
+                    attempts=row.attempts,
+                    max_attempts=row.max_attempts,
+                )
+                for row in result
+            ]
+            await session.commit()
+
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job))
+            self._active.add(task)
+            task.add_done_callback(self._on_task_done)
+        return len(jobs)
+
+    def _on_task_done(self, task: asyncio.Task[None]) -> None:
+        self._active.discard(task)
+        self._wakeup.set()
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        log = logger.bind(job_id=str(job.id), kind=job.kind, attempt=job.attempts)
+        error: str | None = None
+        if job.attempts > job.max_attempts:
+            error = "lease expired"
+        else:
+            try:
+                await self._handlers[job.kind](job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                log.exception("Job failed")
+                error = f"{type(exc).__name__}: {exc}"
+
+        dead = False
+        async with async_session_factory() as session:
+            if error is None:
+                await session.execute(
+                    _COMPLETE_SQL, {"id": job.id, "attempts": job.attempts}
+                )
+            else:
+                dead = job.attempts >= job.max_attempts
+                if dead:
+                    log.error("Job dead-lettered", error=error)
+                result = await session.execute(
+                    _FAIL_SQL,
+                    {
+                        "id": job.id,
+                        "attempts": job.attempts,
+                        "status": "dead" if dead else "queued",
+                        "retry_delay": retry_delay_seconds(job.attempts),
+                        "error": error[:MAX_ERROR_LENGTH],
+                    },
+                )
+                # No row: another consumer took over the lease and owns it
+                dead = result.scalar_one_or_none() == "dead"
+            await session.commit()
+
+        on_dead_letter = self._dead_letter_handlers.get(job.kind)
+        if dead and on_dead_letter is not None:
+            try:
+                await on_dead_letter(job)
+            except Exception:
+                log.exception("Dead-letter hook failed")
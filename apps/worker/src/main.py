@@ -1,15 +1,77 @@
+import uuid
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from src.jobs.generate_embedding import (
+    BACKFILL_EMBEDDINGS_JOB,
+    EMBEDDING_JOB,
+    backfill_embeddings,
+    close_embedding_batcher,
+    generate_embedding,
+    mark_embedding_failed,
+)
+from src.lib.ai.registry import close_providers, get_provider
+from src.lib.ai.scheduler import Priority
 from src.lib.config import settings
+from src.lib.database import async_session_factory
+from src.lib.job_queue import ClaimedJob, JobConsumer, enqueue
 from src.routers import health, tasks
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    get_provider()
+    consumer: JobConsumer | None = None
+    if settings.JOB_CONSUMER_ENABLED:
+        consumer = JobConsumer(
+            {
+                EMBEDDING_JOB: _run_embedding_job,
+                BACKFILL_EMBEDDINGS_JOB: _run_backfill_embeddings_job,
+            },
+            dead_letter_handlers={EMBEDDING_JOB: _fail_embedding_job},
+            # Embedding jobs mostly wait on a shared batch, so claim enough
+            # of them at once to fill one
+            concurrency=max(
+                settings.JOB_CONSUMER_CONCURRENCY, settings.EMBEDDING_BATCH_SIZE
+            ),
+            visibility_timeout_seconds=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+            poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS,
+        )
+        consumer.start()
     yield
+    if consumer is not None:
+        await consumer.stop()
+    await close_embedding_batcher()
+    await close_providers()
+
+
+async def _run_embedding_job(job: ClaimedJob) -> None:
+    priority = Priority.RETRY if job.attempts > 1 else Priority.INTERACTIVE
+    await generate_embedding(str(job.payload["article_id"]), priority)
+
+
+async def _fail_embedding_job(job: ClaimedJob) -> None:
+    await mark_embedding_failed(str(job.payload["article_id"]))
+
+
+async def _run_backfill_embeddings_job(job: ClaimedJob) -> None:
+    after = job.payload.get("after")
+    reembed = bool(job.payload.get("reembed", False))
+    resume_after = await backfill_embeddings(
+        reembed=reembed,
+        after=uuid.UUID(after) if after else None,
+        max_articles=settings.EMBEDDING_BACKFILL_ARTICLES_PER_JOB,
+    )
+    if resume_after is not None:
+        async with async_session_factory() as session:
+            await enqueue(
+                session,
+                BACKFILL_EMBEDDINGS_JOB,
+                {"after": str(resume_after), "reembed": reembed},
+            )
+            await session.commit()
 
 
 app = FastAPI(
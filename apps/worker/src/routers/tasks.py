@@ -30,10 +30,28 @@ async def execute_task(payload: TaskPayload) -> None:
             article_id = str(payload.data.get("article_id", ""))
             await analyze_article(article_id)
 
+        # Embedding work goes through the job queue, which retries it and
+        # splits a backfill into bounded passes
         case "embedding":
-            from src.jobs.generate_embedding import generate_embedding
+            from src.jobs.generate_embedding import EMBEDDING_JOB
             article_id = str(payload.data.get("article_id", ""))
-            await generate_embedding(article_id)
+            await _enqueue(EMBEDDING_JOB, {"article_id": article_id}, article_id)
+
+        case "backfill-embeddings":
+            from src.jobs.generate_embedding import BACKFILL_EMBEDDINGS_JOB
+            reembed = bool(payload.data.get("reembed", False))
+            await _enqueue(BACKFILL_EMBEDDINGS_JOB, {"reembed": reembed})
 
         case _:
             logger.warning("Unknown task type", task_type=payload.task_type)
+
+
+async def _enqueue(
+    kind: str, job_payload: dict[str, object], dedupe_key: str | None = None
+) -> None:
+    from src.lib.database import async_session_factory
+    from src.lib.job_queue import enqueue
+
+    async with async_session_factory() as session:
+        await enqueue(session, kind, job_payload, dedupe_key=dedupe_key)
+        await session.commit()
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.jobs import generate_embedding as generate_embedding_module
+from src.jobs.generate_embedding import EmbeddingBatcher
+from src.lib.ai.scheduler import Priority
+
+
+class _Flush:
+    def __init__(self, fail: set[uuid.UUID] | None = None) -> None:
+        self.batches: list[tuple[list[uuid.UUID], Priority]] = []
+        self.fail = fail or set()
+
+    async def __call__(
+        self, ids: list[uuid.UUID], priority: Priority
+    ) -> dict[uuid.UUID, Exception]:
+        self.batches.append((ids, priority))
+        return {i: ValueError("boom") for i in ids if i in self.fail}
+
+
+async def test_requests_within_window_share_one_batch() -> None:
+    flush = _Flush()
+    batcher = EmbeddingBatcher(flush, max_batch_size=10, max_wait_seconds=0.01)
+    ids = [uuid.uuid4() for _ in range(3)]
+
+    await asyncio.gather(
+        batcher.submit(ids[0], Priority.BACKFILL),
+        batcher.submit(ids[1], Priority.INTERACTIVE),
+        batcher.submit(ids[2], Priority.BACKFILL),
+    )
+
+    assert flush.batches == [(ids, Priority.INTERACTIVE)]
+
+
+async def test_full_batch_flushes_without_waiting() -> None:
+    flush = _Flush()
+    batcher = EmbeddingBatcher(flush, max_batch_size=2, max_wait_seconds=60)
+    ids = [uuid.uuid4() for _ in range(4)]
+
+    await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in ids)), timeout=1)
+
+    assert [len(batch) for batch, _ in flush.batches] == [2, 2]
+
+
+async def test_failed_article_raises_only_for_its_request() -> None:
+    bad = uuid.uuid4()
+    good = uuid.uuid4()
+    batcher = EmbeddingBatcher(
+        _Flush(fail={bad}), max_batch_size=10, max_wait_seconds=0.01
+    )
+
+    results = await asyncio.gather(
+        batcher.submit(good), batcher.submit(bad), return_exceptions=True
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], ValueError)
+    with pytest.raises(ValueError):
+        await batcher.submit(bad)
+
+
+async def test_generate_embedding_leaves_retries_to_the_job_queue(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    article_id = uuid.uuid4()
+    flush = _Flush(fail={article_id})
+    batcher = EmbeddingBatcher(flush, max_batch_size=10, max_wait_seconds=0.01)
+    monkeypatch.setattr(
+        generate_embedding_module, "get_embedding_batcher", lambda: batcher
+    )
+
+    with pytest.raises(ValueError):
+        await generate_embedding_module.generate_embedding(str(article_id))
+
+    assert len(flush.batches) == 1